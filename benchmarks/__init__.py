@@ -0,0 +1 @@
+"""Offline benchmark harness for the scrapers, see benchmarks/run.py."""
@@ -0,0 +1,227 @@
+"""
+Offline stand-ins for the network: recorded HTTP responses and yfinance.
+
+fixtures/index.json maps URLs (exact, or a regex `pattern`) to saved bodies.
+Paths are relative to the fixtures directory, so the debug pages already
+saved at the repo root (halkarz_main.html, debug_ipo_detail.html, ...) are
+replayed in place. Anything without a fixture is answered with a 404.
+"""
+import asyncio
+import html
+import json
+import os
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+FIXTURES_DIR = os.path.join(BENCH_DIR, 'fixtures')
+
+CONTENT_TYPES = {
+    '.html': 'text/html; charset=UTF-8',
+    '.json': 'application/json; charset=UTF-8',
+}
+
+
+def _number(value):
+    try:
+        return float(str(value).replace(',', ''))
+    except ValueError:
+        return 0.0
+
+
+class ReplayResponse:
+    """The subset of a curl_cffi response that pipeline.fetch reads."""
+
+    def __init__(self, status_code, content, headers):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+
+
+class Fixtures:
+    def __init__(self, root=FIXTURES_DIR, latency=0.0):
+        self.root = root
+        self.latency = latency
+        self.requests = 0
+        self.bytes = 0
+        self._bodies = {}
+        with open(os.path.join(root, 'index.json'), 'r', encoding='utf-8') as f:
+            entries = json.load(f)['responses']
+        self._exact = {e['url']: e for e in entries if 'url' in e}
+        self._patterns = [(re.compile(e['pattern']), e) for e in entries if 'pattern' in e]
+
+    def _body(self, entry):
+        path = os.path.normpath(os.path.join(self.root, entry['file']))
+        if path not in self._bodies:
+            with open(path, 'rb') as f:
+                self._bodies[path] = f.read()
+        return self._bodies[path], path
+
+    def respond(self, url):
+        self.requests += 1
+        entry = self._exact.get(url)
+        if entry is None:
+            entry = next((e for pattern, e in self._patterns if pattern.search(url)), None)
+        if entry is None:
+            return ReplayResponse(404, b'', {'content-type': 'text/html'})
+
+        content, path = self._body(entry)
+        self.bytes += len(content)
+        content_type = entry.get('content_type') or CONTENT_TYPES.get(os.path.splitext(path)[1], 'text/html')
+        return ReplayResponse(entry.get('status', 200), content, {'content-type': content_type})
+
+
+class ReplaySession:
+    """Drop-in for curl_cffi.requests.Session."""
+
+    def __init__(self, fixtures):
+        self.fixtures = fixtures
+
+    def get(self, url, **kwargs):
+        if self.fixtures.latency:
+            time.sleep(self.fixtures.latency)
+        return self.fixtures.respond(url)
+
+    def close(self):
+        pass
+
+
+class AsyncReplaySession:
+    """Drop-in for curl_cffi.requests.AsyncSession."""
+
+    def __init__(self, fixtures):
+        self.fixtures = fixtures
+
+    async def get(self, url, **kwargs):
+        await asyncio.sleep(self.fixtures.latency)
+        return self.fixtures.respond(url)
+
+    async def close(self):
+        pass
+
+
+def install_http_replay(fixtures):
+    """Routes pipeline.fetch and pipeline.crawl through the fixtures."""
+    import pipeline.crawl
+    import pipeline.fetch
+
+    pipeline.fetch.requests.Session = lambda *args, **kwargs: ReplaySession(fixtures)
+    pipeline.crawl.AsyncSession = lambda *args, **kwargs: AsyncReplaySession(fixtures)
+
+
+class YahooReplay:
+    """
+    yf.download / yf.Ticker(...).info served from a synthetic market built
+    out of the committed public/bist_live_data.json: one year of seeded
+    random-walk bars ending at each stock's last price, and an .info dict
+    carrying the stock's current fundamentals.
+    """
+
+    def __init__(self, fixtures, info_groups, days=365, seed=7):
+        self.fixtures = fixtures
+        with open(os.path.join(ROOT_DIR, 'public', 'bist_live_data.json'), 'r', encoding='utf-8') as f:
+            stocks = json.load(f)['stocks']
+
+        today = pd.Timestamp.today().normalize()
+        dates = pd.bdate_range(end=today - pd.Timedelta(days=1), periods=days * 5 // 7)
+        rng = np.random.default_rng(seed)
+        frames = {}
+        self.infos = {}
+        for stock in stocks:
+            symbol = stock['symbol']
+            price = _number(stock.get('price')) or 1.0
+            walk = np.exp(np.cumsum(rng.normal(0, 0.02, len(dates))))
+            close = price * walk / walk[-1]
+            spread = close * rng.uniform(0.002, 0.03, len(dates))
+            volume = _number(stock.get('volume')) or 1_000_000
+            frames[symbol] = pd.DataFrame({
+                'Open': close + rng.uniform(-0.5, 0.5, len(dates)) * spread,
+                'High': close + spread,
+                'Low': close - spread,
+                'Close': close,
+                'Adj Close': close,
+                'Volume': (volume * rng.uniform(0.3, 1.7, len(dates))).round(),
+            }, index=dates)
+
+            info = {}
+            for group in info_groups.values():
+                for key, (info_key, default) in group['fields'].items():
+                    info[info_key] = stock.get(key, default)
+            self.infos[symbol] = info
+
+        self.market = pd.concat(frames, axis=1)
+        self.market.index.name = 'Date'
+        self._info_bytes = {s: len(json.dumps(i, ensure_ascii=False)) for s, i in self.infos.items()}
+
+    def download(self, symbols, period=None, start=None, **kwargs):
+        if isinstance(symbols, str):
+            symbols = symbols.split()
+        frame = self.market[[s for s in symbols if s in self.infos]]
+        if start is not None:
+            frame = frame[frame.index >= pd.Timestamp(start)]
+        self.fixtures.requests += 1
+        self.fixtures.bytes += int(frame.memory_usage(index=False).sum())
+        if self.fixtures.latency:
+            time.sleep(self.fixtures.latency)
+        return frame.copy()
+
+    def ticker(self, symbol):
+        replay = self
+
+        class Ticker:
+            @property
+            def info(self):
+                replay.fixtures.requests += 1
+                replay.fixtures.bytes += replay._info_bytes.get(symbol, 0)
+                if replay.fixtures.latency:
+                    time.sleep(replay.fixtures.latency)
+                if symbol not in replay.infos:
+                    raise KeyError(symbol)
+                return dict(replay.infos[symbol])
+
+        return Ticker()
+
+
+def seed_fixtures(root=FIXTURES_DIR):
+    """
+    Rebuilds the synthetic pages that have no saved copy in the repo from the
+    current public/ outputs, in the markup the scrapers parse.
+    """
+    with open(os.path.join(ROOT_DIR, 'public', 'sermaye_artirimi.json'), 'r', encoding='utf-8') as f:
+        capital = json.load(f)
+    tables = []
+    for section in ("Bedelsiz", "Bedelli", "Tahsisli"):
+        rows = ['<tr><th>Şirket</th><th>Oran</th><th>Tutar</th><th>YKK</th><th>SPK</th><th>Tescil</th></tr>']
+        for record in capital:
+            if record['type'] != section:
+                continue
+            amount = record['description'].split('Tutar: ')[-1] if 'Tutar: ' in record['description'] else ''
+            dates = [record['date']] * {'Onaylandı': 3, 'Tamamlandı': 2, 'SPK Onay': 2, 'YKK Kararı': 1}.get(record['status'], 0)
+            cells = [record['company'], record['rate'], amount] + dates + [''] * (3 - len(dates))
+            rows.append('<tr>' + ''.join(f'<td>{html.escape(c)}</td>' for c in cells) + '</tr>')
+        tables.append(f'<h2>{section}</h2><table>{"".join(rows)}</table>')
+    _write_page(os.path.join(root, 'halkarz_sermaye_artirimi.html'), 'Sermaye Artırımı', ''.join(tables))
+
+    with open(os.path.join(ROOT_DIR, 'public', 'emtia.json'), 'r', encoding='utf-8') as f:
+        commodities = json.load(f)
+    rows = []
+    for item in commodities:
+        rows.append(
+            '<tr class="table-row">'
+            f'<td><a class="title stock-code">{html.escape(item["name"])}</a></td>'
+            f'<td class="val">{html.escape(item["buy_price"])}</td>'
+            f'<td class="val">{html.escape(item["sell_price"])}</td>'
+            f'<td class="val dailyChangePercent">{html.escape(item["change_rate"])}</td>'
+            '</tr>'
+        )
+    _write_page(os.path.join(root, 'midas_emtia.html'), 'Emtia', f'<table>{"".join(rows)}</table>')
+
+
+def _write_page(path, title, body):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f'<!DOCTYPE html><html lang="tr"><head><meta charset="utf-8"><title>{title}</title></head>'
+                f'<body>{body}</body></html>\n')
@@ -0,0 +1,303 @@
+"""
+End-to-end benchmark of the data pipeline, fully offline.
+
+Replays the fixtures in benchmarks/fixtures (and a synthetic yfinance market)
+through the real scraper code and reports, per scenario: wall time, request
+count, bytes received, peak RSS and fetch/parse/transform/serialize timings.
+Results are compared against benchmarks/baseline.json and the exit code is 1
+when something got slower than the tolerance allows.
+
+    python benchmarks/run.py                      # all scenarios
+    python benchmarks/run.py halkarz capital      # selected scenarios
+    python benchmarks/run.py --repeat 3 --latency 0.05
+    python benchmarks/run.py --update-baseline
+
+Each scenario runs in its own subprocess and temporary working directory
+(with PIPELINE_CACHE_ROOT / PIPELINE_METRICS_DIR pointing there), so peak RSS
+is per scenario and public/, .cache/, data/ and metrics/ of the checkout are
+never touched.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'scripts'))
+
+from benchmarks.replay import Fixtures, YahooReplay, install_http_replay, seed_fixtures
+from benchmarks.stages import STAGES, StageRecorder
+
+BASELINE_PATH = os.path.join(BENCH_DIR, 'baseline.json')
+
+# Relative slowdown tolerated before a metric counts as a regression, and the
+# absolute floors below which differences are treated as noise
+TOLERANCE = 0.25
+MIN_SECONDS = 0.05
+RSS_TOLERANCE = 0.15
+MIN_RSS_MB = 10
+BYTES_TOLERANCE = 0.05
+
+
+def scenario_yfinance(fixtures, recorder):
+    import yfinance as yf
+
+    import fetch_yfinance
+
+    replay = YahooReplay(fixtures, fetch_yfinance.INFO_GROUPS)
+    yf.download = replay.download
+    yf.Ticker = replay.ticker
+    recorder.patch("fetch", fetch_yfinance, '_download')
+    recorder.patch("fetch", fetch_yfinance, 'fetch_info')
+    sys.argv = ['fetch_yfinance.py']
+    return fetch_yfinance.main
+
+
+def scenario_halkarz(fixtures, recorder):
+    import fetch_halkarz_ipo
+
+    # Politeness limits are not what is being measured here
+    return lambda: fetch_halkarz_ipo.fetch_ipos(rate=1000, concurrency=8, max_concurrency=16,
+                                                incremental=False)
+
+
+def _with_client(func):
+    from pipeline.fetch import HttpClient
+
+    def run():
+        with HttpClient() as client:
+            func(client)
+    return run
+
+
+def scenario_capital(fixtures, recorder):
+    import scrape_capital
+    return _with_client(scrape_capital.scrape_capital_increases)
+
+
+def scenario_dividends(fixtures, recorder):
+    import scrape_dividends
+    return _with_client(scrape_dividends.scrape_dividends)
+
+
+def scenario_midas(fixtures, recorder):
+    import fetch_midas_emtia
+    return _with_client(fetch_midas_emtia.fetch_midas_emtia)
+
+
+def scenario_daily(fixtures, recorder):
+    import fetch_halkarz_ipo
+    import run_scrapers
+
+    # Same politeness override as the halkarz scenario, inside the orchestrator
+    run_scrapers.JOBS[0] = run_scrapers.Job(
+        "ipos", lambda client: fetch_halkarz_ipo.fetch_ipos(
+            rate=1000, concurrency=8, max_concurrency=16, incremental=False, cache=client.cache),
+        critical=True)
+    sys.argv = ['run_scrapers.py']
+
+    def run():
+        if run_scrapers.main() != 0:
+            raise RuntimeError("critical job failed")
+    return run
+
+
+SCENARIOS = {
+    "yfinance": scenario_yfinance,
+    "halkarz": scenario_halkarz,
+    "capital": scenario_capital,
+    "dividends": scenario_dividends,
+    "midas": scenario_midas,
+    "daily": scenario_daily,
+}
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def _outputs():
+    files = 0
+    size = 0
+    for directory, _, names in os.walk('public'):
+        for name in names:
+            files += 1
+            size += os.path.getsize(os.path.join(directory, name))
+    return {"files": files, "bytes": size}
+
+
+def run_child(name, result_path, latency):
+    """Runs one scenario in the current (temporary) directory."""
+    os.makedirs('public', exist_ok=True)
+    fixtures = Fixtures(latency=latency)
+    install_http_replay(fixtures)
+    recorder = StageRecorder()
+    recorder.install_common()
+    run = SCENARIOS[name](fixtures, recorder)
+
+    started = time.perf_counter()
+    run()
+    wall = time.perf_counter() - started
+
+    result = {
+        "wall": round(wall, 4),
+        "requests": fixtures.requests,
+        "bytes": fixtures.bytes,
+        "peak_rss_mb": _peak_rss_mb(),
+        "stages": recorder.report(wall),
+        "outputs": _outputs(),
+    }
+    with open(result_path, 'w', encoding='utf-8') as f:
+        json.dump(result, f)
+
+
+def run_scenario(name, latency, verbose=False):
+    workdir = tempfile.mkdtemp(prefix=f'bench-{name}-')
+    try:
+        result_path = os.path.join(workdir, 'result.json')
+        env = {**os.environ, 'PIPELINE_CACHE_ROOT': os.path.join(workdir, '.cache'),
+               'PIPELINE_METRICS_DIR': os.path.join(workdir, 'metrics'), 'PYTHONIOENCODING': 'utf-8'}
+        command = [sys.executable, os.path.abspath(__file__), '--child', name,
+                   '--result', result_path, '--latency', str(latency)]
+        process = subprocess.run(command, cwd=workdir, env=env,
+                                 stdout=None if verbose else subprocess.DEVNULL,
+                                 stderr=None if verbose else subprocess.PIPE, text=True)
+        if process.returncode != 0 or not os.path.exists(result_path):
+            error = (process.stderr or '').strip().splitlines()[-1:] or ['no result written']
+            raise RuntimeError(f"{name} failed (exit {process.returncode}): {error[0]}")
+        with open(result_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def compare(results, baseline):
+    """Returns a list of human-readable regressions."""
+    regressions = []
+
+    def slower(label, new, old, tolerance, floor):
+        if new is None or old is None:
+            return
+        if new > old * (1 + tolerance) and new - old > floor:
+            regressions.append(f"{label}: {old} -> {new} (+{(new / old - 1) * 100 if old else 100:.0f}%)")
+
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        slower(f"{name} wall", result["wall"], base["wall"], TOLERANCE, MIN_SECONDS)
+        for stage in STAGES:
+            slower(f"{name} {stage}", result["stages"][stage], base["stages"].get(stage), TOLERANCE, MIN_SECONDS)
+        slower(f"{name} peak RSS (MB)", result["peak_rss_mb"], base.get("peak_rss_mb"), RSS_TOLERANCE, MIN_RSS_MB)
+        slower(f"{name} requests", result["requests"], base["requests"], 0, 0)
+        slower(f"{name} bytes", result["bytes"], base["bytes"], BYTES_TOLERANCE, 0)
+    return regressions
+
+
+def print_table(results, baseline):
+    header = f"{'scenario':<10} {'wall s':>8} {'base':>8} {'req':>6} {'MB in':>8} {'RSS MB':>8}  " + \
+        "  ".join(f"{stage:>9}" for stage in STAGES)
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        base = baseline.get(name, {})
+        print(f"{name:<10} {r['wall']:>8.3f} {base.get('wall', float('nan')):>8.3f} {r['requests']:>6} "
+              f"{r['bytes'] / 1e6:>8.2f} {r['peak_rss_mb'] or 0:>8.1f}  " +
+              "  ".join(f"{r['stages'][stage]:>9.3f}" for stage in STAGES))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline pipeline benchmark")
+    parser.add_argument('scenarios', nargs='*', metavar='scenario',
+                        help=f"Scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument('--repeat', type=int, default=1, help="Runs per scenario; the fastest one is kept")
+    parser.add_argument('--latency', type=float, default=0.0, help="Simulated seconds per request")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="Baseline JSON to compare against")
+    parser.add_argument('--update-baseline', action='store_true', help="Store the results as the new baseline")
+    parser.add_argument('--save', help="Also write the results to this path")
+    parser.add_argument('--seed-fixtures', action='store_true', help="Rebuild the synthetic fixture pages and exit")
+    parser.add_argument('--verbose', action='store_true', help="Show the scrapers' own output")
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--result', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+
+    if args.child:
+        run_child(args.child, args.result, args.latency)
+        return 0
+    if args.seed_fixtures:
+        seed_fixtures()
+        print("Fixtures rebuilt")
+        return 0
+
+    try:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    except (OSError, ValueError):
+        baseline = {"scenarios": {}}
+
+    results = {}
+    failures = []
+    for name in args.scenarios or SCENARIOS:
+        try:
+            runs = [run_scenario(name, args.latency, args.verbose) for _ in range(max(1, args.repeat))]
+        except RuntimeError as e:
+            failures.append(str(e))
+            continue
+        results[name] = min(runs, key=lambda r: r["wall"])
+
+    print_table(results, baseline["scenarios"])
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({"scenarios": results}, f, indent=2)
+
+    for failure in failures:
+        print(f"\n✗ {failure}")
+    if failures:
+        return 1
+
+    if args.update_baseline:
+        baseline["scenarios"].update(results)
+        baseline["environment"] = {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "latency": args.latency,
+            "updated": time.strftime('%Y-%m-%d'),
+        }
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2)
+            f.write('\n')
+        print(f"\nBaseline updated: {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline["scenarios"])
+    for name in results:
+        base = baseline["scenarios"].get(name)
+        if base and base.get("outputs") != results[name]["outputs"]:
+            print(f"\nNote: {name} outputs changed {base.get('outputs')} -> {results[name]['outputs']}")
+    if regressions:
+        print("\nRegressions against the baseline:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+    print("\nNo regressions against the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+Per-stage timing without touching the scrapers: the harness wraps the
+functions every scraper goes through (HTTP client, BeautifulSoup, json) and
+records the intervals spent inside them.
+
+- fetch:     wall time with at least one request in flight
+- parse:     BeautifulSoup construction, response/file JSON decoding
+- serialize: json.dump of the outputs
+- transform: the rest of the wall time (extraction, pandas, bookkeeping)
+
+A stage entered while another one is active in the same task is counted as
+the outer stage (e.g. the cache's metadata json.dump inside a fetch). In the
+async crawler fetches overlap parsing, so the stages can add up to more than
+the wall time.
+"""
+import contextvars
+import functools
+import inspect
+from collections import defaultdict
+from time import perf_counter
+
+STAGES = ("fetch", "parse", "transform", "serialize")
+
+_active = contextvars.ContextVar('bench_stage', default=None)
+
+
+def _union(intervals):
+    total = 0.0
+    end = None
+    for start, stop in sorted(intervals):
+        if end is None or start > end:
+            total += stop - start
+            end = stop
+        elif stop > end:
+            total += stop - end
+            end = stop
+    return total
+
+
+class StageRecorder:
+    def __init__(self):
+        self.intervals = defaultdict(list)
+
+    def wrap(self, stage, func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if _active.get() is not None:
+                    return await func(*args, **kwargs)
+                token = _active.set(stage)
+                started = perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    self.intervals[stage].append((started, perf_counter()))
+                    _active.reset(token)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _active.get() is not None:
+                return func(*args, **kwargs)
+            token = _active.set(stage)
+            started = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.intervals[stage].append((started, perf_counter()))
+                _active.reset(token)
+        return wrapper
+
+    def patch(self, stage, owner, name):
+        setattr(owner, name, self.wrap(stage, getattr(owner, name)))
+
+    def install_common(self):
+        """Wraps the entry points shared by every scraper."""
+        import json
+
+        from bs4 import BeautifulSoup
+
+        import pipeline.crawl
+        import pipeline.fetch
+        import pipeline.publish
+
+        self.patch("fetch", pipeline.fetch.HttpClient, 'get')
+        self.patch("fetch", pipeline.crawl.AsyncCrawler, 'get')
+        self.patch("parse", BeautifulSoup, '__init__')
+        self.patch("parse", pipeline.fetch.Response, 'json')
+        self.patch("parse", json, 'load')
+        self.patch("serialize", json, 'dump')
+        # Before the scrapers import it by name; includes the unchanged-payload check
+        self.patch("serialize", pipeline.publish, 'write_json')
+
+    def report(self, wall):
+        stages = {stage: _union(self.intervals[stage]) for stage in STAGES if stage != "transform"}
+        busy = _union([i for stage in stages for i in self.intervals[stage]])
+        stages["transform"] = max(0.0, wall - busy)
+        return {stage: round(stages[stage], 4) for stage in STAGES}
@@ -4,6 +4,7 @@ import { Search, TrendingUp, Menu, X, BarChart3, PieChart, Calendar, Briefcase,
 import Footer from './Footer';
 import { slugify } from '../utils/slugify';
 import { useAuth } from '../contexts/AuthContext';
+import { fetchDataset } from '../utils/dataUrl';
 
 // Market Status Helper
 const getMarketStatus = () => {
@@ -149,7 +150,7 @@ export default function Layout({ children }: { children?: React.ReactNode }) {
 
   // Fetch stocks for search
   useEffect(() => {
-    fetch('/bist_live_data.json')
+    fetchDataset('bist_quotes.json')
       .then(res => res.json())
       .then(data => {
         if (data && data.stocks) {
@@ -1,15 +1,12 @@
 import React, { useEffect, useState } from 'react';
 import { Link } from 'react-router-dom';
 import { slugify } from '../utils/slugify';
+import { loadQuoteColumns } from '../utils/quoteColumns';
 import { ArrowRight, Box } from 'lucide-react';
 
 interface Stock {
     code: string;
-    name: string;
-    price: number;
     changeRate: number;
-    volume: string;
-    sector: string;
 }
 
 const MarketHeatmap: React.FC = () => {
@@ -17,16 +14,15 @@ const MarketHeatmap: React.FC = () => {
     const [loading, setLoading] = useState(true);
 
     useEffect(() => {
-        fetch('/bist_live_data.json')
-            .then(res => res.json())
-            .then(data => {
+        loadQuoteColumns()
+            .then(columns => {
                 // Sort by volume (mock "market cap" size effect) or absolute change
                 // For visual heatmap, usually sorted by Weight (Volume/Cap).
-                // Here we just take top 20 active stocks for the visual.
-                const sorted = data.stocks
-                    .sort((a: any, b: any) => parseFloat(b.volume) - parseFloat(a.volume))
+                // Here we just take top 30 active stocks for the visual.
+                const order = Array.from(columns.codes.keys())
+                    .sort((a, b) => columns.volumes[b] - columns.volumes[a])
                     .slice(0, 30);
-                setStocks(sorted);
+                setStocks(order.map(i => ({ code: columns.codes[i], changeRate: columns.changeRates[i] })));
                 setLoading(false);
             })
             .catch(err => {
@@ -3,6 +3,7 @@ import { TrendingUp, TrendingDown, Flame } from 'lucide-react';
 import { Link } from 'react-router-dom';
 import { slugify } from '../utils/slugify';
 import { motion, AnimatePresence } from 'framer-motion';
+import { fetchDataset } from '../utils/dataUrl';
 
 interface Stock {
     code: string;
@@ -24,7 +25,7 @@ const TrendingWidget: React.FC = () => {
 
     const loadTrendingStocks = async () => {
         try {
-            const response = await fetch('/bist_live_data.json');
+            const response = await fetchDataset('bist_quotes.json');
             const data = await response.json();
 
             const sorted = [...data.stocks].sort((a, b) => b.changeRate - a.changeRate);
@@ -1,243 +1,570 @@
 import yfinance as yf
+import pandas as pd
 import json
-from datetime import datetime
+import os
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
 import sys
+import time
 
-# TÜM BIST HİSSELERİ (500+ hisse)
-BIST_STOCKS = [
-    # BIST 30
-    "GARAN", "AKBNK", "YKBNK", "ISCTR", "VAKBN", "HALKB", "THYAO", "PGSUS",
-    "TUPRS", "PETKM", "EREGL", "KRDMD", "ASELS", "BIMAS", "MGROS", "SOKM",
-    "TTKOM", "TCELL", "SISE", "ARCLK", "VESTL", "SAHOL", "KCHOL", "DOHOL",
-    "FROTO", "TOASO", "TMSN", "KOZAL", "KOZAA", "TAVHL", "EKGYO", "ENJSA",
-    
-    # BIST 50-100
-    "SASA", "GUBRF", "HEKTS", "CLEBI", "LOGO", "NETAS", "AEFES", "ULKER",
-    "TTRAK", "OTKAR", "ALARK", "MAVI", "KARSN", "ODAS", "SKBNK", "QNBFB",
-    "AGHOL", "AKSA", "AKSEN", "ALBRK", "ALGYO", "ANACM", "ASUZU", "AYDEM",
-    "BAGFS", "BIOEN", "BJKAS", "BRISA", "BRYAT", "BUCIM", "CEMTS", "CIMSA",
-    
-    # BIST 100+
-    "ADEL", "ADESE", "AFYON", "AGESA", "AKENR", "AKFGY", "AKFYE", "AKSGY",
-    "AKSUE", "AKYHO", "ALCAR", "ALCTL", "ALFAS", "ALKA", "ALMAD", "ALTIN",
-    "ANELE", "ANHYT", "ANSGR", "ARASE", "ARDYZ", "ARENA", "ARMDA", "ARSAN",
-    "ARTMS", "ARZUM", "ASTOR", "ATAGY", "ATAKP", "ATATP", "ATEKS", "ATLAS",
-    "AVGYO", "AVHOL", "AVOD", "AVTUR", "AYCES", "AYEN", "AYES", "BAKAB",
-    "BALAT", "BANVT", "BARMA", "BASCM", "BASGZ", "BAYRK", "BEGYO", "BERA",
-    "BEYAZ", "BFREN", "BIGCH", "BINHO", "BIZIM", "BLCYT", "BMSCH", "BMSTL",
-    "BNTAS", "BOBET", "BORLS", "BORSK", "BOSSA", "BRKSN", "BRKVY", "BRMEN",
-    "BRSAN", "BSOKE", "BTCIM", "BURCE", "BURVA", "BVSAN", "BYDNR", "CANTE",
-    "CASA", "CATES", "CCOLA", "CELHA", "CEMAS", "CEOEM", "CMBTN", "CMENT",
-    "CONSE", "COSMO", "CRDFA", "CRFSA", "CUSAN", "CVKMD", "CWENE", "DAGHL",
-    "DAGI", "DAPGM", "DARDL", "DENGE", "DERHL", "DERIM", "DESA", "DESPC",
-    "DEVA", "DGATE", "DGGYO", "DGNMO", "DIRIT", "DITAS", "DJIST", "DMSAS",
-    "DNISI", "DOAS", "DOBUR", "DOCO", "DOFER", "DOGUB", "DOKTA", "DURDO",
-    "DYOBY", "DZGYO", "ECILC", "ECZYT", "EDATA", "EDIP", "EFORC", "EGEEN",
-    "EGEPO", "EGGUB", "EGPRO", "EGSER", "EKIZ", "EKOS", "EKSUN", "ELITE",
-    "EMKEL", "EMNIS", "ENERY", "ENSRI", "EPLAS", "ERBOS", "ERCB", "ERSU",
-    "ESCAR", "ESCOM", "ESEN", "ETILR", "ETYAT", "EUHOL", "EUKYO", "EUPWR",
-    "EUREN", "EUYO", "EYGYO", "FADE", "FENER", "FLAP", "FMIZP", "FONET",
-    "FORMT", "FORTE", "FRIGO", "FZLGY", "GARFA", "GEDIK", "GEDZA", "GENIL",
-    "GENTS", "GEREL", "GESAN", "GIPTA", "GLBMD", "GLCVY", "GLRYH", "GLYHO",
-    "GMTAS", "GOKNR", "GOLTS", "GOODY", "GOZDE", "GRNYO", "GRSEL", "GRTRK",
-    "GSDDE", "GSDHO", "GSRAY", "GUNDZ", "GWIND", "GZNMI", "HATEK", "HATSN",
-    "HDFGS", "HEDEF", "HKTM", "HLGYO", "HTTBT", "HUBVC", "HUNER", "HURGZ",
-    "ICBCT", "ICUGS", "IDEAS", "IDGYO", "IEYHO", "IHAAS", "IHEVA", "IHGZT",
-    "IHLAS", "IHLGM", "IHYAY", "IMASM", "INDES", "INFO", "INGRM", "INTEM",
-    "INVEO", "INVES", "IPEKE", "ISATR", "ISBIR", "ISBTR", "ISDMR", "ISFIN",
-    "ISGSY", "ISGYO", "ISKPL", "ISKUR", "ISSEN", "ISYAT", "IZENR", "IZFAS",
-    "IZINV", "IZMDC", "JANTS", "KAPLM", "KAREL", "KARTN", "KARYE", "KATMR",
-    "KAYSE", "KBORU", "KCAER", "KENT", "KERVN", "KERVT", "KFEIN", "KGYO",
-    "KIMMR", "KLGYO", "KLKIM", "KLMSN", "KLNMA", "KLRHO", "KLSER", "KLSYN",
-    "KMPUR", "KNFRT", "KOCMT", "KONYA", "KONTR", "KOPOL", "KORDS", "KOTON",
-    "KRDMA", "KRDMB", "KRGYO", "KRONT", "KRPLS", "KRSTL", "KRTEK", "KRVGD",
-    "KSTUR", "KTLEV", "KTSKR", "KUTPO", "KUVVA", "KUYAS", "KZBGY", "KZGYO",
-    "LIDER", "LINK", "LKMNH", "LRSHO", "LUKSK", "MAALT", "MACKO", "MAGEN",
-    "MAKIM", "MAKTK", "MAMSE", "MANAS", "MARBL", "MARKA", "MARTI", "MEDTR",
-    "MEGAP", "MEGMT", "MEKAG", "MEPET", "MERCN", "MERIT", "MERKO", "METRO",
-    "METUR", "MHRGY", "MIATK", "MMCAS", "MNDRS", "MNDTR", "MOBTL", "MOGAN",
-    "MPARK", "MRGYO", "MRSHL", "MSGYO", "MTRKS", "MTRYO", "MZHLD", "NATEN",
-    "NIBAS", "NTGAZ", "NTHOL", "NUGYO", "NUHCM", "OBASE", "ODINE", "OFSYM",
-    "ONCSM", "ONRYT", "ORCAY", "ORGE", "ORMA", "OSMEN", "OSTIM", "OTTO",
-    "OYAKC", "OYAYO", "OYLUM", "OYYAT", "OZGYO", "OZKGY", "OZRDN", "OZSUB",
-    "PAMEL", "PAPIL", "PARSN", "PASEU", "PATEK", "PCILT", "PEGYO", "PEKGY",
-    "PENGD", "PENTA", "PETUN", "PINSU", "PKART", "PKENT", "PLTUR", "PNLSN",
-    "PNSUT", "POLHO", "POLTK", "PRDGS", "PRKAB", "PRKME", "PRZMA", "PSDTC",
-    "PSGYO", "QNBFL", "QUAGR", "RALYH", "RAYSG", "REEDR", "RGYAS", "RHEAG",
-    "RNPOL", "RODRG", "ROYAL", "RTALB", "RUBNS", "RYGYO", "RYSAS", "SAFKR",
-    "SAMAT", "SANEL", "SANFM", "SANKO", "SARKY", "SAYAS", "SDTTR", "SEGMN",
-    "SEGYO", "SEKFK", "SEKUR", "SELEC", "SELGD", "SELVA", "SEYKM", "SILVR",
-    "SKTAS", "SKYLP", "SKYMD", "SMART", "SMRTG", "SNGYO", "SNICA", "SNKRN",
-    "SNPAM", "SODSN", "SONME", "SRVGY", "SUMAS", "SUNTK", "SUWEN", "TARKM",
-    "TARKS", "TATEN", "TATGD", "TBORG", "TDGYO", "TEKTU", "TERA", "TETMT",
-    "TEZOL", "TGSAS", "TIRE", "TKFEN", "TKNSA", "TLMAN", "TMPOL", "TRCAS",
-    "TRGYO", "TRILC", "TSGYO", "TSKB", "TSPOR", "TUCLK", "TUKAS", "TUREX",
-    "TURGG", "TURSG", "UFUK", "UKIM", "ULUFA", "ULUSE", "ULUUN", "UMPAS",
-    "UNLU", "USAK", "UZERB", "VAKFN", "VAKKO", "VANGD", "VBTYZ", "VERTU",
-    "VERUS", "VESBE", "VKFYO", "VKING", "VKGYO", "YAPRK", "YATAS", "YATVK",
-    "YESIL", "YEOTK", "YGGYO", "YGYO", "YKSLN", "YUNSA", "YYLGD", "ZEDUR",
-    "ZELOT", "ZOREN", "ZRGYO"
-]
-
-print("=" * 60)
-print("BIST CANLI VERİ ÇEKİCİ - Yahoo Finance")
-print("=" * 60)
-print(f"\nToplam {len(BIST_STOCKS)} hisse için veri çekiliyor...\n")
-
-stocks_data = []
-success_count = 0
-fail_count = 0
-
-for i, code in enumerate(BIST_STOCKS, 1):
-    symbol = f"{code}.IS"
+from pipeline import metrics
+from pipeline.checkpoint import CHECKPOINT_DIR, Checkpoint
+from pipeline.columns import write_columns_binary, write_columns_json
+from pipeline.delta import DeltaFeed
+from pipeline.indicators import compute_indicators
+from pipeline.ohlcv import FRAME_COLUMNS, OhlcvStore, to_timestamps
+from pipeline.publish import write_json
+from pipeline.universe import Universe
+from pipeline.workers import CALL_TIMEOUT, WORKERS, bounded_map
+
+
+OUTPUT_PATH = 'public/bist_live_data.json'
+# Liste sayfaları için küçük fiyat indeksi + hisse başına detay dosyaları
+QUOTES_INDEX_PATH = 'public/bist_quotes.json'
+SHARDS_DIR = 'public/stocks'
+INDEX_FIELDS = ("code", "name", "price", "change", "changeRate", "volume", "marketCap", "sector")
+# Isı haritası / tarayıcı için sütun bazlı anlık görüntü (--binary-columns ile ikili biçim de)
+COLUMNS_PATH = 'public/bist_columns.json'
+COLUMNS_BINARY_DIR = 'public/bist_columns'
+# Sürümlü fark dosyaları: istemci elindeki sürümden itibaren yalnızca değişen alanları indirir
+DELTA_DIR = 'public/bist_delta'
+# Grup bazlı yenileme zamanları; public/ dışında tutulur ve workflow ile commitlenir
+REFRESH_STATE_PATH = 'data/refresh_state.json'
+# Tamamlanan her hissenin kaydı hemen buraya eklenir; yarıda kalan çalıştırma buradan devam eder
+CHECKPOINT_PATH = os.path.join(CHECKPOINT_DIR, 'yfinance.ndjson')
+
+# Fiyat geçmişi: 52 hafta ve 200 günlük ortalama için 1 yıl yeterli
+HISTORY_PERIOD = "1y"
+HISTORY_DAYS = 365
+HISTORY_TAIL = 30
+# Son barı en güncel hisseden bu kadar geride olanlar ayrı indirilir (hafta sonu + bayram payı)
+WARM_LAG = timedelta(days=4)
+MARKET_TZ = ZoneInfo('Europe/Istanbul')
+# Depodaki son barın kapanışı yeni indirmeden bu orandan fazla saparsa geçmiş yeniden indirilir
+ADJUST_TOLERANCE = 0.005
+SPLITS_COLUMN = 'Stock Splits'
+
+# Fiyatlar tek bir toplu indirmeyle gelir; 30 dakikalık cron gecikmelerine pay bırakılır
+QUOTE_TTL = timedelta(minutes=25)
+
+# .info alan grupları: her grubun kendi yenileme süresi (TTL) vardır.
+# Çıktı anahtarı -> (.info anahtarı, varsayılan)
+INFO_GROUPS = {
+    # Şirket Bilgileri ve Kurumsal Sahiplik (yılda birkaç kez değişir)
+    "profile": {
+        "ttl": timedelta(days=7),
+        "fields": {
+            "name": ('longName', None),
+            "shortName": ('shortName', None),
+            "sector": ('sector', 'Diğer'),
+            "industry": ('industry', ''),
+            "website": ('website', ''),
+            "address": ('address1', ''),
+            "city": ('city', ''),
+            "country": ('country', 'Turkey'),
+            "phone": ('phone', ''),
+            "description": ('longBusinessSummary', ''),
+            "heldPercentInsiders": ('heldPercentInsiders', None),
+            "heldPercentInstitutions": ('heldPercentInstitutions', None),
+        },
+    },
+    # Piyasa Değeri, Değerleme Oranları ve Risk
+    "valuation": {
+        "ttl": timedelta(days=1),
+        "fields": {
+            "marketCap": ('marketCap', 0),
+            "enterpriseValue": ('enterpriseValue', 0),
+            "sharesOutstanding": ('sharesOutstanding', 0),
+            "pe": ('trailingPE', None),
+            "forwardPE": ('forwardPE', None),
+            "priceToBook": ('priceToBook', None),
+            "pegRatio": ('pegRatio', None),
+            "priceToSales": ('priceToSalesTrailing12Months', None),
+            "enterpriseToRevenue": ('enterpriseToRevenue', None),
+            "enterpriseToEbitda": ('enterpriseToEbitda', None),
+            "beta": ('beta', None),
+        },
+    },
+    # Karlılık, Finansal Sağlık ve Hisse Başı Veriler (çeyreklik bilançolarla değişir)
+    "financials": {
+        "ttl": timedelta(days=7),
+        "fields": {
+            "profitMargins": ('profitMargins', None),
+            "grossMargins": ('grossMargins', None),
+            "operatingMargins": ('operatingMargins', None),
+            "returnOnAssets": ('returnOnAssets', None),
+            "returnOnEquity": ('returnOnEquity', None),
+            "totalRevenue": ('totalRevenue', None),
+            "revenuePerShare": ('revenuePerShare', None),
+            "totalCash": ('totalCash', None),
+            "totalDebt": ('totalDebt', None),
+            "debtToEquity": ('debtToEquity', None),
+            "currentRatio": ('currentRatio', None),
+            "quickRatio": ('quickRatio', None),
+            "eps": ('trailingEps', None),
+            "forwardEps": ('forwardEps', None),
+            "bookValue": ('bookValue', None),
+        },
+    },
+    # Temettü
+    "dividend": {
+        "ttl": timedelta(days=1),
+        "fields": {
+            "dividendRate": ('dividendRate', None),
+            "dividendYield": ('dividendYield', None),
+            "exDividendDate": ('exDividendDate', None),
+            "payoutRatio": ('payoutRatio', None),
+        },
+    },
+    # Analist Tahminleri
+    "analyst": {
+        "ttl": timedelta(days=1),
+        "fields": {
+            "targetHighPrice": ('targetHighPrice', None),
+            "targetLowPrice": ('targetLowPrice', None),
+            "targetMeanPrice": ('targetMeanPrice', None),
+            "targetMedianPrice": ('targetMedianPrice', None),
+            "recommendationMean": ('recommendationMean', None),
+            "recommendationKey": ('recommendationKey', ''),
+            "numberOfAnalystOpinions": ('numberOfAnalystOpinions', 0),
+        },
+    },
+}
+
+QUOTE_FIELDS = ("price", "change", "changeRate", "previousClose", "open", "dayLow",
+                "dayHigh", "fiftyTwoWeekLow", "fiftyTwoWeekHigh", "fiftyDayAverage",
+                "twoHundredDayAverage", "volume", "averageVolume", "averageVolume10days",
+                "indicators", "historicalData")
+
+
+def _download(symbols, **kwargs):
+    """
+    Tek bir yf.download çağrısı yapar ve (sembol, tarih) indeksli uzun
+    formatta OHLCV tablosu döndürür.
+    """
+    with metrics.span('fetch'):
+        frame = yf.download(
+            symbols,
+            group_by='ticker',
+            # Temettü düzeltmesi yok; bölünme/bedelsiz düzeltmesini Yahoo yine de
+            # uygular, bu yüzden depo rescaled_symbols ile denetlenir
+            auto_adjust=False,
+            threads=True,
+            progress=False,
+            **kwargs
+        )
+    metrics.count('download', 'empty' if frame.empty else 'ok')
+    if frame.empty:
+        return frame
+
+    # Sütunlar (sembol, alan) -> satırlar (tarih, sembol)
     try:
-        print(f"[{i}/{len(BIST_STOCKS)}] {code}...", end=" ", flush=True)
-        
-        # Hisse verisini çek
-        ticker = yf.Ticker(symbol)
-        info = ticker.info
-        hist = ticker.history(period="1y")
-        
-        if not hist.empty and len(hist) >= 1:
-            current_price = float(hist['Close'].iloc[-1])
-            prev_close = float(hist['Close'].iloc[-2]) if len(hist) >= 2 else current_price
-            
-            change = current_price - prev_close
-            change_pct = (change / prev_close * 100) if prev_close > 0 else 0
-            volume = int(hist['Volume'].iloc[-1])
-            
-            # Kapsamlı veri toplama
-            stock_info = {
-                # Temel Bilgiler
-                "code": code,
-                "symbol": symbol,
-                "name": info.get('longName', info.get('shortName', code)),
-                "shortName": info.get('shortName', code),
-                
-                # Fiyat Verileri
-                "price": round(current_price, 2),
-                "change": round(change, 2),
-                "changeRate": round(change_pct, 2),
-                "previousClose": round(prev_close, 2),
-                "open": round(info.get('open', current_price), 2),
-                "dayLow": round(info.get('dayLow', current_price * 0.98), 2),
-                "dayHigh": round(info.get('dayHigh', current_price * 1.02), 2),
-                "fiftyTwoWeekLow": round(info.get('fiftyTwoWeekLow', current_price * 0.7), 2),
-                "fiftyTwoWeekHigh": round(info.get('fiftyTwoWeekHigh', current_price * 1.5), 2),
-                "fiftyDayAverage": round(info.get('fiftyDayAverage', current_price), 2),
-                "twoHundredDayAverage": round(info.get('twoHundredDayAverage', current_price), 2),
-                
-                # Hacim
-                "volume": f"{volume:,}",
-                "averageVolume": info.get('averageVolume', volume),
-                "averageVolume10days": info.get('averageVolume10days', volume),
-                
-                # Piyasa Değeri
-                "marketCap": info.get('marketCap', 0),
-                "enterpriseValue": info.get('enterpriseValue', 0),
-                "sharesOutstanding": info.get('sharesOutstanding', 0),
-                
-                # Şirket Bilgileri
-                "sector": info.get('sector', 'Diğer'),
-                "industry": info.get('industry', ''),
-                "website": info.get('website', ''),
-                "address": info.get('address1', ''),
-                "city": info.get('city', ''),
-                "country": info.get('country', 'Turkey'),
-                "phone": info.get('phone', ''),
-                "description": info.get('longBusinessSummary', ''),
-                
-                # Değerleme Oranları
-                "pe": info.get('trailingPE', None),
-                "forwardPE": info.get('forwardPE', None),
-                "priceToBook": info.get('priceToBook', None),
-                "pegRatio": info.get('pegRatio', None),
-                "priceToSales": info.get('priceToSalesTrailing12Months', None),
-                "enterpriseToRevenue": info.get('enterpriseToRevenue', None),
-                "enterpriseToEbitda": info.get('enterpriseToEbitda', None),
-                
-                # Karlılık
-                "profitMargins": info.get('profitMargins', None),
-                "grossMargins": info.get('grossMargins', None),
-                "operatingMargins": info.get('operatingMargins', None),
-                "returnOnAssets": info.get('returnOnAssets', None),
-                "returnOnEquity": info.get('returnOnEquity', None),
-                
-                # Finansal Sağlık
-                "totalRevenue": info.get('totalRevenue', None),
-                "revenuePerShare": info.get('revenuePerShare', None),
-                "totalCash": info.get('totalCash', None),
-                "totalDebt": info.get('totalDebt', None),
-                "debtToEquity": info.get('debtToEquity', None),
-                "currentRatio": info.get('currentRatio', None),
-                "quickRatio": info.get('quickRatio', None),
-                
-                # Hisse Başı Veriler
-                "eps": info.get('trailingEps', None),
-                "forwardEps": info.get('forwardEps', None),
-                "bookValue": info.get('bookValue', None),
-                
-                # Temettü
-                "dividendRate": info.get('dividendRate', None),
-                "dividendYield": info.get('dividendYield', None),
-                "exDividendDate": info.get('exDividendDate', None),
-                "payoutRatio": info.get('payoutRatio', None),
-                
-                # Analist Tahminleri
-                "targetHighPrice": info.get('targetHighPrice', None),
-                "targetLowPrice": info.get('targetLowPrice', None),
-                "targetMeanPrice": info.get('targetMeanPrice', None),
-                "targetMedianPrice": info.get('targetMedianPrice', None),
-                "recommendationMean": info.get('recommendationMean', None),
-                "recommendationKey": info.get('recommendationKey', ''),
-                "numberOfAnalystOpinions": info.get('numberOfAnalystOpinions', 0),
-                
-                # Risk
-                "beta": info.get('beta', None),
-                
-                # Tarihsel Veriler (Son 30 gün)
-                "historicalData": hist.tail(30)[['Close', 'Volume']].to_dict('records') if len(hist) >= 30 else [],
-                
-                # Kurumsal Sahiplik
-                "heldPercentInsiders": info.get('heldPercentInsiders', None),
-                "heldPercentInstitutions": info.get('heldPercentInstitutions', None),
-            }
-            
-            stocks_data.append(stock_info)
-            success_count += 1
-            print(f"✓ {current_price:.2f} TL ({change_pct:+.2f}%)")
-        else:
-            fail_count += 1
-            print("✗ Veri yok")
-            
+        long = frame.stack(level=0, future_stack=True)
+    except TypeError:  # pandas < 2.1
+        long = frame.stack(level=0)
+    long.index.names = ['Date', 'Symbol']
+    columns = list(FRAME_COLUMNS.values())
+    if SPLITS_COLUMN in long:  # actions=True
+        columns.append(SPLITS_COLUMN)
+    long = long.dropna(subset=['Close'])[columns]
+    if getattr(long.index.levels[0], 'tz', None) is not None:
+        long.index = long.index.set_levels(long.index.levels[0].tz_localize(None), level='Date')
+    return long.swaplevel().sort_index()
+
+
+def rescaled_symbols(store, fresh, last):
+    """
+    Yahoo bölünme ve bedelsiz sonrası geçmiş fiyatları yeniden ölçekler;
+    eklemeli depodaki barlar eski ölçekte kalır. Yeni indirmede depodaki son
+    barın kapanışı ADJUST_TOLERANCE'tan fazla farklı olan ya da son bardan
+    sonra bölünme bildirilen semboller döner.
+    """
+    rescaled = []
+    for symbol, frame in fresh.groupby(level='Symbol'):
+        if last.get(symbol) is None:
+            continue
+        frame = frame.droplevel('Symbol')
+        ts = to_timestamps(frame.index)
+        if SPLITS_COLUMN in frame and (frame[SPLITS_COLUMN].fillna(0).to_numpy()[ts > last[symbol]] != 0).any():
+            rescaled.append(symbol)
+            continue
+        overlap = frame['Close'].to_numpy()[ts == last[symbol]]
+        stored = store.read(symbol, since=last[symbol])
+        if len(overlap) and len(stored) and stored['close'][-1] > 0:
+            if abs(overlap[-1] / float(stored['close'][-1]) - 1) > ADJUST_TOLERANCE:
+                rescaled.append(symbol)
+    return rescaled
+
+
+def download_prices(codes, store):
+    """
+    Yerel OHLCV deposunda geçmişi olan semboller için yalnızca son kayıttan
+    sonraki barları, olmayanlar ve fiyat ölçeği değişenler (rescaled_symbols)
+    için 1 yıllık geçmişi toplu indirir. Tamamlanan seanslar depoya eklenir;
+    dönen tablo depodaki son 1 yıl + yeni barlardır.
+    Ayrıca bu indirmede veri dönen semboller döner (depodaki eski barlar
+    sayılmaz; sembol evreninin başarı/hata kaydı için).
+    """
+    symbols = [f"{code}.IS" for code in codes]
+    last = {symbol: store.last_timestamp(symbol) for symbol in symbols}
+    cold = [s for s in symbols if last[s] is None]
+    warm = [s for s in symbols if last[s] is not None]
+
+    fresh = []
+    if warm:
+        # İşlemi durdurulmuş / geride kalan birkaç hisse tüm piyasanın indirme
+        # aralığını genişletmesin: son barı güncel olanlar ayrı, geride kalanlar
+        # ayrı bir toplu istekle indirilir. Aralık depodaki son barı da kapsar;
+        # fiyat ölçeği değişen hisseler onunla tespit edilir.
+        newest = max(last[s] for s in warm)
+        recent = [s for s in warm if newest - last[s] <= WARM_LAG.total_seconds()]
+        lagging = [s for s in warm if newest - last[s] > WARM_LAG.total_seconds()]
+        for group, note in ((recent, ""), (lagging, " (geride kalan)")):
+            if group:
+                start = datetime.fromtimestamp(min(last[s] for s in group), timezone.utc).date()
+                print(f"📥 {len(group)} hisse için {start} sonrası barlar indiriliyor{note}")
+                fresh.append(_download(group, start=start.isoformat(), actions=True))
+        fresh = [frame for frame in fresh if not frame.empty]
+        rescaled = rescaled_symbols(store, pd.concat(fresh), last) if fresh else []
+        if rescaled:
+            print(f"♻️ {len(rescaled)} hissenin geçmiş fiyatları yeniden ölçeklenmiş (bölünme/bedelsiz), "
+                  f"depodaki geçmişleri yeniden indiriliyor: {', '.join(rescaled)}")
+            metrics.count('ohlcv', 'rescaled', len(rescaled))
+            for symbol in rescaled:
+                store.drop(symbol)
+            fresh = [frame.drop(rescaled, level='Symbol', errors='ignore') for frame in fresh]
+            cold += rescaled
+    if cold:
+        print(f"📥 {len(cold)} hisse için {HISTORY_PERIOD} geçmiş indiriliyor (depoda yok)")
+        fresh.append(_download(cold, period=HISTORY_PERIOD))
+    fresh = [frame for frame in fresh if not frame.empty]
+    if not fresh:
+        return pd.DataFrame(), set()
+    fresh = pd.concat(fresh).sort_index()[list(FRAME_COLUMNS.values())]
+
+    # Bugünün barı seans bitene kadar değişir; yalnızca tamamlanan günler saklanır
+    today = pd.Timestamp(datetime.now(MARKET_TZ).date())
+    completed = fresh[fresh.index.get_level_values('Date') < today]
+    updated = store.append_frame(completed)
+    print(f"💾 OHLCV deposu: {len(updated)} hisseye yeni bar eklendi")
+
+    since = int((today - pd.Timedelta(days=HISTORY_DAYS) - pd.Timestamp('1970-01-01')).total_seconds())
+    stored = store.read_frame(symbols, since=since)
+    prices = pd.concat([stored, fresh[fresh.index.get_level_values('Date') >= today]])
+    prices = prices[~prices.index.duplicated(keep='last')]
+    return prices.sort_index(), set(fresh.index.get_level_values('Symbol'))
+
+
+def compute_quotes(prices):
+    """
+    Uzun formattaki fiyat tablosundan tüm semboller için fiyat, değişim,
+    hacim ve ortalamaları tek seferde (vektörel) hesaplar.
+    """
+    by_symbol = prices.groupby(level='Symbol')
+
+    last = by_symbol.tail(1).droplevel('Date')
+    prev_close = by_symbol.tail(2).groupby(level='Symbol')['Close'].first()
+    close = last['Close']
+    change = close - prev_close
+    change_pct = (change / prev_close * 100).where(prev_close > 0, 0.0)
+
+    def tail_mean(n, column):
+        return by_symbol.tail(n).groupby(level='Symbol')[column].mean()
+
+    table = pd.DataFrame({
+        "price": close,
+        "change": change,
+        "changeRate": change_pct,
+        "previousClose": prev_close,
+        "open": last['Open'],
+        "dayLow": last['Low'],
+        "dayHigh": last['High'],
+        "fiftyTwoWeekLow": by_symbol['Low'].min(),
+        "fiftyTwoWeekHigh": by_symbol['High'].max(),
+        "fiftyDayAverage": tail_mean(50, 'Close'),
+        "twoHundredDayAverage": tail_mean(200, 'Close'),
+        "volume": last['Volume'].fillna(0),
+        "averageVolume": tail_mean(63, 'Volume'),
+        "averageVolume10days": tail_mean(10, 'Volume'),
+        "rows": by_symbol.size(),
+    })
+
+    price_cols = ["price", "change", "changeRate", "previousClose", "open", "dayLow",
+                  "dayHigh", "fiftyTwoWeekLow", "fiftyTwoWeekHigh",
+                  "fiftyDayAverage", "twoHundredDayAverage"]
+    table[price_cols] = table[price_cols].round(2)
+
+    history = by_symbol.tail(HISTORY_TAIL)[['Close', 'Volume']]
+    history = history.assign(Volume=history['Volume'].fillna(0).astype('int64'))
+
+    quotes = {}
+    for symbol, row in table.iterrows():
+        volume = int(row['volume'])
+        quote = {col: float(row[col]) for col in price_cols}
+        quote["volume"] = f"{volume:,}"
+        quote["averageVolume"] = int(row['averageVolume']) if pd.notna(row['averageVolume']) else volume
+        quote["averageVolume10days"] = int(row['averageVolume10days']) if pd.notna(row['averageVolume10days']) else volume
+        quote["indicators"] = None
+        quote["historicalData"] = (
+            history.xs(symbol, level='Symbol').to_dict('records')
+            if row['rows'] >= HISTORY_TAIL else []
+        )
+        quotes[symbol] = quote
+    return quotes
+
+
+def fetch_info(symbol):
+    with metrics.span('fetch'):
+        return yf.Ticker(symbol).info
+
+
+def extract_group(info, group, code):
+    """Bir .info sözlüğünden tek bir alan grubunun değerlerini çıkarır."""
+    values = {}
+    for key, (info_key, default) in INFO_GROUPS[group]["fields"].items():
+        values[key] = info.get(info_key, default)
+    if group == "profile":
+        values["shortName"] = values["shortName"] or code
+        values["name"] = values["name"] or values["shortName"]
+    return values
+
+
+def default_fields(code):
+    values = {}
+    for group in INFO_GROUPS:
+        values.update(extract_group({}, group, code))
+    return values
+
+
+def load_json(path, default):
+    if not os.path.exists(path):
+        return default
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
     except Exception as e:
-        fail_count += 1
-        print(f"✗ Hata: {str(e)[:30]}")
-
-# Sonuçları kaydet
-output = {
-    "last_update": datetime.now().isoformat(),
-    "source": "Yahoo Finance (yfinance)",
-    "total_stocks": len(stocks_data),
-    "successful": success_count,
-    "failed": fail_count,
-    "stocks": stocks_data
-}
+        print(f"⚠️ {path} okunamadı: {e}")
+        return default
+
+
+def save_json(path, data, changelog=False, **kwargs):
+    """
+    İçerik (zaman damgaları hariç) değişmediyse dosyaya dokunmaz; yazdıysa
+    True döner. Değişiklik günlüğü yalnızca istenen dosyalar için tutulur.
+    """
+    return write_json(path, data, changelog=changelog, **kwargs)
+
+
+def write_quotes_index(output):
+    """Liste/arama sayfalarının ihtiyaç duyduğu alanlarla kompakt indeks yazar."""
+    index = {
+        "last_update": output["last_update"],
+        "total_stocks": output["total_stocks"],
+        "stocks": [{key: s[key] for key in INDEX_FIELDS} for s in output["stocks"]],
+    }
+    save_json(QUOTES_INDEX_PATH, index, separators=(',', ':'))
+
+
+def write_shards(output):
+    """Her hisse için public/stocks/<KOD>.json detay dosyası yazar (StockDetail için)."""
+    os.makedirs(SHARDS_DIR, exist_ok=True)
+    for stock in output["stocks"]:
+        shard = {"last_update": output["last_update"], **stock}
+        save_json(os.path.join(SHARDS_DIR, f"{stock['code']}.json"), shard, separators=(',', ':'))
+
+
+def is_expired(stamp, ttl, now):
+    if not stamp:
+        return True
+    try:
+        return now - datetime.fromisoformat(stamp) >= ttl
+    except ValueError:
+        return True
+
+
+def due_groups(symbol_state, now, force=False):
+    """Süresi dolmuş (yeniden istenmesi gereken) .info gruplarını döndürür."""
+    return [
+        group for group, spec in INFO_GROUPS.items()
+        if force or is_expired(symbol_state.get(group), spec["ttl"], now)
+    ]
+
+
+def build_record(code, symbol, values):
+    # Anahtar sırası: kimlik, fiyat verileri, .info grupları, geçmiş
+    record = {
+        "code": code,
+        "symbol": symbol,
+        "name": values["name"],
+        "shortName": values["shortName"],
+    }
+    for key in QUOTE_FIELDS:
+        if key != "historicalData":
+            record[key] = values[key]
+    for spec in INFO_GROUPS.values():
+        for key in spec["fields"]:
+            record.setdefault(key, values[key])
+    record["historicalData"] = values["historicalData"]
+    return record
+
+
+def main():
+    force = '--fundamentals' in sys.argv
+    now = datetime.now()
 
-# JSON'a yaz
-try:
-    with open('public/bist_live_data.json', 'w', encoding='utf-8') as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
-    
-    print("\n" + "=" * 60)
-    print("✅ BAŞARILI!")
     print("=" * 60)
-    print(f"📊 Başarılı: {success_count} hisse")
-    print(f"❌ Başarısız: {fail_count} hisse")
-    print(f"📁 Dosya: public/bist_live_data.json")
-    print(f"🕐 Güncelleme: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("BIST CANLI VERİ ÇEKİCİ - Yahoo Finance")
     print("=" * 60)
-    
-except Exception as e:
-    print(f"\n❌ HATA: Dosya kaydedilemedi - {e}")
-    sys.exit(1)
+
+    previous = load_json(OUTPUT_PATH, {})
+    previous_stocks = {s["code"]: s for s in previous.get("stocks", [])}
+    state = load_json(REFRESH_STATE_PATH, {})
+    symbol_states = state.setdefault("symbols", {})
+
+    # Önceki çalıştırma yarıda kaldıysa bitirdiği hisseler (ve .info zaman
+    # damgaları) devralınır; süresi dolmamış gruplar yeniden istenmez
+    checkpoint = Checkpoint(CHECKPOINT_PATH)
+    resumed = checkpoint.load()
+    if resumed:
+        print(f"♻️ Yarıda kalan çalıştırmadan {len(resumed)} hisse devralındı")
+        for code, entry in resumed.items():
+            previous_stocks[code] = {**previous_stocks.get(code, {}), **entry["record"]}
+            symbol_states.setdefault(code, {}).update(entry["stamps"])
+
+    # Sembol evreni: yeni halka arzlar eklenir, art arda hata veren hisseler bekletilir
+    universe = Universe()
+    promoted = universe.promote_ipos()
+    if promoted:
+        print(f"🆕 Halka arz listesinden {len(promoted)} yeni hisse eklendi: {', '.join(promoted)}")
+    codes = universe.active(now)
+    if len(codes) < len(universe):
+        print(f"⏸️ {len(universe) - len(codes)} hisse art arda hata verdiği için bu çalıştırmada atlanıyor")
+
+    quotes_due = not previous_stocks or is_expired(state.get("quote"), QUOTE_TTL, now)
+    if quotes_due:
+        print(f"\nToplam {len(codes)} hisse için fiyatlar toplu çekiliyor...\n")
+        store = OhlcvStore()
+        prices, fetched = download_prices(codes, store)
+        backed_off = universe.record(
+            ok=[code for code in codes if f"{code}.IS" in fetched],
+            failed=[code for code in codes if f"{code}.IS" not in fetched],
+            now=now,
+        )
+        if backed_off:
+            print(f"⏸️ Veri gelmeyen {len(backed_off)} hisse bekletmeye alındı: {', '.join(backed_off)}")
+        with metrics.span('transform'):
+            quotes = compute_quotes(prices) if not prices.empty else {}
+        if quotes:
+            started = time.perf_counter()
+            with metrics.span('transform'):
+                for symbol, values in compute_indicators(prices).items():
+                    if symbol in quotes:
+                        quotes[symbol]["indicators"] = values
+            print(f"📐 Teknik göstergeler {time.perf_counter() - started:.2f} sn'de hesaplandı")
+        del prices  # Kalan adımlar yalnızca hesaplanan değerleri kullanır
+        print(f"📈 {len(quotes)}/{len(codes)} hisse için fiyat alındı")
+        if quotes:
+            state["quote"] = now.isoformat()
+    else:
+        print("\n📈 Fiyatlar güncel (TTL dolmadı), önceki veriler kullanılıyor")
+        quotes = {
+            s["symbol"]: {key: s.get(key) for key in QUOTE_FIELDS}
+            for s in previous_stocks.values()
+        }
+
+    records = {}
+    success_count = 0
+    fail_count = 0
+    group_refreshes = {group: 0 for group in INFO_GROUPS}
+    # .info bekleyen hisseler: sembol -> (sıra, kod, değerler, gruplar)
+    pending = {}
+
+    def finish(code, symbol, values):
+        record = build_record(code, symbol, values)
+        checkpoint.append(code, {"record": record, "stamps": symbol_states[code]})
+        records[code] = record
+
+    for i, code in enumerate(codes, 1):
+        symbol = f"{code}.IS"
+        # Tüketilen fiyat verisi hemen bırakılır
+        quote = quotes.pop(symbol, None)
+        if quote is None:
+            fail_count += 1
+            print(f"[{i}/{len(codes)}] {code}... ✗ Veri yok")
+            continue
+
+        values = {**default_fields(code), **previous_stocks.get(code, {}), **quote}
+        groups = due_groups(symbol_states.setdefault(code, {}), now, force)
+        if groups:
+            pending[symbol] = (i, code, values, groups)
+        else:
+            finish(code, symbol, values)
+        success_count += 1
+
+    # .info istekleri sınırlı sayıda eşzamanlı işçiyle yapılır; her sonuç
+    # geldiği anda kayda ve checkpoint'e yazılır
+    info_requests = len(pending)
+    if pending:
+        print(f"\n🏢 {info_requests} hisse için .info isteniyor "
+              f"({WORKERS} işçi, istek başına en fazla {CALL_TIMEOUT:g} sn)")
+        for symbol, info, error in bounded_map(fetch_info, list(pending)):
+            i, code, values, groups = pending.pop(symbol)
+            if error is None:
+                metrics.count('info', 'ok')
+                for group in groups:
+                    values.update(extract_group(info, group, code))
+                    symbol_states[code][group] = now.isoformat()
+                    group_refreshes[group] += 1
+            else:
+                metrics.count('info', 'error')
+                # Süresi dolan gruplar bir sonraki çalıştırmada tekrar denenir
+                print(f"[{i}/{len(codes)}] {code}... ⚠️ .info hatası: {str(error)[:30]}")
+            finish(code, symbol, values)
+
+    # Çıktı sırası evren sırasıdır, tamamlanma sırası değil
+    stocks_data = [records[code] for code in codes if code in records]
+
+    # Sonuçları kaydet
+    output = {
+        "last_update": state.get("quote", now.isoformat()),
+        "source": "Yahoo Finance (yfinance)",
+        "total_stocks": len(stocks_data),
+        "successful": success_count,
+        "failed": fail_count,
+        "stocks": stocks_data
+    }
+
+    # JSON'a yaz
+    try:
+        changed = DeltaFeed(DELTA_DIR).publish(OUTPUT_PATH, output, previous, indent=2)
+        write_quotes_index(output)
+        write_shards(output)
+        write_columns_json(COLUMNS_PATH, output["stocks"], output["last_update"])
+        if '--binary-columns' in sys.argv:
+            write_columns_binary(COLUMNS_BINARY_DIR, output["stocks"], output["last_update"])
+        # Durum dosyasındaki zaman damgaları TTL için gerekli, hiçbiri atlanmaz
+        save_json(REFRESH_STATE_PATH, state, volatile=(), indent=1, sort_keys=True)
+        universe.save()
+        checkpoint.clear()
+
+        print("\n" + "=" * 60)
+        print("✅ BAŞARILI!")
+        print("=" * 60)
+        print(f"📊 Başarılı: {success_count} hisse")
+        print(f"❌ Başarısız: {fail_count} hisse")
+        print(f"🏢 .info isteği: {info_requests} hisse")
+        for group, count in group_refreshes.items():
+            print(f"   - {group}: {count} yenilendi")
+        print(f"📁 Dosya: {OUTPUT_PATH}, {QUOTES_INDEX_PATH}, {SHARDS_DIR}/"
+              + ("" if changed else " (veri değişmedi, yazılmadı)"))
+        print(f"🕐 Güncelleme: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n❌ HATA: Dosya kaydedilemedi - {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    with metrics.run('yfinance'):
+        main()
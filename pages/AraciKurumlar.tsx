@@ -4,6 +4,7 @@ import { Link } from 'react-router-dom';
 import { slugify } from '../utils/slugify';
 import SEO from '../components/SEO';
 import FAQItem from '../components/FAQItem';
+import { fetchDataset } from '../utils/dataUrl';
 
 interface Broker {
     name: string;
@@ -19,7 +20,7 @@ const AraciKurumlar: React.FC = () => {
     useEffect(() => {
         const fetchBrokers = async () => {
             try {
-                const response = await fetch('/brokers_tefas.json');
+                const response = await fetchDataset('brokers_tefas.json');
                 if (response.ok) {
                     const data = await response.json();
                     // Sort by total reports by default to show most active first
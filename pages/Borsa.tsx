@@ -4,6 +4,7 @@ import { Search, ChevronRight, TrendingUp, TrendingDown, BarChart2, Filter, Acti
 import { AreaChart, Area } from 'recharts';
 import SEO from '../components/SEO';
 import { slugify } from '../utils/slugify';
+import { fetchDataset } from '../utils/dataUrl';
 
 interface StockData {
     code: string;
@@ -53,7 +54,7 @@ const Borsa: React.FC = () => {
 
     useEffect(() => {
         // Fetch real-time BIST data
-        fetch('/bist_live_data.json')
+        fetchDataset('bist_quotes.json')
             .then(res => res.json())
             .then(data => {
                 setStocks(data.stocks);
@@ -5,6 +5,7 @@ import { ArrowLeft, TrendingUp, TrendingDown, Activity, ChevronRight, Target, Sh
 import SEO from '../components/SEO';
 import FAQItem from '../components/FAQItem';
 import { slugify } from '../utils/slugify';
+import { fetchDataset } from '../utils/dataUrl';
 
 interface Recommendation {
     symbol: string;
@@ -47,7 +48,7 @@ const BrokerDetail: React.FC = () => {
     useEffect(() => {
         const fetchBroker = async () => {
             try {
-                const response = await fetch('/brokers_tefas.json');
+                const response = await fetchDataset('brokers_tefas.json');
                 if (response.ok) {
                     const data: Broker[] = await response.json();
                     // Find broker by slug matching (using strict slugify)
@@ -1,6 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import SEO from '../components/SEO';
 import { Search, ArrowRightLeft, TrendingUp, DollarSign, Activity, PieChart } from 'lucide-react';
+import { fetchDataset } from '../utils/dataUrl';
 
 interface StockData {
     code: string;
@@ -25,7 +26,7 @@ const ComparePage: React.FC = () => {
 
     useEffect(() => {
         // Fetch real data
-        fetch('/bist_live_data.json')
+        fetchDataset('bist_quotes.json')
             .then(res => res.json())
             .then(data => {
                 if (data && data.stocks) {
@@ -2,6 +2,7 @@ import React, { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
 import SEO from '../components/SEO';
 import { slugify } from '../utils/slugify';
+import { fetchDataset } from '../utils/dataUrl';
 
 interface Commodity {
     name: string;
@@ -9,6 +10,10 @@ interface Commodity {
     sell_price: string;
     change_rate: string;
     fetched_at: string;
+    // Parsed by the scraper (pipeline/turkish.py)
+    buy_value?: number | null;
+    sell_value?: number | null;
+    change_value?: number | null;
 }
 
 const Emtia: React.FC = () => {
@@ -29,7 +34,7 @@ const Emtia: React.FC = () => {
     useEffect(() => {
         const fetchData = async () => {
             try {
-                const response = await fetch('/emtia.json');
+                const response = await fetchDataset('emtia.json');
                 if (response.ok) {
                     const jsonData = await response.json();
                     setData(jsonData);
@@ -68,8 +73,9 @@ const Emtia: React.FC = () => {
 
         // Parse numbers for price and rate
         if (sortConfig.key === 'buy_price' || sortConfig.key === 'sell_price') {
-            aValue = parseFloat(aValue.replace(/[.,]/g, '').replace('TL', '').replace('$', '').trim()) || 0;
-            bValue = parseFloat(bValue.replace(/[.,]/g, '').replace('TL', '').replace('$', '').trim()) || 0;
+            const valueKey = sortConfig.key === 'buy_price' ? 'buy_value' : 'sell_value';
+            aValue = a[valueKey] ?? (parseFloat(aValue.replace(/[.,]/g, '').replace('TL', '').replace('$', '').trim()) || 0);
+            bValue = b[valueKey] ?? (parseFloat(bValue.replace(/[.,]/g, '').replace('TL', '').replace('$', '').trim()) || 0);
         }
 
         if (aValue < bValue) return sortConfig.direction === 'asc' ? -1 : 1;
@@ -109,8 +115,8 @@ const Emtia: React.FC = () => {
                 return parseFloat(clean);
             };
 
-            const buy = parsePrice(item.buy_price) * amount;
-            const sell = parsePrice(item.sell_price) * amount;
+            const buy = (item.buy_value ?? parsePrice(item.buy_price)) * amount;
+            const sell = (item.sell_value ?? parsePrice(item.sell_price)) * amount;
 
             setCalcResult({
                 buy: new Intl.NumberFormat('tr-TR', { style: 'currency', currency: 'TRY' }).format(buy),
@@ -3,6 +3,7 @@ import { useParams, Link } from 'react-router-dom';
 import { ArrowLeft, TrendingUp, TrendingDown, Clock, Shield, AlertCircle, Calculator, Info, ChevronRight, BarChart2 } from 'lucide-react';
 import SEO from '../components/SEO';
 import { slugify } from '../utils/slugify';
+import { fetchDataset } from '../utils/dataUrl';
 
 // Interface for Commodity Data
 interface Commodity {
@@ -11,6 +12,10 @@ interface Commodity {
     sell_price: string;
     change_rate: string;
     fetched_at: string;
+    // Parsed by the scraper (pipeline/turkish.py)
+    buy_value?: number | null;
+    sell_value?: number | null;
+    change_value?: number | null;
 }
 
 const EmtiaDetail: React.FC = () => {
@@ -27,7 +32,7 @@ const EmtiaDetail: React.FC = () => {
     useEffect(() => {
         const fetchData = async () => {
             try {
-                const response = await fetch('/emtia.json');
+                const response = await fetchDataset('emtia.json');
                 if (response.ok) {
                     const jsonData: Commodity[] = await response.json();
                     setAllData(jsonData);
@@ -91,8 +96,8 @@ const EmtiaDetail: React.FC = () => {
         return parseFloat(clean) || 0;
     };
 
-    const buyPrice = parsePrice(commodity.buy_price);
-    const sellPrice = parsePrice(commodity.sell_price);
+    const buyPrice = commodity.buy_value ?? parsePrice(commodity.buy_price);
+    const sellPrice = commodity.sell_value ?? parsePrice(commodity.sell_price);
 
     // Spread Calculation
     const spread = sellPrice - buyPrice;
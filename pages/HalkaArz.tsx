@@ -3,6 +3,7 @@ import { Link } from 'react-router-dom';
 import { ArrowLeft, Calendar, Users, BarChart, Info, Clock, CheckCircle2 } from 'lucide-react';
 import SEO from '../components/SEO';
 import { slugify } from '../utils/slugify';
+import { fetchDataset } from '../utils/dataUrl';
 
 interface IPOItem {
     code: string;
@@ -16,6 +17,11 @@ interface IPOItem {
     link?: string;
     logo?: string;
     slug?: string;
+    // Parsed by the scraper (pipeline/turkish.py); null when not determinable
+    priceValue?: number | null;
+    lotCountValue?: number | null;
+    startDate?: string | null;
+    endDate?: string | null;
 }
 
 const FAQItem = ({ question, answer }: { question: string, answer: string }) => {
@@ -48,7 +54,8 @@ const FAQItem = ({ question, answer }: { question: string, answer: string }) =>
 };
 
 const IPOCard: React.FC<{ ipo: IPOItem; isDraft?: boolean }> = ({ ipo, isDraft }) => {
-    const formatPrice = (p: string | number) => {
+    const formatPrice = (p: string | number, value?: number | null) => {
+        if (value != null) return `₺${value.toFixed(2)}`;
         if (!p) return 'Belirlenmedi';
         if (typeof p === 'number') return `₺${p.toFixed(2)}`;
         // If string and looks like number
@@ -112,7 +119,7 @@ const IPOCard: React.FC<{ ipo: IPOItem; isDraft?: boolean }> = ({ ipo, isDraft }
                 <div className="bg-zinc-900/60 p-3 rounded-lg border border-white/5">
                     <div className="text-zinc-500 text-xs mb-1">Arz Fiyatı</div>
                     <div className="text-white font-mono font-bold">
-                        {formatPrice(ipo.price)}
+                        {formatPrice(ipo.price, ipo.priceValue)}
                     </div>
                 </div>
                 <div className="bg-zinc-900/60 p-3 rounded-lg border border-white/5">
@@ -144,7 +151,7 @@ const HalkaArz: React.FC = () => {
         const fetchData = async () => {
             try {
                 console.log("Fetching IPO data...");
-                const response = await fetch(`/halkarz_ipos.json?v=${new Date().getTime()}`);
+                const response = await fetchDataset('halkarz_ipos.json');
                 if (!response.ok) throw new Error('Data fetch failed');
                 const data = await response.json();
                 console.log("Fetched data:", data);
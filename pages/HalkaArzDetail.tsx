@@ -4,6 +4,7 @@ import { MOCK_IPOS } from '../constants';
 import { ArrowLeft, Calendar, Building, Info, Tag, Layers, PieChart, Wallet, Users, BarChart } from 'lucide-react';
 import SEO from '../components/SEO';
 import { slugify } from '../utils/slugify';
+import { fetchDataset } from '../utils/dataUrl';
 
 const DetailRow = ({ label, value }: { label: string; value: React.ReactNode }) => (
     <div className="grid grid-cols-1 md:grid-cols-2 gap-2 py-4 border-b border-white/5 last:border-0">
@@ -27,7 +28,7 @@ const HalkaArzDetail: React.FC = () => {
     React.useEffect(() => {
         const fetchData = async () => {
             try {
-                const response = await fetch('/halkarz_ipos.json');
+                const response = await fetchDataset('halkarz_ipos.json');
                 if (!response.ok) throw new Error('Failed to fetch');
                 const data = await response.json();
 
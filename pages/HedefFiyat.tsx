@@ -16,6 +16,9 @@ interface HalkarzTargetPrice {
     hf_desc: string;
     hf_icon: string;
     hf_fiyat: string;
+    // Parsed by the scraper (pipeline/turkish.py)
+    targetPrice?: number | null;
+    dateIso?: string | null;
 }
 
 // Aggregated stock data for display
@@ -109,6 +112,7 @@ const TargetCard: React.FC<{ item: StockTargetData }> = ({ item }) => {
 }
 
 import SEO from '../components/SEO';
+import { fetchDataset } from '../utils/dataUrl';
 
 const HedefFiyat: React.FC = () => {
     const [data, setData] = useState<StockTargetData[]>([]);
@@ -118,7 +122,7 @@ const HedefFiyat: React.FC = () => {
 
     useEffect(() => {
         // Fetch Halkarz target price data
-        fetch('/halkarz_target_prices.json')
+        fetchDataset('halkarz_target_prices.json')
             .then(res => res.json())
             .then((jsonData: HalkarzTargetPrice[]) => {
                 // Group by stock code
@@ -134,7 +138,7 @@ const HedefFiyat: React.FC = () => {
 
                 // Transform to aggregated data
                 const aggregated: StockTargetData[] = Array.from(stockMap.entries()).map(([code, reports]) => {
-                    const prices = reports.map(r => parseFloat(r.hf_fiyat.replace(',', '.')));
+                    const prices = reports.map(r => r.targetPrice ?? parseFloat(r.hf_fiyat.replace(',', '.')));
 
                     // Count recommendations
                     let buyCount = 0, holdCount = 0, sellCount = 0;
@@ -4,6 +4,7 @@ import { ArrowLeft, TrendingUp, TrendingDown, Calendar, Target, Award, BarChart3
 import SEO from '../components/SEO';
 import { slugify } from '../utils/slugify';
 import { fixTurkishChars } from '../utils/fixEncoding';
+import { fetchDataset } from '../utils/dataUrl';
 
 // Halkarz data structure
 interface HalkarzTargetPrice {
@@ -16,6 +17,9 @@ interface HalkarzTargetPrice {
     hf_desc: string;
     hf_icon: string;
     hf_fiyat: string;
+    // Parsed by the scraper (pipeline/turkish.py)
+    targetPrice?: number | null;
+    dateIso?: string | null;
 }
 
 const HedefFiyatDetail: React.FC = () => {
@@ -26,7 +30,7 @@ const HedefFiyatDetail: React.FC = () => {
 
     useEffect(() => {
         // Fetch Halkarz target price data
-        fetch('/halkarz_target_prices.json')
+        fetchDataset('halkarz_target_prices.json')
             .then(res => res.json())
             .then((jsonData: HalkarzTargetPrice[]) => {
                 // Filter reports for this stock code
@@ -72,7 +76,7 @@ const HedefFiyatDetail: React.FC = () => {
     }
 
     // Calculate statistics
-    const prices = reports.map(r => parseFloat(r.hf_fiyat.replace(',', '.')));
+    const prices = reports.map(r => r.targetPrice ?? parseFloat(r.hf_fiyat.replace(',', '.')));
     const averageTarget = prices.reduce((a, b) => a + b, 0) / prices.length;
     const highestTarget = Math.max(...prices);
     const lowestTarget = Math.min(...prices);
@@ -222,7 +226,7 @@ const HedefFiyatDetail: React.FC = () => {
                                 </thead>
                                 <tbody className="divide-y divide-white/5">
                                     {reports.map((report, idx) => {
-                                        const targetPrice = parseFloat(report.hf_fiyat.replace(',', '.'));
+                                        const targetPrice = report.targetPrice ?? parseFloat(report.hf_fiyat.replace(',', '.'));
 
                                         // Get recommendation color
                                         const getRecommendationStyle = (desc: string) => {
@@ -35,6 +35,7 @@ import MarketHeatmap from '../components/MarketHeatmap';
 import { Skeleton } from '../components/Skeleton';
 import { ParticleBackground } from '../components/ParticleBackground';
 import { Sparkline } from '../components/Sparkline';
+import { fetchDataset } from '../utils/dataUrl';
 
 const Home: React.FC = () => {
   const [searchTerm, setSearchTerm] = useState('');
@@ -44,7 +45,7 @@ const Home: React.FC = () => {
 
   useEffect(() => {
     // Fetch real-time BIST stock data from Yahoo Finance
-    fetch('/bist_live_data.json')
+    fetchDataset('bist_quotes.json')
       .then(res => res.json())
       .then(data => {
         // Use real-time BIST data
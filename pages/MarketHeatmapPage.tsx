@@ -2,16 +2,16 @@ import React, { useState, useEffect } from 'react';
 import { PieChart, TrendingUp, TrendingDown } from 'lucide-react';
 import SEO from '../components/SEO';
 import MarketHeatmap from '../components/MarketHeatmap';
+import { loadQuoteColumns } from '../utils/quoteColumns';
 
 const MarketHeatmapPage: React.FC = () => {
-    const [stocks, setStocks] = useState<any[]>([]);
+    const [changeRates, setChangeRates] = useState<Float32Array>(new Float32Array());
     const [loading, setLoading] = useState(true);
 
     useEffect(() => {
-        fetch('/bist_live_data.json')
-            .then(res => res.json())
-            .then(data => {
-                setStocks(data.stocks || []);
+        loadQuoteColumns()
+            .then(columns => {
+                setChangeRates(columns.changeRates);
                 setLoading(false);
             })
             .catch(err => {
@@ -20,9 +20,9 @@ const MarketHeatmapPage: React.FC = () => {
             });
     }, []);
 
-    const gainers = stocks.filter(s => s.changeRate > 0).length;
-    const losers = stocks.filter(s => s.changeRate < 0).length;
-    const neutral = stocks.length - gainers - losers;
+    const gainers = changeRates.filter(rate => rate > 0).length;
+    const losers = changeRates.filter(rate => rate < 0).length;
+    const neutral = changeRates.length - gainers - losers;
 
     return (
         <div className="space-y-8 animate-in fade-in duration-500 pb-20">
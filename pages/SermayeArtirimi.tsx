@@ -3,6 +3,7 @@ import { Layers, ArrowRight, CheckCircle2, Clock, AlertCircle, Loader2 } from 'l
 import { Link } from 'react-router-dom';
 import SEO from '../components/SEO';
 import { slugify } from '../utils/slugify';
+import { fetchDataset } from '../utils/dataUrl';
 
 interface CapitalIncrease {
   code: string;
@@ -22,7 +23,7 @@ const SermayeArtirimi: React.FC = () => {
   useEffect(() => {
     const fetchData = async () => {
       try {
-        const response = await fetch(`/sermaye_artirimi.json?v=${new Date().getTime()}`);
+        const response = await fetchDataset('sermaye_artirimi.json');
         if (response.ok) {
           const result = await response.json();
           setData(result);
@@ -289,6 +289,7 @@ const CommunitySentiment = ({ stockCode }: { stockCode: string }) => {
 };
 
 import { Breadcrumbs } from '../components/Breadcrumbs';
+import { fetchDataset } from '../utils/dataUrl';
 
 const StockDetail: React.FC = () => {
   const { symbol } = useParams<{ symbol: string }>();
@@ -308,15 +309,18 @@ const StockDetail: React.FC = () => {
   // ... useEffects ...
 
   useEffect(() => {
-    // Fetch real-time BIST data
-    fetch('/bist_live_data.json')
+    // Fetch the slim quote index (ranking, related stocks) and then this stock's detail file
+    fetchDataset('bist_quotes.json')
       .then(res => res.json())
-      .then(data => {
+      .then(async data => {
         // Find the stock by code or matching long slug
-        const foundStock = data.stocks.find((s: any) => {
+        const indexStock = data.stocks.find((s: any) => {
           const longSlug = slugify(`${s.code} Hisse Senedi Fiyatı Grafiği ${s.code} Yorumu 2026`);
           return s.code === stockCode || longSlug === symbol;
         });
+        const foundStock = indexStock
+          ? await fetch(`/stocks/${indexStock.code}.json`).then(res => res.json())
+          : null;
 
         if (foundStock) {
           // Use all comprehensive data from JSON
@@ -390,7 +394,7 @@ const StockDetail: React.FC = () => {
       });
 
     // Check if stock has target price data
-    fetch('/halkarz_target_prices.json')
+    fetchDataset('halkarz_target_prices.json')
       .then(res => res.json())
       .then(targetData => {
         // Simple check, code resolution handled above
@@ -400,7 +404,7 @@ const StockDetail: React.FC = () => {
       .catch(() => setHasTargetPrice(false));
 
     // Fetch Dividend Data
-    fetch('/temettu.json')
+    fetchDataset('temettu.json')
       .then(res => res.json())
       .then(data => {
         const dividend = data.find((d: any) => d.t_bistkod === (stock?.code || code?.toUpperCase()));
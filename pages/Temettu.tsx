@@ -9,6 +9,7 @@ import DividendCalculator from '../components/DividendCalculator';
 import DividendFilters, { FilterState } from '../components/DividendFilters';
 import DividendViewSwitcher from '../components/DividendViewSwitcher';
 import DividendCard from '../components/DividendCard';
+import { fetchDataset } from '../utils/dataUrl';
 
 interface Dividend {
    t_bistkod: string;
@@ -23,6 +24,10 @@ interface Dividend {
    t_odemetarihi?: string;
    t_getiri?: number;
    t_link: string;
+   // Parsed by the scraper (pipeline/turkish.py)
+   netDividend?: number | null;
+   yieldRate?: number | null;
+   dateIso?: string | null;
    t_ok: string;
 }
 
@@ -43,7 +48,7 @@ const Temettu: React.FC = () => {
    useEffect(() => {
       const fetchData = async () => {
          try {
-            const response = await fetch('/temettu.json');
+            const response = await fetchDataset('temettu.json');
             if (response.ok) {
                const result = await response.json();
                setData(result);
@@ -68,7 +73,8 @@ const Temettu: React.FC = () => {
       // Date range filter
       let dateMatch = true;
       if (filters.dateRange.start || filters.dateRange.end) {
-         const itemDate = item.t_tarih || item.t_odemetarihi;
+         // dateIso is YYYY-MM-DD; t_tarih (DD.MM.YYYY) is not a valid Date string
+         const itemDate = item.dateIso || item.t_tarih || item.t_odemetarihi;
          if (itemDate) {
             const date = new Date(itemDate);
             if (filters.dateRange.start) {
@@ -90,7 +96,7 @@ const Temettu: React.FC = () => {
       }
 
       // Yield filter
-      const yieldValue = parseFloat(item.t_yuzde) || 0;
+      const yieldValue = item.yieldRate ?? (parseFloat(item.t_yuzde) || 0);
       const yieldMatch = yieldValue >= filters.yieldRange.min && yieldValue <= filters.yieldRange.max;
 
       return searchMatch && dateMatch && typeMatch && yieldMatch;
@@ -4,6 +4,7 @@ import { ArrowLeft, Calendar, DollarSign, Percent, TrendingUp, Clock, AlertCircl
 import SEO from '../components/SEO';
 import FAQItem from '../components/FAQItem';
 import { slugify } from '../utils/slugify';
+import { fetchDataset } from '../utils/dataUrl';
 
 interface Dividend {
     t_bistkod: string;
@@ -13,6 +14,10 @@ interface Dividend {
     t_tarih: string;
     t_link: string;
     t_ok: string;
+    // Parsed by the scraper (pipeline/turkish.py)
+    netDividend?: number | null;
+    yieldRate?: number | null;
+    dateIso?: string | null;
 }
 
 const TemettuDetail: React.FC = () => {
@@ -25,7 +30,7 @@ const TemettuDetail: React.FC = () => {
     useEffect(() => {
         const fetchDividend = async () => {
             try {
-                const response = await fetch('/temettu.json');
+                const response = await fetchDataset('temettu.json');
                 if (response.ok) {
                     const data: Dividend[] = await response.json();
 
@@ -149,7 +154,7 @@ const TemettuDetail: React.FC = () => {
                                         const val = e.target.value;
                                         setUserCost(val);
                                         const cost = parseFloat(val);
-                                        const profit = parseFloat(dividend.t_temt_net.replace(',', '.'));
+                                        const profit = dividend.netDividend ?? parseFloat(dividend.t_temt_net.replace(',', '.'));
                                         if (cost && profit && profit > 0) {
                                             const years = cost / profit;
                                             setAmortizationYears(`${years.toFixed(1)} Yıl`);
@@ -185,7 +190,7 @@ const TemettuDetail: React.FC = () => {
                                 </thead>
                                 <tbody className="divide-y divide-white/5">
                                     {[1, 2, 3].map((year) => {
-                                        const currentAmount = parseFloat(dividend.t_temt_net.replace(',', '.'));
+                                        const currentAmount = dividend.netDividend ?? parseFloat(dividend.t_temt_net.replace(',', '.'));
                                         const amount = currentAmount * Math.pow(1.3, year); // 30% growth assumption
                                         return (
                                             <tr key={year}>
@@ -4,6 +4,7 @@ import { Star, ArrowUpRight, ArrowDownRight, LayoutGrid, Loader2 } from 'lucide-
 import { useWatchlist } from '../hooks/useWatchlist';
 import SEO from '../components/SEO';
 import { slugify } from '../utils/slugify';
+import { fetchDataset } from '../utils/dataUrl';
 
 const Watchlist: React.FC = () => {
     const { watchlist, toggleWatchlist } = useWatchlist();
@@ -11,7 +12,7 @@ const Watchlist: React.FC = () => {
     const [loading, setLoading] = useState(true);
 
     useEffect(() => {
-        fetch('/bist_live_data.json')
+        fetchDataset('bist_quotes.json')
             .then(res => res.json())
             .then(data => {
                 if (data && data.stocks) {
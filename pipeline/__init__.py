@@ -0,0 +1,4 @@
+"""
+Shared building blocks for the data scrapers (crawling, fetching, writing).
+Scripts under scripts/ add the repository root to sys.path before importing.
+"""
@@ -0,0 +1,88 @@
+"""
+Append-only NDJSON checkpoint of finished work units, so a long run that
+dies halfway resumes instead of starting over.
+
+    checkpoint = Checkpoint(os.path.join(CHECKPOINT_DIR, 'yfinance.ndjson'))
+    done = checkpoint.load()            # {key: result} left by an unfinished run
+                                        # (max_age=seconds: only recent ones)
+    with checkpoint:
+        for key in todo:
+            ...
+            checkpoint.append(key, result)   # one line, flushed right away
+    ...                                 # final output written
+    checkpoint.clear()
+
+Each result is serialized as soon as it is ready, so the file always holds
+every unit finished so far; a torn last line (the process died mid-write) is
+ignored when reading back. Later lines for the same key win. The final
+output is assembled from these results plus the work still left, so a retry
+after a failure only pays for the remaining units.
+"""
+import json
+import os
+import threading
+import time
+
+from pipeline.fetch import CACHE_ROOT
+
+CHECKPOINT_DIR = os.path.join(CACHE_ROOT, 'checkpoints')
+
+
+class Checkpoint:
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def load(self, max_age=None):
+        """
+        Results of the units finished by previous, unfinished runs; with
+        `max_age` (seconds), only those finished that recently.
+        """
+        results = {}
+        oldest = time.time() - max_age if max_age is not None else None
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        if oldest is None or entry.get("at", 0) >= oldest:
+                            results[entry["key"]] = entry["result"]
+                    except (ValueError, KeyError, TypeError, AttributeError):
+                        continue
+        except OSError:
+            pass
+        return results
+
+    def append(self, key, result):
+        entry = {"key": key, "at": round(time.time(), 3), "result": result}
+        line = json.dumps(entry, ensure_ascii=False, separators=(',', ':'))
+        with self._lock:
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                self._file = open(self.path, 'a', encoding='utf-8')
+                # A torn line from a crash must not swallow the first new one
+                if self._file.tell():
+                    self._file.write('\n')
+            self._file.write(line + '\n')
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def clear(self):
+        """Drops the checkpoint once the run's output is safely written."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
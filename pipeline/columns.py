@@ -0,0 +1,91 @@
+"""
+Column-oriented quote snapshot for the heatmap and screener pages.
+
+The JSON form holds one array per field plus a shared sector dictionary.
+The optional binary form packs the numeric columns into a single
+little-endian blob that the browser can view directly as typed arrays;
+the manifest lists each column's dtype, byte offset and length.
+"""
+import os
+
+import numpy as np
+
+from pipeline.publish import atomic_write, write_json
+
+# Column name -> (record key, numpy dtype). int64 columns come first so every
+# column starts on an offset that is a multiple of its item size.
+NUMERIC_COLUMNS = {
+    "volumes": ("volume", "<i8"),
+    "marketCaps": ("marketCap", "<i8"),
+    "prices": ("price", "<f4"),
+    "changeRates": ("changeRate", "<f4"),
+    "sectorIds": ("sectorId", "<u2"),
+}
+
+# Names used by the JS typed-array constructors
+JS_TYPES = {"<i8": "BigInt64Array", "<f4": "Float32Array", "<u2": "Uint16Array"}
+
+
+def _number(value):
+    if isinstance(value, str):
+        value = value.replace(',', '')
+    try:
+        return float(value) if value not in (None, '') else 0.0
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def build_columns(stocks):
+    """Turns a list of stock records into {field: [values]} plus a sector table."""
+    sectors = []
+    sector_ids = {}
+    for stock in stocks:
+        sector = stock.get("sector") or "Diğer"
+        if sector not in sector_ids:
+            sector_ids[sector] = len(sectors)
+            sectors.append(sector)
+
+    columns = {"codes": [s["code"] for s in stocks]}
+    for name, (key, dtype) in NUMERIC_COLUMNS.items():
+        if key == "sectorId":
+            columns[name] = [sector_ids[s.get("sector") or "Diğer"] for s in stocks]
+        elif dtype == "<i8":
+            columns[name] = [int(_number(s.get(key))) for s in stocks]
+        else:
+            columns[name] = [round(_number(s.get(key)), 2) for s in stocks]
+    return sectors, columns
+
+
+def write_columns_json(path, stocks, last_update):
+    sectors, columns = build_columns(stocks)
+    snapshot = {"last_update": last_update, "count": len(stocks), "sectors": sectors, **columns}
+    return write_json(path, snapshot, changelog=False, separators=(',', ':'))
+
+
+def write_columns_binary(directory, stocks, last_update):
+    """Writes <directory>/columns.bin and <directory>/manifest.json."""
+    sectors, columns = build_columns(stocks)
+    os.makedirs(directory, exist_ok=True)
+
+    manifest = {
+        "last_update": last_update,
+        "count": len(stocks),
+        "byteOrder": "little",
+        "sectors": sectors,
+        "codes": columns["codes"],
+        "columns": {},
+    }
+    blobs = []
+    offset = 0
+    for name, (_, dtype) in NUMERIC_COLUMNS.items():
+        blob = np.asarray(columns[name], dtype=dtype).tobytes()
+        manifest["columns"][name] = {
+            "dtype": JS_TYPES[dtype],
+            "offset": offset,
+            "length": len(stocks),
+        }
+        blobs.append(blob)
+        offset += len(blob)
+    atomic_write(os.path.join(directory, 'columns.bin'), b''.join(blobs))
+
+    write_json(os.path.join(directory, 'manifest.json'), manifest, changelog=False, separators=(',', ':'))
@@ -0,0 +1,117 @@
+"""
+Pre-compressed siblings of the JSON outputs for static hosting.
+
+For public/x.json this writes minified public/x.json.gz (gzip -9) and
+public/x.json.br (brotli quality 11, when the brotli package is installed),
+so servers or CDNs that support precompressed assets serve the small file
+with no per-request CPU (public/.htaccess does it for Apache via
+Accept-Encoding).
+
+    python -m pipeline.compress dist          # every JSON file of a build
+
+It also writes precompressed.json at the root: the content-negotiation
+manifest listing, per JSON file, its size, hash and the available
+encodings. The siblings are build artifacts and are not committed, so the
+deploy workflow is the only place that makes them (for dist/, after
+`npm run build`); the scrapers write plain JSON only.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+import threading
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Smaller files gain nothing measurable from a second request variant
+MIN_BYTES = 8 * 1024
+MANIFEST_NAME = 'precompressed.json'
+EXTENSIONS = {"br": ".br", "gzip": ".gz"}
+
+
+def minify(text):
+    return json.dumps(json.loads(text), ensure_ascii=False, separators=(',', ':'))
+
+
+def _write_bytes(path, blob):
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(blob)
+    os.replace(tmp, path)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def precompress(path, text=None):
+    """
+    Writes the compressed siblings of the JSON file at `path` (or of `text`,
+    its content) and returns its manifest entry, or None when the file is
+    below MIN_BYTES (stale siblings are removed then).
+    """
+    if text is None:
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+    raw = text.encode('utf-8')
+    if len(raw) < MIN_BYTES:
+        for extension in EXTENSIONS.values():
+            _remove(path + extension)
+        return None
+
+    body = minify(text).encode('utf-8')
+    # mtime=0 keeps the gzip output identical for identical content
+    encoded = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        encoded["br"] = brotli.compress(body, quality=11, mode=brotli.MODE_TEXT)
+
+    entry = {"bytes": len(raw), "sha256": hashlib.sha256(raw).hexdigest(), "encodings": {}}
+    for encoding, blob in encoded.items():
+        _write_bytes(path + EXTENSIONS[encoding], blob)
+        entry["encodings"][encoding] = {"file": os.path.basename(path) + EXTENSIONS[encoding],
+                                        "bytes": len(blob)}
+    return entry
+
+
+def compress_tree(root):
+    """Pre-compresses every JSON file under `root` and writes <root>/precompressed.json."""
+    manifest_path = os.path.join(root, MANIFEST_NAME)
+    files = {}
+    for directory, _, names in os.walk(root):
+        for name in sorted(names):
+            path = os.path.join(directory, name)
+            if name.endswith('.json') and path != manifest_path:
+                entry = precompress(path)
+                if entry:
+                    files[os.path.relpath(path, root).replace(os.sep, '/')] = entry
+    files = dict(sorted(files.items()))
+    manifest = {"encodings": ["br", "gzip"] if brotli is not None else ["gzip"], "files": files}
+    _write_bytes(manifest_path, json.dumps(manifest, ensure_ascii=False, indent=1).encode('utf-8'))
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write .json.br/.json.gz siblings and precompressed.json")
+    parser.add_argument('root', nargs='?', default='public', help="Directory to process (default: public)")
+    args = parser.parse_args()
+    if brotli is None:
+        print("brotli is not installed, writing gzip only")
+    entries = compress_tree(args.root)
+    raw = sum(e["bytes"] for e in entries.values())
+    for encoding in EXTENSIONS:
+        size = sum(e["encodings"][encoding]["bytes"] for e in entries.values() if encoding in e["encodings"])
+        if size:
+            print(f"{encoding}: {len(entries)} files, {raw / 1e6:.2f} MB -> {size / 1e6:.2f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+"""
+Async crawl engine used by the halkarz scrapers.
+
+Every host gets its own token bucket (requests per second) and an adaptive
+concurrency limit that halves on 403/429/503 and slowly grows back while
+requests keep succeeding. Responses go through the shared ResponseCache of
+pipeline.fetch, so unchanged pages are revalidated with a 304, and attempts
+are reported to its HostHealth, which orders the browser profiles and stops
+sending to a host while its circuit is open.
+"""
+import asyncio
+import time
+from urllib.parse import urlsplit
+
+from curl_cffi.requests import AsyncSession
+
+from pipeline import metrics
+from pipeline.fetch import (
+    BROWSER_PROFILES, DEFAULT_HEADERS, THROTTLE_STATUSES, HostHealth, Response, ResponseCache, backoff_delay,
+)
+
+
+class TokenBucket:
+    """Allows `rate` requests per second with bursts of up to `burst`."""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.not_before = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds):
+        """Stops handing out tokens for `seconds` (e.g. after a 429)."""
+        self.not_before = max(self.not_before, time.monotonic() + seconds)
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.not_before:
+                    await asyncio.sleep(self.not_before - now)
+                    continue
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit with additive increase / multiplicative decrease:
+    +1 slot after `increase_after` clean responses, halved when throttled.
+    """
+
+    def __init__(self, initial, minimum=1, maximum=None, increase_after=10):
+        self.limit = initial
+        self.minimum = minimum
+        self.maximum = maximum or initial
+        self.increase_after = increase_after
+        self.active = 0
+        self._streak = 0
+        self._cond = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+
+    async def release(self, throttled=False):
+        async with self._cond:
+            self.active -= 1
+            if throttled:
+                self.limit = max(self.minimum, self.limit // 2)
+                self._streak = 0
+            else:
+                self._streak += 1
+                if self._streak >= self.increase_after and self.limit < self.maximum:
+                    self.limit += 1
+                    self._streak = 0
+            self._cond.notify_all()
+
+
+def _retry_after(response):
+    value = response.headers.get("retry-after")
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+class AsyncCrawler:
+    """
+    Shared AsyncSession with per-host rate limiting and browser rotation.
+
+    Usage:
+        async with AsyncCrawler(rate=4) as crawler:
+            response = await crawler.get(url)
+    """
+
+    def __init__(self, rate=4.0, burst=None, concurrency=4, max_concurrency=8,
+                 retries=3, timeout=30, backoff=1.0, headers=None,
+                 browsers=BROWSER_PROFILES, cache=None, health=None):
+        self.rate = rate
+        self.burst = burst
+        self.concurrency = concurrency
+        self.max_concurrency = max(max_concurrency, concurrency)
+        self.retries = retries
+        self.timeout = timeout
+        self.backoff = backoff
+        self.headers = {**DEFAULT_HEADERS, **(headers or {})}
+        self.browsers = browsers
+        self.cache = cache if cache is not None else ResponseCache()
+        self.health = health if health is not None else HostHealth()
+        self.stats = {"requests": 0, "throttled": 0, "not_modified": 0, "failed": 0, "short_circuited": 0}
+        self._hosts = {}
+        self._session = None
+
+    async def __aenter__(self):
+        self._session = AsyncSession(max_clients=self.max_concurrency)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._session.close()
+        try:
+            self.health.save()
+        except OSError as e:
+            print(f"Could not save host health: {e}")
+
+    def _host(self, url):
+        host = urlsplit(url).hostname
+        if host not in self._hosts:
+            self._hosts[host] = (
+                TokenBucket(self.rate, self.burst),
+                AdaptiveLimiter(self.concurrency, maximum=self.max_concurrency),
+            )
+        return self._hosts[host]
+
+    def limit_for(self, url):
+        """Current concurrency limit of the host serving `url`."""
+        return self._host(url)[1].limit
+
+    async def get(self, url, retries=None, use_cache=True):
+        """
+        Returns the response for 200 and 404 (so callers can detect the end of
+        pagination), or None once all attempts failed or while the host's
+        circuit is open.
+        """
+        with metrics.span('fetch'):
+            return await self._get(url, retries, use_cache)
+
+    async def _get(self, url, retries, use_cache):
+        bucket, limiter = self._host(url)
+        retries = retries or self.retries
+        entry = self.cache.lookup(url) if use_cache else None
+        headers = {**self.headers, **(self.cache.validators(entry) if entry else {})}
+        browsers = self.health.order(url, self.browsers)
+
+        for attempt in range(1, retries + 1):
+            if self.health.is_open(url):
+                self.stats["short_circuited"] += 1
+                metrics.count('circuit', 'short_circuited')
+                return None
+            browser = browsers[(attempt - 1) % len(browsers)]
+            throttled = False
+            status = None
+            await limiter.acquire()
+            try:
+                await bucket.acquire()
+                self.stats["requests"] += 1
+                raw = await self._session.get(
+                    url, headers=headers, impersonate=browser, timeout=self.timeout
+                )
+                status = raw.status_code
+                metrics.record_request(status, len(raw.content), browser, attempt,
+                                       ok=status in (200, 304, 404))
+                if raw.status_code == 304 and entry:
+                    self.stats["not_modified"] += 1
+                    return self.cache.load(url, entry, revalidated=True)
+
+                response = Response.from_curl(url, raw)
+                if response.status_code in (200, 404):
+                    if response.status_code == 200 and use_cache:
+                        self.cache.store(url, response)
+                    return response
+                if response.status_code in THROTTLE_STATUSES:
+                    throttled = True
+                    self.stats["throttled"] += 1
+                    bucket.pause(_retry_after(response) or backoff_delay(attempt, self.backoff * 2))
+            except Exception as e:
+                if status is None:
+                    metrics.record_request(None, 0, browser, attempt)
+                # Otherwise a run where every request fails looks like a run of 404s
+                print(f"  {browser} failed for {url} (attempt {attempt}/{retries}): {type(e).__name__}: {e}")
+            finally:
+                await limiter.release(throttled)
+                if self.health.record(url, browser, status):
+                    print(f"{urlsplit(url).hostname} keeps failing, circuit open")
+                    metrics.count('circuit', 'opened')
+
+            if attempt < retries:
+                await asyncio.sleep(backoff_delay(attempt, self.backoff))
+
+        self.stats["failed"] += 1
+        return None
@@ -0,0 +1,118 @@
+"""
+Versioned delta feed next to a full JSON snapshot (public/bist_live_data.json).
+
+Every time the snapshot's payload changes its "version" goes up by one and
+<directory>/delta-<version>.json holds only what changed since the previous
+version, per record:
+
+    {"from": 41, "to": 42, "last_update": "...",
+     "changed": {"THYAO": {"price": 312.5, "changeRate": 1.2}},
+     "added": {"NEWCO": {...full record...}}, "removed": ["OLDCO"],
+     "fields": {"total_stocks": 589}, "order": [...only when not implied...]}
+
+<directory>/manifest.json lists the current version and the last `keep`
+deltas, so a client holding version N-k applies k small files instead of
+downloading the full snapshot again. The site's pages read the slim
+bist_quotes.json index instead; the feed is for consumers that keep the
+full snapshot.
+"""
+import json
+import os
+
+from pipeline.publish import VOLATILE_KEYS, _canonical, atomic_write, payload_hash, read_json, write_json
+
+MANIFEST_NAME = 'manifest.json'
+
+
+class DeltaFeed:
+    def __init__(self, directory, collection='stocks', key='code', keep=48):
+        self.directory = directory
+        self.collection = collection
+        self.key = key
+        self.keep = keep
+        self.manifest_path = os.path.join(directory, MANIFEST_NAME)
+        # The version counter itself must not make two snapshots differ
+        self.volatile = VOLATILE_KEYS | {"version"}
+
+    def _records(self, snapshot):
+        return {r[self.key]: r for r in (snapshot or {}).get(self.collection, [])}
+
+    def diff(self, previous, current):
+        """Field-level changes from `previous` to `current` (see module docstring)."""
+        before = self._records(previous)
+        after = self._records(current)
+        delta = {"changed": {}, "added": {}, "removed": [code for code in before if code not in after]}
+        for code, record in after.items():
+            old = before.get(code)
+            if old is None:
+                delta["added"][code] = record
+                continue
+            fields = {
+                name: value for name, value in record.items()
+                if name not in self.volatile and _canonical(old.get(name)) != _canonical(value)
+            }
+            # Keys that disappeared are sent as null
+            fields.update({name: None for name in old if name not in record and name not in self.volatile})
+            if fields:
+                delta["changed"][code] = fields
+
+        scalars = {
+            name: value for name, value in current.items()
+            if name != self.collection and name not in self.volatile
+            and _canonical((previous or {}).get(name)) != _canonical(value)
+        }
+        if scalars:
+            delta["fields"] = scalars
+        # Clients drop removed codes and append added ones; anything else needs the order
+        implied = [code for code in before if code in after] + list(delta["added"])
+        if list(after) != implied:
+            delta["order"] = list(after)
+        return delta
+
+    def publish(self, path, snapshot, previous=None, **dump_kwargs):
+        """
+        Writes `snapshot` to `path` with the next version number, plus its
+        delta from `previous` (the snapshot currently published, as read
+        before this run) and the manifest. Returns False, without writing
+        anything, when the payload did not change.
+        """
+        manifest = read_json(self.manifest_path, {}) or {}
+        version = manifest.get("version", 0)
+        if previous and payload_hash(previous, self.volatile) == payload_hash(snapshot, self.volatile):
+            snapshot["version"] = previous.get("version", version)
+            return False
+
+        snapshot["version"] = version + 1
+        write_json(path, snapshot, key=self.key, volatile=self.volatile, **dump_kwargs)
+
+        deltas = manifest.get("deltas", [])
+        if previous and previous.get("version") == version:
+            delta = {"from": version, "to": version + 1, "last_update": snapshot.get("last_update"),
+                     **self.diff(previous, snapshot)}
+            name = f"delta-{version + 1}.json"
+            text = json.dumps(delta, ensure_ascii=False, separators=(',', ':'))
+            atomic_write(os.path.join(self.directory, name), text)
+            deltas.append({"from": version, "to": version + 1, "file": name,
+                           "bytes": len(text.encode('utf-8'))})
+            stale, deltas = deltas[:-self.keep], deltas[-self.keep:]
+        else:
+            # No known base for a delta (first run, or the snapshot was replaced
+            # by hand): clients have to start over from the full snapshot
+            stale, deltas = deltas, []
+
+        for entry in stale:
+            try:
+                os.remove(os.path.join(self.directory, entry["file"]))
+            except OSError:
+                pass
+
+        self.write_manifest({
+            "version": version + 1,
+            "last_update": snapshot.get("last_update"),
+            "snapshot": os.path.basename(path),
+            "deltas": deltas,
+        })
+        return True
+
+    def write_manifest(self, manifest):
+        atomic_write(self.manifest_path, json.dumps(manifest, ensure_ascii=False, indent=1))
@@ -0,0 +1,242 @@
+"""
+Declarative extraction rules shared by the scrapers.
+
+A site is described once, at module level, by rules:
+
+    Field      - text (or an attribute) of the n-th node matching a CSS
+                 selector, optionally narrowed by a regex and converted
+    LabelTable - "label | value" table rows mapped to fields by label regexes
+    CellRules  - cells of a row classified by their content signature
+
+Selectors and regexes are compiled when the rules are built. Spec.extract()
+walks the (strained) tree once, testing every tag against all selectors the
+spec uses, and then resolves the fields from those matches.
+
+    DETAIL = Spec(
+        only=strainer(classes=('sp-table',)),
+        fields={'code': Field('.il-bist-kod', default='')},
+        tables=[LabelTable('table.sp-table tr', [('Fiyat', 'price')])],
+    )
+    record = DETAIL.extract(DETAIL.parse(content))
+"""
+import re
+
+from bs4 import Tag
+
+from pipeline.soup import css, make_soup
+
+
+def _regex(pattern, flags=0):
+    if pattern is None or hasattr(pattern, 'search'):
+        return pattern
+    return re.compile(pattern, flags)
+
+
+def _group(match):
+    """First capture group when the pattern has one, the whole match otherwise."""
+    return match.group(1) if match.re.groups else match.group(0)
+
+
+class Field:
+    """
+    Value of the `index`-th node matching `selector`: its stripped text, or
+    the `attr` attribute. With `pattern` only the (first group of the) match
+    is kept; `convert` is applied last. When the value comes out empty and a
+    `fallback` Field is given, that one is tried instead. `required` fields
+    make Spec.extract() return None when there is no `index`-th node.
+    """
+
+    def __init__(self, selector, attr=None, index=0, pattern=None, convert=None,
+                 default=None, required=False, min_count=0, fallback=None):
+        self.selector = selector
+        self.attr = attr
+        self.index = index
+        self.pattern = _regex(pattern)
+        self.convert = convert
+        self.default = default
+        self.required = required
+        self.min_count = min_count
+        self.fallback = fallback
+
+    def selectors(self):
+        yield self.selector
+        if self.fallback is not None:
+            yield from self.fallback.selectors()
+
+    def present(self, matches):
+        nodes = matches.get(self.selector, ())
+        return -len(nodes) <= self.index < len(nodes)
+
+    def resolve(self, matches):
+        nodes = matches.get(self.selector, ())
+        value = None
+        if len(nodes) >= self.min_count and -len(nodes) <= self.index < len(nodes):
+            node = nodes[self.index]
+            value = node.get(self.attr) if self.attr else node.get_text(strip=True)
+            if value is not None and self.pattern is not None:
+                match = self.pattern.search(value)
+                value = _group(match) if match else None
+            if value is not None and self.convert is not None:
+                value = self.convert(value)
+
+        if not value and self.fallback is not None:
+            alternative = self.fallback.resolve(matches)
+            if alternative is not None:
+                value = alternative
+        return self.default if value is None else value
+
+
+class LabelTable:
+    """
+    Rows (`rows` selector) whose label cell matches one of `labels` —
+    (regex, field) pairs tried in order — give that field the value cell's
+    text. Later rows win, like the hand-written loops they replace.
+    """
+
+    def __init__(self, rows, labels, cells='td', label_cell=0, value_cell=1):
+        self.rows = rows
+        self.labels = [(_regex(pattern), field) for pattern, field in labels]
+        self.cells = cells
+        self.label_cell = label_cell
+        self.value_cell = value_cell
+
+    def selectors(self):
+        yield self.rows
+
+    def resolve(self, matches):
+        values = {}
+        needed = max(self.label_cell, self.value_cell) + 1
+        for row in matches.get(self.rows, ()):
+            cells = row.find_all(self.cells)
+            if len(cells) < needed:
+                continue
+            label = cells[self.label_cell].get_text(strip=True)
+            for pattern, field in self.labels:
+                if pattern.search(label):
+                    values[field] = cells[self.value_cell].get_text(strip=True)
+                    break
+        return values
+
+
+class Spec:
+    """A site's rules: an optional strainer plus Fields and LabelTables."""
+
+    def __init__(self, fields=None, tables=(), defaults=None, only=None):
+        self.fields = dict(fields or {})
+        self.tables = list(tables)
+        self.defaults = dict(defaults or {})
+        self.only = only
+        selectors = []
+        for rule in list(self.fields.values()) + self.tables:
+            for selector in rule.selectors():
+                if selector not in selectors:
+                    selectors.append(selector)
+        self._selectors = [(selector, css(selector)) for selector in selectors]
+
+    def parse(self, content):
+        return make_soup(content, only=self.only)
+
+    def matches(self, root):
+        """One pass over `root`'s descendants: selector -> matching tags in document order."""
+        found = {selector: [] for selector, _ in self._selectors}
+        for node in root.descendants:
+            if isinstance(node, Tag):
+                for selector, compiled in self._selectors:
+                    if compiled.match(node):
+                        found[selector].append(node)
+        return found
+
+    def extract(self, root):
+        matches = self.matches(root)
+        for field in self.fields.values():
+            if field.required and not field.present(matches):
+                return None
+
+        record = dict(self.defaults)
+        for table in self.tables:
+            record.update(table.resolve(matches))
+        for name, field in self.fields.items():
+            record[name] = field.resolve(matches)
+        return record
+
+
+class Cell:
+    """
+    One classification rule for a cell's text. The cell matches when
+    `pattern` (if any) is found and `test` (if any) passes; the stored value
+    is the pattern's first group, or the whole text. `otherwise` computes a
+    value when the pattern does not match.
+
+    - many:  collect every matching cell into a list
+    - once:  keep the first match only
+    - chain: chained rules are exclusive (if/elif); the first one that
+             matches a cell consumes it for the other chained rules
+    """
+
+    def __init__(self, field, pattern=None, test=None, otherwise=None,
+                 many=False, once=False, chain=False):
+        self.field = field
+        self.pattern = _regex(pattern)
+        self.test = test
+        self.otherwise = otherwise
+        self.many = many
+        self.once = once
+        self.chain = chain
+
+    def apply(self, text, values):
+        """Stores the value if the rule matches; returns whether it did."""
+        if self.once and values.get(self.field):
+            return False
+        if self.test is not None and not self.test(text):
+            return False
+
+        if self.pattern is not None:
+            match = self.pattern.search(text)
+            if match:
+                value = _group(match) if self.pattern.groups else text
+            elif self.otherwise is not None:
+                value = self.otherwise(text)
+            else:
+                return False
+        else:
+            value = text
+
+        if self.many:
+            values[self.field].append(value)
+        else:
+            values[self.field] = value
+        return True
+
+
+class CellRules:
+    """
+    Classifies a row of cell texts: `columns` maps a fixed column index to
+    its rules, `rest` is applied to every cell from `start` on.
+    """
+
+    def __init__(self, columns=None, rest=(), start=1):
+        self.columns = {index: list(rules) for index, rules in (columns or {}).items()}
+        self.rest = list(rest)
+        self.start = start
+        rules = [rule for rules in self.columns.values() for rule in rules] + self.rest
+        self._defaults = {rule.field: [] if rule.many else '' for rule in rules}
+
+    @staticmethod
+    def _apply(rules, text, values):
+        consumed = False
+        for rule in rules:
+            if rule.chain:
+                if not consumed and rule.apply(text, values):
+                    consumed = True
+            else:
+                rule.apply(text, values)
+
+    def classify(self, texts):
+        values = {field: [] if isinstance(default, list) else default
+                  for field, default in self._defaults.items()}
+        for index, rules in self.columns.items():
+            if index < len(texts):
+                self._apply(rules, texts[index], values)
+        for text in texts[self.start:]:
+            self._apply(self.rest, text, values)
+        return values
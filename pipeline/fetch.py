@@ -0,0 +1,440 @@
+"""
+Shared HTTP layer for the scrapers.
+
+- keep-alive curl_cffi Sessions pooled per host, with a per-host cap on
+  concurrent requests so one client can be shared by threads
+- a single retry / browser-impersonation policy
+- an on-disk, content-addressed response cache with TTLs and LRU eviction
+- ETag / Last-Modified revalidation, so unchanged pages cost a 304
+- per-host health that survives between runs: the impersonation profile
+  that worked last is tried first, and a host that keeps failing is
+  circuit-broken for a cool-down instead of timing out on every profile
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from curl_cffi import requests
+
+from pipeline import metrics
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Overridable so benchmarks and local experiments don't touch the real caches
+CACHE_ROOT = os.environ.get('PIPELINE_CACHE_ROOT') or os.path.join(ROOT_DIR, '.cache')
+CACHE_DIR = os.path.join(CACHE_ROOT, 'http')
+CACHE_MAX_BYTES = 200 * 1024 * 1024
+HEALTH_PATH = os.path.join(CACHE_DIR, 'hosts.json')
+
+# Default order; HostHealth moves the profile that last worked for a host first
+BROWSER_PROFILES = ("chrome120", "safari15_5", "edge99")
+# Worth another attempt with a different profile
+RETRY_STATUSES = (403, 429, 500, 502, 503, 504)
+# Statuses that mean "slow down" rather than "this page is broken"
+THROTTLE_STATUSES = (403, 429, 503)
+
+DEFAULT_HEADERS = {
+    "Accept": "text/html,application/xhtml+xml,application/json;q=0.9,*/*;q=0.8",
+    "Accept-Language": "tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7",
+}
+
+# Consecutive failed attempts (any profile) that open a host's circuit
+BREAKER_THRESHOLD = 6
+# Cool-down of the first trip; doubles on every trip without a success in between
+BREAKER_COOLDOWN = 10 * 60
+BREAKER_MAX_COOLDOWN = 6 * 60 * 60
+# Per-profile counts are halved beyond this, so recent runs dominate the rate
+PROFILE_HISTORY = 200
+
+# Response headers worth keeping in the cache metadata
+_KEPT_HEADERS = ("content-type", "etag", "last-modified")
+
+
+def backoff_delay(attempt, base=2.0):
+    """Seconds to wait after the given 1-based failed attempt."""
+    return base * attempt
+
+
+class Response:
+    """Minimal requests-like response shared by live and cached results."""
+
+    def __init__(self, url, status_code, content, headers=None, from_cache=False):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = {k.lower(): v for k, v in (headers or {}).items()}
+        self.from_cache = from_cache
+
+    @property
+    def ok(self):
+        return 200 <= self.status_code < 400
+
+    @property
+    def encoding(self):
+        content_type = self.headers.get("content-type", "")
+        if "charset=" in content_type:
+            return content_type.split("charset=")[-1].split(";")[0].strip()
+        return "utf-8"
+
+    @property
+    def text(self):
+        try:
+            return self.content.decode(self.encoding)
+        except (LookupError, UnicodeDecodeError):
+            return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        with metrics.span('parse'):
+            return json.loads(self.content)
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise RuntimeError(f"HTTP {self.status_code} for {self.url}")
+
+    @classmethod
+    def from_curl(cls, url, response):
+        return cls(url, response.status_code, response.content, dict(response.headers))
+
+
+class ResponseCache:
+    """
+    Bodies live under objects/<sha256 of body>, so identical payloads are
+    stored once; per-URL metadata (validators, timestamps) lives under
+    meta/<sha256 of url>.json.
+    """
+
+    def __init__(self, root=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._objects = os.path.join(root, 'objects')
+        self._meta = os.path.join(root, 'meta')
+        os.makedirs(self._objects, exist_ok=True)
+        os.makedirs(self._meta, exist_ok=True)
+
+    def _meta_path(self, url):
+        return os.path.join(self._meta, hashlib.sha256(url.encode('utf-8')).hexdigest() + '.json')
+
+    def lookup(self, url):
+        try:
+            with open(self._meta_path(url), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            if os.path.exists(os.path.join(self._objects, entry['sha'])):
+                return entry
+        except (OSError, ValueError, KeyError):
+            pass
+        return None
+
+    @staticmethod
+    def is_fresh(entry, ttl):
+        return ttl > 0 and time.time() - entry['fetched_at'] < ttl
+
+    @staticmethod
+    def validators(entry):
+        """Conditional request headers for a cached entry."""
+        headers = {}
+        if entry['headers'].get('etag'):
+            headers['If-None-Match'] = entry['headers']['etag']
+        if entry['headers'].get('last-modified'):
+            headers['If-Modified-Since'] = entry['headers']['last-modified']
+        return headers
+
+    def load(self, url, entry, revalidated=False):
+        """The cached response; `revalidated` after a 304 also restarts its TTL (one metadata write)."""
+        with open(os.path.join(self._objects, entry['sha']), 'rb') as f:
+            content = f.read()
+        self.touch(url, entry, revalidated)
+        return Response(url, 200, content, entry['headers'], from_cache=True)
+
+    def touch(self, url, entry, revalidated=True):
+        now = time.time()
+        entry['used_at'] = now
+        if revalidated:
+            entry['fetched_at'] = now
+        self._write_meta(url, entry)
+
+    def store(self, url, response):
+        sha = hashlib.sha256(response.content).hexdigest()
+        path = os.path.join(self._objects, sha)
+        with self._lock:
+            if not os.path.exists(path):
+                tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp, 'wb') as f:
+                    f.write(response.content)
+                os.replace(tmp, path)
+        now = time.time()
+        self._write_meta(url, {
+            'url': url,
+            'sha': sha,
+            'size': len(response.content),
+            'headers': {k: v for k, v in response.headers.items() if k in _KEPT_HEADERS},
+            'fetched_at': now,
+            'used_at': now,
+        })
+
+    def _write_meta(self, url, entry):
+        path = self._meta_path(url)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+
+    def evict(self):
+        """Drops least recently used entries until the bodies fit in max_bytes."""
+        with self._lock:
+            entries = []
+            for name in os.listdir(self._meta):
+                if not name.endswith('.json'):
+                    continue
+                try:
+                    with open(os.path.join(self._meta, name), 'r', encoding='utf-8') as f:
+                        entries.append((name, json.load(f)))
+                except (OSError, ValueError):
+                    os.remove(os.path.join(self._meta, name))
+
+            sizes = {}
+            for name in os.listdir(self._objects):
+                if not name.endswith('.tmp'):
+                    sizes[name] = os.path.getsize(os.path.join(self._objects, name))
+
+            entries.sort(key=lambda item: item[1].get('used_at', 0))
+            refs = Counter(entry.get('sha') for _, entry in entries)
+            total = sum(size for sha, size in sizes.items() if refs[sha])
+            for name, entry in entries:
+                if total <= self.max_bytes:
+                    break
+                os.remove(os.path.join(self._meta, name))
+                refs[entry.get('sha')] -= 1
+                if not refs[entry.get('sha')]:
+                    total -= sizes.get(entry.get('sha'), 0)
+
+            for sha in sizes:
+                if not refs[sha]:
+                    os.remove(os.path.join(self._objects, sha))
+
+
+class HostHealth:
+    """
+    Per-host impersonation-profile success counts and circuit-breaker
+    state, persisted as JSON (in the HTTP cache directory, so CI restores
+    it together with the cache):
+
+        {"halkarz.com": {"profiles": {"chrome120": {"ok": 41, "fail": 2, "last_ok": 1760000000.0}},
+                         "failures": 0, "trips": 0, "open_until": 0}}
+    """
+
+    def __init__(self, path=HEALTH_PATH, threshold=BREAKER_THRESHOLD,
+                 cooldown=BREAKER_COOLDOWN, max_cooldown=BREAKER_MAX_COOLDOWN):
+        self.path = path
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._lock = threading.Lock()
+        self.hosts = {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.hosts = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    def _host(self, url):
+        host = urlsplit(url).hostname
+        return self.hosts.setdefault(host, {"profiles": {}, "failures": 0, "trips": 0, "open_until": 0})
+
+    def order(self, url, browsers):
+        """
+        `browsers` reordered for the host: the most recently successful
+        profile first, the rest by success rate (untried ones count as 50%).
+        """
+        with self._lock:
+            profiles = {name: dict(p) for name, p in self._host(url)["profiles"].items()}
+
+        def rate(browser):
+            p = profiles.get(browser, {})
+            return (p.get("ok", 0) + 1) / (p.get("ok", 0) + p.get("fail", 0) + 2)
+
+        ranked = sorted(browsers, key=rate, reverse=True)  # stable: ties keep the default order
+        recent = max(browsers, key=lambda b: profiles.get(b, {}).get("last_ok", 0))
+        if profiles.get(recent, {}).get("last_ok"):
+            ranked.remove(recent)
+            ranked.insert(0, recent)
+        return ranked
+
+    def is_open(self, url):
+        """True while the host is in its cool-down; requests should not be sent."""
+        with self._lock:
+            return self._host(url)["open_until"] > time.time()
+
+    def record(self, url, browser, status):
+        """
+        Counts one attempt (`status` None when it raised); returns True when
+        this failure opened the circuit. 429 is rate limiting rather than a
+        blocked profile and is not counted.
+        """
+        if status == 429:
+            return False
+        ok = status is not None and status not in RETRY_STATUSES
+        now = time.time()
+        with self._lock:
+            host = self._host(url)
+            profile = host["profiles"].setdefault(browser, {"ok": 0, "fail": 0})
+            profile["ok" if ok else "fail"] += 1
+            if profile["ok"] + profile["fail"] > PROFILE_HISTORY:
+                profile["ok"] //= 2
+                profile["fail"] //= 2
+            if ok:
+                profile["last_ok"] = now
+                host.update(failures=0, trips=0, open_until=0)
+                return False
+            host["failures"] += 1
+            if host["failures"] < self.threshold:
+                return False
+            # Half-open after the cool-down: one more failure trips it again, for longer
+            host["trips"] += 1
+            host["failures"] = self.threshold - 1
+            host["open_until"] = now + min(self.cooldown * 2 ** (host["trips"] - 1), self.max_cooldown)
+            return True
+
+    def save(self):
+        with self._lock:
+            text = json.dumps(self.hosts, indent=1, sort_keys=True)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp, self.path)
+
+
+class HttpClient:
+    """
+    Synchronous client used by the scrapers.
+
+    Usage:
+        with HttpClient() as client:
+            response = client.get(url, headers={...}, ttl=3600)
+
+    `ttl` is how long (seconds) a cached body is served without asking the
+    server at all; after that the request is revalidated with the stored
+    ETag / Last-Modified. Returns the last response seen (possibly non-200),
+    or None when every attempt raised.
+
+    The client is thread-safe: at most `per_host` requests per host are in
+    flight at once, each on its own pooled Session.
+
+    Profiles are tried in the order HostHealth suggests for the host. While
+    a host's circuit is open no request is sent: the cached body is served
+    if there is one, None otherwise.
+    """
+
+    def __init__(self, cache=None, browsers=BROWSER_PROFILES, timeout=30, backoff=2.0, per_host=2, health=None):
+        self.cache = cache if cache is not None else ResponseCache()
+        self.health = health if health is not None else HostHealth()
+        self.browsers = browsers
+        self.timeout = timeout
+        self.backoff = backoff
+        self.per_host = per_host
+        self.stats = {"requests": 0, "cache_hits": 0, "not_modified": 0, "failed": 0, "short_circuited": 0}
+        self._pools = {}    # host -> (slots semaphore, idle sessions)
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    @contextmanager
+    def session_for(self, url):
+        """Checks out a keep-alive Session for the host, waiting for a free slot."""
+        host = urlsplit(url).hostname
+        with self._lock:
+            if host not in self._pools:
+                self._pools[host] = (threading.BoundedSemaphore(self.per_host), [])
+            slots, idle = self._pools[host]
+        with slots:
+            with self._lock:
+                session = idle.pop() if idle else requests.Session()
+            try:
+                yield session
+            finally:
+                with self._lock:
+                    idle.append(session)
+
+    def get(self, url, headers=None, ttl=0, use_cache=True, browsers=None):
+        with metrics.span('fetch'):
+            entry = self.cache.lookup(url) if use_cache else None
+            if entry and self.cache.is_fresh(entry, ttl):
+                self._count("cache_hits")
+                metrics.record_cache_hit()
+                return self.cache.load(url, entry)
+
+            if self.health.is_open(url):
+                self._count("short_circuited")
+                metrics.count('circuit', 'short_circuited')
+                return self.cache.load(url, entry) if entry else None
+
+            request_headers = {**DEFAULT_HEADERS, **(headers or {})}
+            if entry:
+                request_headers.update(self.cache.validators(entry))
+
+            browsers = self.health.order(url, browsers or self.browsers)
+            with self.session_for(url) as session:
+                return self._get(session, url, request_headers, entry, use_cache, browsers)
+
+    def _get(self, session, url, request_headers, entry, use_cache, browsers):
+        response = None
+        for attempt, browser in enumerate(browsers, 1):
+            status = None
+            try:
+                self._count("requests")
+                raw = session.get(url, headers=request_headers, impersonate=browser, timeout=self.timeout)
+                status = raw.status_code
+                metrics.record_request(status, len(raw.content), browser, attempt,
+                                       ok=status not in RETRY_STATUSES)
+                if raw.status_code == 304 and entry:
+                    self._count("not_modified")
+                    return self.cache.load(url, entry, revalidated=True)
+
+                response = Response.from_curl(url, raw)
+                if response.status_code not in RETRY_STATUSES:
+                    if response.status_code == 200 and use_cache:
+                        self.cache.store(url, response)
+                    return response
+                print(f"  {browser}: HTTP {response.status_code} for {url}")
+            except Exception as e:
+                if status is None:
+                    metrics.record_request(None, 0, browser, attempt)
+                print(f"  {browser} failed for {url}: {e}")
+            finally:
+                opened = self.health.record(url, browser, status)
+
+            if opened:
+                metrics.count('circuit', 'opened')
+            if self.health.is_open(url):
+                print(f"  {urlsplit(url).hostname} keeps failing, circuit open; skipping the remaining profiles")
+                break
+            if attempt < len(browsers):
+                time.sleep(backoff_delay(attempt, self.backoff))
+
+        self._count("failed")
+        return response
+
+    def close(self):
+        with self._lock:
+            for _, idle in self._pools.values():
+                for session in idle:
+                    session.close()
+            self._pools.clear()
+        try:
+            self.health.save()
+            self.cache.evict()
+        except OSError as e:
+            print(f"Cache maintenance failed: {e}")
@@ -0,0 +1,94 @@
+"""
+Content-hashed copies of the datasets plus data-manifest.json.
+
+    python -m pipeline.fingerprint dist
+
+For each dataset in DATASETS, <root>/halkarz_ipos.json is copied to
+<root>/halkarz_ipos.<hash>.json (first HASH_LENGTH hex digits of its
+sha256), and <root>/data-manifest.json maps the logical names to those
+files. A dataset in a subdirectory is hashed next to its original
+(bist_columns/columns.<hash>.bin). The hashed files never change, so they are served with a one-year
+immutable Cache-Control; only the small manifest is revalidated on every
+load (public/.htaccess). The pages resolve names through utils/dataUrl.ts,
+so a dataset is downloaded again only when its content changed.
+
+The unhashed files stay in place for the sitemap generator and external
+readers. Run it on the build output before pipeline.compress, so the
+hashed files get their .br/.gz siblings too.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+
+# Logical dataset names under the web root
+DATASETS = (
+    "bist_quotes.json",
+    "bist_live_data.json",
+    "bist_columns.json",
+    "halkarz_ipos.json",
+    "halkarz_target_prices.json",
+    "sermaye_artirimi.json",
+    "temettu.json",
+    "emtia.json",
+    "brokers_tefas.json",
+    "piapiri_ipos.json",
+    # Binary column snapshot (fetch_yfinance.py --binary-columns), when present
+    "bist_columns/manifest.json",
+    "bist_columns/columns.bin",
+)
+HASH_LENGTH = 12
+MANIFEST_NAME = 'data-manifest.json'
+
+
+def hashed_name(name, content):
+    stem, extension = os.path.splitext(name)
+    return f"{stem}.{hashlib.sha256(content).hexdigest()[:HASH_LENGTH]}{extension}"
+
+
+def _stale_pattern(name):
+    stem, extension = os.path.splitext(name)
+    return re.compile(rf"^{re.escape(stem)}\.[0-9a-f]{{{HASH_LENGTH}}}{re.escape(extension)}(\.br|\.gz)?$")
+
+
+def fingerprint(root, datasets=DATASETS):
+    """Writes the hashed copies and the manifest; returns {logical name: hashed name}."""
+    files = {}
+    for name in datasets:
+        path = os.path.join(root, name)
+        if not os.path.exists(path):
+            continue
+        directory, filename = os.path.split(name)
+        with open(path, 'rb') as f:
+            target = hashed_name(filename, f.read())
+        # Older hashes of the same dataset (e.g. from a previous local run)
+        stale = _stale_pattern(filename)
+        for other in os.listdir(os.path.join(root, directory)):
+            if stale.match(other) and not other.startswith(target):
+                os.remove(os.path.join(root, directory, other))
+        if not os.path.exists(os.path.join(root, directory, target)):
+            shutil.copyfile(path, os.path.join(root, directory, target))
+        files[name] = '/'.join(filter(None, (directory, target)))
+
+    manifest_path = os.path.join(root, MANIFEST_NAME)
+    with open(f"{manifest_path}.tmp", 'w', encoding='utf-8') as f:
+        json.dump({"files": files}, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(f"{manifest_path}.tmp", manifest_path)
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Publish content-hashed dataset copies and data-manifest.json")
+    parser.add_argument('root', nargs='?', default='dist', help="Web root to process (default: dist)")
+    args = parser.parse_args()
+    files = fingerprint(args.root)
+    for name, target in files.items():
+        print(f"{name} -> {target}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
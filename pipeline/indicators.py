@@ -0,0 +1,89 @@
+"""
+Technical indicators computed once at ingest time for the whole market.
+
+Every series is a (dates x symbols) matrix, so each indicator is a single
+vectorized pass over all symbols instead of a per-symbol loop. Suspended
+sessions are forward-filled; symbols with too little history get None.
+"""
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+
+
+def _wide(prices, column):
+    """(Symbol, Date)-indexed long frame -> dates x symbols matrix."""
+    return prices[column].unstack(level='Symbol').sort_index()
+
+
+def _wilder(frame, period):
+    return frame.ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+
+
+def compute_indicators(prices):
+    """
+    Returns {symbol: {indicator: value}} using the last session of each
+    symbol. `prices` is the (Symbol, Date)-indexed OHLCV frame used for quotes.
+    """
+    close = _wide(prices, 'Close').ffill()
+    high = _wide(prices, 'High').reindex_like(close).fillna(close)
+    low = _wide(prices, 'Low').reindex_like(close).fillna(close)
+    volume = _wide(prices, 'Volume').reindex_like(close).fillna(0)
+
+    last = {}
+
+    # Moving averages
+    for n in (20, 50, 200):
+        last[f"sma{n}"] = close.rolling(n).mean().iloc[-1]
+    ema12 = close.ewm(span=12, adjust=False, min_periods=12).mean()
+    ema26 = close.ewm(span=26, adjust=False, min_periods=26).mean()
+    last["ema12"] = ema12.iloc[-1]
+    last["ema26"] = ema26.iloc[-1]
+
+    # MACD (12, 26, 9)
+    macd = ema12 - ema26
+    signal = macd.ewm(span=9, adjust=False, min_periods=9).mean()
+    last["macd"] = macd.iloc[-1]
+    last["macdSignal"] = signal.iloc[-1]
+    last["macdHistogram"] = (macd - signal).iloc[-1]
+
+    # RSI (14, Wilder smoothing)
+    delta = close.diff()
+    gain = _wilder(delta.clip(lower=0), 14)
+    loss = _wilder(-delta.clip(upper=0), 14)
+    rs = gain / loss.replace(0, np.nan)
+    rsi = (100 - 100 / (1 + rs)).where(loss != 0, 100.0).where(gain.notna())
+    last["rsi14"] = rsi.iloc[-1]
+
+    # Bollinger bands (20, 2σ)
+    mid = close.rolling(20).mean()
+    std = close.rolling(20).std(ddof=0)
+    upper = mid + 2 * std
+    lower = mid - 2 * std
+    last["bollingerUpper"] = upper.iloc[-1]
+    last["bollingerLower"] = lower.iloc[-1]
+    last["bollingerPercentB"] = ((close - lower) / (upper - lower).replace(0, np.nan)).iloc[-1]
+
+    # ATR (14, Wilder smoothing)
+    prev_close = close.shift(1)
+    true_range = np.maximum(high - low, np.maximum((high - prev_close).abs(), (low - prev_close).abs()))
+    last["atr14"] = _wilder(true_range, 14).iloc[-1]
+
+    # Annualized 20-day volatility of log returns (%)
+    returns = np.log(close / prev_close)
+    last["volatility20"] = (returns.rolling(20).std() * np.sqrt(TRADING_DAYS) * 100).iloc[-1]
+
+    # Distance from the 52-week high / low (%)
+    high_52w = high.rolling(TRADING_DAYS, min_periods=1).max().iloc[-1]
+    low_52w = low.rolling(TRADING_DAYS, min_periods=1).min().iloc[-1]
+    last["fromHigh52wPct"] = (close.iloc[-1] / high_52w - 1) * 100
+    last["fromLow52wPct"] = (close.iloc[-1] / low_52w - 1) * 100
+
+    # Volume z-score against the previous 20 sessions
+    vol_mean = volume.shift(1).rolling(20).mean()
+    vol_std = volume.shift(1).rolling(20).std()
+    last["volumeZScore20"] = ((volume - vol_mean) / vol_std.replace(0, np.nan)).iloc[-1]
+
+    table = pd.DataFrame(last).round(4)
+    table = table.astype(object).where(table.notna(), None)
+    return table.to_dict('index')
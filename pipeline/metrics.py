@@ -0,0 +1,286 @@
+"""
+Run metrics for the scrapers: timed spans per stage (fetch, parse,
+transform, write) carrying request counts, bytes, retries, a status-code
+histogram, per-browser-profile success and peak memory.
+
+    with metrics.run('capital'):            # entry point; writes the files on exit
+        with metrics.span('transform'):
+            ...
+        metrics.count('status', 'Tamamlandı')
+
+The shared layers record themselves: HttpClient / AsyncCrawler requests are
+'fetch' spans, make_soup is 'parse' and write_json is 'write', so scrapers
+only add spans for their own work. Requests are attributed to the innermost
+open span of the current thread / asyncio task, and spans to the current job
+(`metrics.job(name)`, e.g. per job of scripts/run_scrapers.py).
+
+Each run writes <PIPELINE_METRICS_DIR or metrics/>/<run>.json and, when
+PIPELINE_PROMETHEUS_DIR is set, <that dir>/<run>.prom for node_exporter's
+textfile collector. Span seconds are summed, so concurrent spans (e.g.
+parallel requests) add up to more than the wall time.
+"""
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+METRICS_DIR = os.environ.get('PIPELINE_METRICS_DIR') or os.path.join(ROOT_DIR, 'metrics')
+PROMETHEUS_DIR = os.environ.get('PIPELINE_PROMETHEUS_DIR')
+
+DEFAULT_JOB = "main"
+
+_job = contextvars.ContextVar('metrics_job', default=DEFAULT_JOB)
+_stage = contextvars.ContextVar('metrics_stage', default=None)
+
+
+def peak_rss_mb():
+    """Peak resident memory of the process so far, or None where unknown."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+class SpanStats:
+    """Aggregate of every span of one stage within one job."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.requests = 0
+        self.bytes = 0
+        self.retries = 0
+        self.cache_hits = 0
+        self.statuses = Counter()
+        self.browsers = {}  # profile -> [attempts, successes]
+        self.peak_rss_mb = None
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "seconds": round(self.seconds, 3),
+            "requests": self.requests,
+            "bytes": self.bytes,
+            "retries": self.retries,
+            "cache_hits": self.cache_hits,
+            "statuses": dict(sorted(self.statuses.items())),
+            "browsers": {
+                name: {"attempts": attempts, "successes": ok,
+                       "success_rate": round(ok / attempts, 3) if attempts else None}
+                for name, (attempts, ok) in sorted(self.browsers.items())
+            },
+            "peak_rss_mb": self.peak_rss_mb,
+        }
+
+
+class Recorder:
+    """Process-wide, thread-safe store behind the module-level functions."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.spans = {}      # (job, stage) -> SpanStats
+            self.counters = {}   # job -> {name: Counter}
+
+    def _stats(self, stage):
+        key = (_job.get(), stage or "other")
+        stats = self.spans.get(key)
+        if stats is None:
+            stats = self.spans[key] = SpanStats()
+        return stats
+
+    @contextmanager
+    def span(self, stage):
+        token = _stage.set(stage)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            _stage.reset(token)
+            with self._lock:
+                stats = self._stats(stage)
+                stats.count += 1
+                stats.seconds += elapsed
+                stats.peak_rss_mb = peak_rss_mb()
+
+    def request(self, status, nbytes=0, browser=None, attempt=1, ok=None):
+        """
+        One HTTP attempt: `status` is the code, or None when it raised.
+        `ok` defaults to a 2xx/3xx status.
+        """
+        if ok is None:
+            ok = status is not None and 200 <= status < 400
+        with self._lock:
+            stats = self._stats(_stage.get())
+            stats.requests += 1
+            stats.bytes += nbytes
+            stats.retries += attempt > 1
+            stats.statuses[str(status) if status is not None else "error"] += 1
+            if browser:
+                counts = stats.browsers.setdefault(browser, [0, 0])
+                counts[0] += 1
+                counts[1] += bool(ok)
+
+    def cache_hit(self):
+        with self._lock:
+            self._stats(_stage.get()).cache_hits += 1
+
+    def count(self, name, label, n=1):
+        with self._lock:
+            self.counters.setdefault(_job.get(), {}).setdefault(name, Counter())[str(label)] += n
+
+    def snapshot(self):
+        with self._lock:
+            jobs = {}
+            for (job, stage), stats in sorted(self.spans.items()):
+                jobs.setdefault(job, {"stages": {}, "counters": {}})["stages"][stage] = stats.as_dict()
+            for job, counters in sorted(self.counters.items()):
+                jobs.setdefault(job, {"stages": {}, "counters": {}})["counters"] = {
+                    name: dict(sorted(counter.items())) for name, counter in sorted(counters.items())
+                }
+            return jobs
+
+
+RECORDER = Recorder()
+span = RECORDER.span
+record_request = RECORDER.request
+record_cache_hit = RECORDER.cache_hit
+count = RECORDER.count
+snapshot = RECORDER.snapshot
+
+
+@contextmanager
+def job(name):
+    """Attributes spans opened inside the block (and its threads' copies) to `name`."""
+    token = _job.set(name)
+    try:
+        yield
+    finally:
+        _job.reset(token)
+
+
+def _write_text(path, text):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels):
+    return ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+
+
+def prometheus_text(report):
+    """The run report in the Prometheus text exposition format."""
+    metrics = {
+        "scraper_run_seconds": ("Wall time of the last run", []),
+        "scraper_run_success": ("1 when the last run finished without an exception", []),
+        "scraper_run_timestamp_seconds": ("Unix time the last run finished", []),
+        "scraper_peak_rss_megabytes": ("Peak resident memory of the last run", []),
+        "scraper_span_seconds": ("Seconds spent in the stage (summed over spans)", []),
+        "scraper_span_count": ("Spans of the stage", []),
+        "scraper_requests": ("HTTP attempts", []),
+        "scraper_response_bytes": ("Response body bytes received", []),
+        "scraper_retries": ("HTTP attempts after the first one", []),
+        "scraper_cache_hits": ("Responses served from the cache without a request", []),
+        "scraper_responses": ("HTTP attempts by status code", []),
+        "scraper_browser_attempts": ("HTTP attempts by impersonated browser profile", []),
+        "scraper_browser_successes": ("Successful HTTP attempts by browser profile", []),
+        "scraper_events": ("Counted events by name and label", []),
+    }
+    run = report["run"]
+
+    def add(metric, value, **labels):
+        if value is not None:
+            metrics[metric][1].append((_labels(run=run, **labels), value))
+
+    add("scraper_run_seconds", report["seconds"])
+    add("scraper_run_success", int(report["ok"]))
+    add("scraper_run_timestamp_seconds", report["finished_at"])
+    add("scraper_peak_rss_megabytes", report["peak_rss_mb"])
+    for job_name, data in report["jobs"].items():
+        for stage, s in data["stages"].items():
+            labels = {"job": job_name, "stage": stage}
+            add("scraper_span_seconds", s["seconds"], **labels)
+            add("scraper_span_count", s["count"], **labels)
+            add("scraper_requests", s["requests"], **labels)
+            add("scraper_response_bytes", s["bytes"], **labels)
+            add("scraper_retries", s["retries"], **labels)
+            add("scraper_cache_hits", s["cache_hits"], **labels)
+            for status, n in s["statuses"].items():
+                add("scraper_responses", n, status=status, **labels)
+            for browser, b in s["browsers"].items():
+                add("scraper_browser_attempts", b["attempts"], browser=browser, **labels)
+                add("scraper_browser_successes", b["successes"], browser=browser, **labels)
+        for name, counter in data["counters"].items():
+            for label, n in counter.items():
+                add("scraper_events", n, job=job_name, event=name, label=label)
+
+    lines = []
+    for name, (help_text, samples) in metrics.items():
+        if samples:
+            # Values describe one run, so they are gauges rather than counters
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+            lines += [f"{name}{{{labels}}} {value}" for labels, value in samples]
+    return "\n".join(lines) + "\n"
+
+
+def write_report(report, directory=None, prometheus_dir=None):
+    """Writes <directory>/<run>.json and, with a Prometheus directory, <run>.prom."""
+    directory = directory or METRICS_DIR
+    prometheus_dir = prometheus_dir or PROMETHEUS_DIR
+    _write_text(os.path.join(directory, f"{report['run']}.json"),
+                json.dumps(report, ensure_ascii=False, indent=1))
+    if prometheus_dir:
+        _write_text(os.path.join(prometheus_dir, f"{report['run']}.prom"), prometheus_text(report))
+
+
+@contextmanager
+def run(name, directory=None, prometheus_dir=None):
+    """
+    Records everything in the block as run `name` (also the default job) and
+    writes the report on exit, including when the block raised.
+    """
+    RECORDER.reset()
+    started_at = datetime.now().isoformat(timespec='seconds')
+    started = time.perf_counter()
+    ok = False
+    try:
+        with job(name):
+            yield
+        ok = True
+    finally:
+        report = {
+            "run": name,
+            "started_at": started_at,
+            "finished_at": round(time.time(), 3),
+            "seconds": round(time.perf_counter() - started, 3),
+            "ok": ok,
+            "peak_rss_mb": peak_rss_mb(),
+            "jobs": snapshot(),
+        }
+        try:
+            write_report(report, directory, prometheus_dir)
+        except OSError as e:
+            print(f"Could not write run metrics: {e}")
@@ -0,0 +1,147 @@
+"""
+Append-only daily OHLCV store, one binary file per symbol and year:
+
+    .cache/ohlcv/<SYMBOL>/<YEAR>.bin
+
+Each file is a packed array of BAR_DTYPE records (32 bytes per bar) sorted
+by timestamp, so reads are a plain np.memmap and appends never rewrite
+earlier bars. Only completed sessions are stored; the live (today's) bar is
+always taken from the fresh download.
+
+Yahoo re-scales past prices after a split or bonus issue, so stored bars of
+such a symbol no longer match a fresh download. The caller detects that
+and drops the symbol (drop) to download its history again.
+"""
+import os
+import shutil
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from pipeline.fetch import CACHE_ROOT
+
+STORE_DIR = os.path.join(CACHE_ROOT, 'ohlcv')
+
+BAR_DTYPE = np.dtype([
+    ('ts', '<i8'),       # session date, seconds since epoch (UTC midnight)
+    ('open', '<f4'),
+    ('high', '<f4'),
+    ('low', '<f4'),
+    ('close', '<f4'),
+    ('volume', '<i8'),
+])
+
+FRAME_COLUMNS = {'open': 'Open', 'high': 'High', 'low': 'Low', 'close': 'Close', 'volume': 'Volume'}
+
+_EPOCH = pd.Timestamp('1970-01-01')
+
+
+def to_timestamps(index):
+    """DatetimeIndex -> int64 epoch seconds of each session date."""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return ((index.normalize() - _EPOCH) // pd.Timedelta(seconds=1)).to_numpy(dtype='<i8')
+
+
+class OhlcvStore:
+    def __init__(self, root=STORE_DIR):
+        self.root = root
+
+    def _dir(self, symbol):
+        return os.path.join(self.root, symbol)
+
+    def _path(self, symbol, year):
+        return os.path.join(self._dir(symbol), f"{year}.bin")
+
+    def years(self, symbol):
+        try:
+            names = os.listdir(self._dir(symbol))
+        except FileNotFoundError:
+            return []
+        return sorted(int(name[:-4]) for name in names if name.endswith('.bin'))
+
+    def _open(self, symbol, year):
+        path = self._path(symbol, year)
+        count = os.path.getsize(path) // BAR_DTYPE.itemsize
+        if count == 0:
+            return np.empty(0, dtype=BAR_DTYPE)
+        return np.memmap(path, dtype=BAR_DTYPE, mode='r', shape=(count,))
+
+    def last_timestamp(self, symbol):
+        for year in reversed(self.years(symbol)):
+            bars = self._open(symbol, year)
+            if len(bars):
+                return int(bars[-1]['ts'])
+        return None
+
+    def read(self, symbol, since=None):
+        """All stored bars with ts >= since (epoch seconds), oldest first."""
+        first_year = datetime.fromtimestamp(since, timezone.utc).year if since else None
+        parts = []
+        for year in self.years(symbol):
+            if first_year and year < first_year:
+                continue
+            bars = self._open(symbol, year)
+            if since:
+                bars = bars[bars['ts'] >= since]
+            parts.append(np.asarray(bars))
+        return np.concatenate(parts) if parts else np.empty(0, dtype=BAR_DTYPE)
+
+    def drop(self, symbol):
+        """Deletes every stored bar of the symbol."""
+        shutil.rmtree(self._dir(symbol), ignore_errors=True)
+
+    def append(self, symbol, bars):
+        """
+        Appends bars newer than the last stored one; returns how many were
+        written. A torn trailing record from an interrupted write is dropped.
+        """
+        last = self.last_timestamp(symbol)
+        if last is not None:
+            bars = bars[bars['ts'] > last]
+        if not len(bars):
+            return 0
+
+        os.makedirs(self._dir(symbol), exist_ok=True)
+        years = (bars['ts'] // 86400).astype('datetime64[D]').astype('datetime64[Y]').astype(int) + 1970
+        for year in np.unique(years):
+            path = self._path(symbol, int(year))
+            with open(path, 'ab') as f:
+                size = f.tell()
+                if size % BAR_DTYPE.itemsize:
+                    f.truncate(size - size % BAR_DTYPE.itemsize)
+                f.write(bars[years == year].tobytes())
+        return len(bars)
+
+    def append_frame(self, prices):
+        """
+        Stores a (Symbol, Date)-indexed OHLCV frame; returns the symbols that
+        received new bars.
+        """
+        updated = []
+        for symbol, frame in prices.groupby(level='Symbol'):
+            frame = frame.droplevel('Symbol')
+            bars = np.empty(len(frame), dtype=BAR_DTYPE)
+            bars['ts'] = to_timestamps(frame.index)
+            for field, column in FRAME_COLUMNS.items():
+                values = frame[column].fillna(0).to_numpy()
+                bars[field] = values.astype(BAR_DTYPE[field])
+            if self.append(symbol, bars):
+                updated.append(symbol)
+        return updated
+
+    def read_frame(self, symbols, since=None):
+        """Stored bars of many symbols as a (Symbol, Date)-indexed OHLCV frame."""
+        frames = {}
+        for symbol in symbols:
+            bars = self.read(symbol, since)
+            if len(bars):
+                frame = pd.DataFrame({column: bars[field] for field, column in FRAME_COLUMNS.items()})
+                frame.index = pd.to_datetime(bars['ts'], unit='s')
+                frame.index.name = 'Date'
+                frames[symbol] = frame.astype({'Open': float, 'High': float, 'Low': float, 'Close': float})
+        if not frames:
+            return pd.DataFrame(columns=list(FRAME_COLUMNS.values()))
+        return pd.concat(frames, names=['Symbol', 'Date'])
@@ -0,0 +1,178 @@
+"""
+Change-aware writer for the public/*.json outputs.
+
+    write_json('public/temettu.json', data, key=('t_bistkod', 't_tarih'))
+
+- the payload is compared with what is already on disk after dropping
+  volatile metadata (timestamps such as last_update / fetched_at), so a run
+  that only refreshed timestamps leaves the file - and git - untouched
+- writes go through a temp file in the same directory plus os.replace(), so
+  readers (and a crashed run) never see a half-written file
+- each real change appends one line to data/changelog/<name>.jsonl listing
+  the added / removed / changed record ids per collection (one log per output,
+  so workflows committing different outputs never conflict on it)
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+from pipeline import metrics
+
+# Keys that change on every run without the data changing
+VOLATILE_KEYS = frozenset({"last_update", "fetched_at", "generated_at", "updated_at"})
+
+CHANGELOG_DIR = os.path.join('data', 'changelog')
+# Oldest lines are dropped beyond this many entries
+CHANGELOG_LIMIT = 2000
+
+_changelog_lock = threading.Lock()
+
+
+def strip_volatile(data, volatile=VOLATILE_KEYS):
+    """Copy of `data` without the volatile keys, at any depth."""
+    if isinstance(data, dict):
+        return {k: strip_volatile(v, volatile) for k, v in data.items() if k not in volatile}
+    if isinstance(data, list):
+        return [strip_volatile(v, volatile) for v in data]
+    return data
+
+
+def _canonical(data):
+    return json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+
+
+def payload_hash(data, volatile=VOLATILE_KEYS):
+    """sha256 of the semantic payload: volatile keys dropped, key order ignored."""
+    return hashlib.sha256(_canonical(strip_volatile(data, volatile)).encode('utf-8')).hexdigest()
+
+
+def _record_id(record, key, index):
+    if isinstance(record, dict) and key:
+        fields = (key,) if isinstance(key, str) else key
+        values = [record.get(field) for field in fields]
+        if all(value is not None for value in values):
+            return '|'.join(str(value) for value in values)
+    return f"#{index}"
+
+
+def _collections(data):
+    """name -> list of records: the top-level list, or every list-valued top-level key."""
+    if isinstance(data, list):
+        return {"": data}
+    if isinstance(data, dict):
+        return {name: value for name, value in data.items() if isinstance(value, list)}
+    return {}
+
+
+def diff_records(old, new, key=None, volatile=VOLATILE_KEYS):
+    """
+    {collection: {"added": [...], "removed": [...], "changed": [...]}} of
+    record ids, for the collections that differ. Records are matched by
+    `key` (a field name or a tuple of them), by position otherwise.
+    """
+    old_collections = _collections(old)
+    changes = {}
+    for name, records in _collections(new).items():
+        before = {
+            _record_id(r, key, i): _canonical(strip_volatile(r, volatile))
+            for i, r in enumerate(old_collections.pop(name, []))
+        }
+        after = {
+            _record_id(r, key, i): _canonical(strip_volatile(r, volatile))
+            for i, r in enumerate(records)
+        }
+        entry = {
+            "added": [rid for rid in after if rid not in before],
+            "removed": [rid for rid in before if rid not in after],
+            "changed": [rid for rid, body in after.items() if rid in before and before[rid] != body],
+        }
+        if any(entry.values()):
+            changes[name] = entry
+    for name, records in old_collections.items():
+        changes[name] = {"added": [], "removed": [_record_id(r, key, i) for i, r in enumerate(records)],
+                         "changed": []}
+    if isinstance(old, dict) and isinstance(new, dict):
+        # Top-level scalars such as counters
+        fields = [
+            name for name in new.keys() | old.keys()
+            if name not in volatile and not isinstance(new.get(name, old.get(name)), list)
+            and _canonical(old.get(name)) != _canonical(new.get(name))
+        ]
+        if fields:
+            changes["fields"] = sorted(fields)
+    return changes
+
+
+def read_json(path, default=None):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def atomic_write(path, text):
+    """Writes `text` (str or bytes) to a temp file next to `path` and renames it over `path`."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        if isinstance(text, bytes):
+            with open(tmp, 'wb') as f:
+                f.write(text)
+        else:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                f.write(text)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def changelog_path(path):
+    """data/changelog/<output file name without .json>.jsonl"""
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(CHANGELOG_DIR, f"{name}.jsonl")
+
+
+def log_change(path, changes, changelog=None, limit=CHANGELOG_LIMIT):
+    changelog = changelog or changelog_path(path)
+    line = json.dumps({"time": time.strftime('%Y-%m-%dT%H:%M:%S'), "file": path, "changes": changes},
+                      ensure_ascii=False, separators=(',', ':'))
+    with _changelog_lock:
+        try:
+            with open(changelog, 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+        except OSError:
+            lines = []
+        lines = (lines + [line])[-limit:]
+        atomic_write(changelog, '\n'.join(lines) + '\n')
+
+
+def write_json(path, data, key=None, volatile=VOLATILE_KEYS, changelog=True, **dump_kwargs):
+    """
+    Writes `data` as JSON (json.dump keyword arguments apply, ensure_ascii
+    defaults to False) unless the file already holds the same payload.
+    Returns True when the file was written. `changelog` is True for the
+    default log, a path, or False, e.g. for per-symbol shards already
+    covered by their parent file.
+    """
+    with metrics.span('write'):
+        return _write_json(path, data, key, volatile, changelog, dump_kwargs)
+
+
+def _write_json(path, data, key, volatile, changelog, dump_kwargs):
+    old = read_json(path) if os.path.exists(path) else None
+    if old is not None and payload_hash(old, volatile) == payload_hash(data, volatile):
+        return False
+
+    dump_kwargs.setdefault('ensure_ascii', False)
+    text = json.dumps(data, **dump_kwargs)
+    atomic_write(path, text)
+    if changelog:
+        changes = diff_records(old, data, key, volatile) if old is not None else {"created": True}
+        log_change(path, changes, None if changelog is True else changelog)
+    return True
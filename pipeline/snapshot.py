@@ -0,0 +1,157 @@
+"""
+Last-known-good store for the public datasets, so a failed or partial
+scrape degrades to slightly stale data instead of an empty page.
+
+    good = LastKnownGood('public/temettu.json', key=('t_bistkod', 't_tarih'), indent=2)
+    good.publish(data)      # after a successful fetch
+    good.fallback()         # after a failed one, instead of writing []
+
+<CACHE_ROOT>/snapshots/<name>.json keeps the last good payload, when it was
+saved and when each record was last fetched. publish() merges per record:
+when a collection comes back with less than PARTIAL_RATIO of the records
+it had (a partial fetch), the missing ones are kept from the snapshot,
+marked "stale": true with their "lastSeen" time, until they are older than
+MAX_RECORD_AGE. fallback() leaves a published file that still has records
+alone and otherwise restores the snapshot, every record marked stale.
+"""
+import json
+import os
+from datetime import datetime, timedelta
+
+from pipeline import metrics
+from pipeline.fetch import CACHE_ROOT
+from pipeline.publish import _collections, _record_id, atomic_write, read_json, write_json
+
+SNAPSHOT_DIR = os.path.join(CACHE_ROOT, 'snapshots')
+# A collection shrinking below this share of its last good size is treated as partial
+PARTIAL_RATIO = 0.5
+# Stale records are dropped once they have not been fetched for this long
+MAX_RECORD_AGE = timedelta(days=7)
+STALE_KEYS = ("stale", "lastSeen")
+
+
+def _has_records(data):
+    return any(_collections(data).values())
+
+
+def without_staleness(record):
+    """`record` without the "stale" / "lastSeen" markers."""
+    if isinstance(record, dict) and "stale" in record:
+        return {k: v for k, v in record.items() if k not in STALE_KEYS}
+    return record
+
+
+def _with_collections(data, collections):
+    """`data` with its collections replaced (a top-level list is one collection)."""
+    if isinstance(data, list):
+        return collections[""]
+    return {**data, **collections}
+
+
+class LastKnownGood:
+    def __init__(self, path, key=None, directory=SNAPSHOT_DIR, **write_kwargs):
+        self.path = path
+        self.key = key
+        self.name = os.path.splitext(os.path.basename(path))[0]
+        self.snapshot_path = os.path.join(directory, f"{self.name}.json")
+        self.write_kwargs = write_kwargs
+
+    def load(self):
+        """The stored snapshot: {"saved_at", "data", "seen": {collection: {record id: iso time}}}, or None."""
+        return read_json(self.snapshot_path)
+
+    def baseline(self):
+        """Last good payload for incremental runs: the published file if it has records, else the snapshot."""
+        published = read_json(self.path)
+        if _has_records(published):
+            return published
+        snapshot = self.load()
+        return snapshot["data"] if snapshot else published
+
+    def _from_published(self):
+        # First run with the store: the published file is the best baseline there is
+        try:
+            saved_at = datetime.fromtimestamp(os.path.getmtime(self.path)).isoformat(timespec='seconds')
+        except OSError:
+            saved_at = None
+        return {"saved_at": saved_at, "seen": {}, "data": read_json(self.path)}
+
+    def _save(self, data, seen):
+        snapshot = {"saved_at": datetime.now().isoformat(timespec='seconds'), "seen": seen, "data": data}
+        atomic_write(self.snapshot_path, json.dumps(snapshot, ensure_ascii=False, separators=(',', ':')))
+
+    def publish(self, data):
+        """
+        Writes `data` (merged with the snapshot when a collection looks
+        partial) through write_json and stores it as the new last good
+        version. Returns write_json's result.
+        """
+        now = datetime.now()
+        snapshot = self.load() or self._from_published()
+        previous = _collections(snapshot["data"])
+        seen = {}
+        merged = {}
+        for name, records in _collections(data).items():
+            times = seen[name] = {}
+            for i, record in enumerate(records):
+                times[_record_id(record, self.key, i)] = now.isoformat(timespec='seconds')
+            before = previous.get(name) or []
+            if len(records) >= PARTIAL_RATIO * len(before):
+                continue
+
+            merged[name] = list(records)
+            old_times = snapshot["seen"].get(name, {})
+            kept = 0
+            for i, record in enumerate(before):
+                rid = _record_id(record, self.key, i)
+                if rid in times or rid.startswith('#'):
+                    continue
+                last_seen = old_times.get(rid) or snapshot.get("saved_at")
+                if last_seen and now - datetime.fromisoformat(last_seen) > MAX_RECORD_AGE:
+                    continue
+                merged[name].append({**without_staleness(record), "stale": True, "lastSeen": last_seen})
+                times[rid] = last_seen
+                kept += 1
+            print(f"{self.name}{'/' + name if name else ''}: {len(records)} records fetched "
+                  f"(last good had {len(before)}), kept {kept} stale ones")
+            metrics.count('last_good', 'merged')
+
+        if merged:
+            data = _with_collections(data, merged)
+        written = write_json(self.path, data, key=self.key, **self.write_kwargs)
+        self._save(data, seen)
+        return written
+
+    def fallback(self, empty=None):
+        """
+        After a failed fetch: keeps a published file that has records,
+        otherwise restores the snapshot with every record marked stale.
+        Only when there is no file at all is `empty` (default []) written,
+        so the site still finds one. Returns the data now published.
+        """
+        published = read_json(self.path)
+        snapshot = self.load()
+        if _has_records(published):
+            age = f" from {snapshot['saved_at']}" if snapshot else ""
+            print(f"{self.name}: fetch failed, keeping the published data{age}")
+            metrics.count('last_good', 'kept')
+            return published
+        if snapshot and _has_records(snapshot["data"]):
+            print(f"{self.name}: fetch failed, restoring the last good data from {snapshot['saved_at']}")
+            metrics.count('last_good', 'restored')
+            data = _with_collections(snapshot["data"], {
+                name: [
+                    {**without_staleness(record), "stale": True,
+                     "lastSeen": snapshot["seen"].get(name, {}).get(_record_id(record, self.key, i))
+                     or snapshot["saved_at"]}
+                    if isinstance(record, dict) else record
+                    for i, record in enumerate(records)
+                ]
+                for name, records in _collections(snapshot["data"]).items()
+            })
+            write_json(self.path, data, key=self.key, **self.write_kwargs)
+            return data
+        if published is None:
+            published = [] if empty is None else empty
+            write_json(self.path, published, **self.write_kwargs)
+        return published
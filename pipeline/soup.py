@@ -0,0 +1,80 @@
+"""
+HTML parsing helpers shared by the BeautifulSoup scrapers.
+
+- lxml (C parser) when installed, html.parser otherwise
+- partial parsing: `only=strainer(...)` materializes just the target
+  subtrees instead of the whole document
+- CSS selectors are compiled once per process and reused on every page
+
+Usage (at module level, once per site):
+
+    DETAIL_PAGE = strainer(classes=('sp-table', 'il-bist-kod'))
+    SP_TABLE = css('table.sp-table')
+
+    soup = make_soup(content, only=DETAIL_PAGE)
+    table = SP_TABLE.select_one(soup)
+"""
+from functools import lru_cache
+
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer
+
+from pipeline import metrics
+
+try:
+    import lxml  # noqa: F401
+    PARSER = 'lxml'
+except ImportError:
+    PARSER = 'html.parser'
+
+
+class _AnyOf(SoupStrainer):
+    """
+    Tag name OR class match; plain SoupStrainer rules would require both.
+    Hooks the creation check of bs4 >= 4.13 and the search_tag of older ones.
+    """
+
+    def __init__(self, names, classes):
+        super().__init__(list(names))
+        self.names = frozenset(names)
+        self.classes = frozenset(classes)
+
+    def _wanted(self, name, attrs):
+        if name in self.names:
+            return True
+        value = (attrs or {}).get('class') or ()
+        if isinstance(value, str):
+            value = value.split()
+        return not self.classes.isdisjoint(value)
+
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        return self._wanted(name, attrs)
+
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        if hasattr(markup_name, 'attrs'):
+            return markup_name if self._wanted(markup_name.name, markup_name.attrs) else None
+        return markup_name if self._wanted(markup_name, markup_attrs) else None
+
+
+def strainer(names=None, classes=None):
+    """
+    Keeps elements whose tag is in `names` or that carry one of `classes`,
+    together with everything inside them. Select the exact nodes afterwards
+    with css(); the strainer only needs to be a superset.
+    """
+    if names and classes:
+        return _AnyOf(names, classes)
+    if classes:
+        return SoupStrainer(attrs={'class': list(classes)})
+    return SoupStrainer(list(names))
+
+
+def make_soup(content, only=None):
+    with metrics.span('parse'):
+        return BeautifulSoup(content, PARSER, parse_only=only)
+
+
+@lru_cache(maxsize=None)
+def css(selector):
+    """Compiled soupsieve selector: .select(tag), .select_one(tag), .match(tag)."""
+    return soupsieve.compile(selector)
@@ -0,0 +1,172 @@
+"""
+Turkish number and date parsing shared by the scrapers.
+
+Regexes are compiled once and conversions are memoized, since the same
+strings ("Tarih Bekleniyor", "%10", "30,24 TL") repeat on every run.
+
+    parse_number("1.234,56")             -> 1234.56
+    parse_amount("54.7 Milyon")          -> 54700000.0
+    parse_amount("561.198.000 TL")       -> 561198000.0
+    parse_percent("%51,54")              -> 51.54
+    parse_date("20.08.2026")             -> date(2026, 8, 20)
+    parse_date_range("7-8-9 Ocak 2026")  -> (date(2026, 1, 7), date(2026, 1, 9))
+"""
+import re
+from datetime import date
+from functools import lru_cache
+
+MONTHS = {
+    'ocak': 1, 'şubat': 2, 'mart': 3, 'nisan': 4, 'mayıs': 5, 'haziran': 6,
+    'temmuz': 7, 'ağustos': 8, 'eylül': 9, 'ekim': 10, 'kasım': 11, 'aralık': 12,
+}
+
+MULTIPLIERS = {
+    'bin': 1e3,
+    'milyon': 1e6, 'mn': 1e6,
+    'milyar': 1e9, 'mlr': 1e9, 'mr': 1e9,
+    'trilyon': 1e12,
+}
+
+_NUMBER = re.compile(r'[-−]?\d[\d.,]*')
+_MULTIPLIER = re.compile(r'\b(' + '|'.join(sorted(MULTIPLIERS, key=len, reverse=True)) + r')\b')
+_NUMERIC_DATE = re.compile(r'\b(\d{1,2})[./](\d{1,2})[./](\d{4})\b')
+_DATE_TOKEN = re.compile(r'(\d{4})|(\d{1,2})|(' + '|'.join(MONTHS) + r')')
+
+
+def _lower(text):
+    # str.lower() maps "I" to "i"; Turkish needs "ı" (and "İ" -> "i")
+    return text.replace('I', 'ı').replace('İ', 'i').lower()
+
+
+@lru_cache(maxsize=4096)
+def parse_number(text, decimal=','):
+    """
+    First number in `text`, or None. Accepts Turkish ("1.234,56") and
+    English ("1,234.56") grouping: when both separators occur the last one
+    is the decimal point, a repeated separator is a thousands separator, and
+    a single one is decimal unless it is the non-`decimal` one followed by
+    exactly three digits ("1.234" -> 1234, "54.7" -> 54.7, "21,50" -> 21.5).
+    """
+    if text is None:
+        return None
+    match = _NUMBER.search(str(text))
+    if not match:
+        return None
+    number = match.group(0).replace('−', '-').rstrip('.,')
+
+    dots, commas = number.count('.'), number.count(',')
+    if dots and commas:
+        point = '.' if number.rfind('.') > number.rfind(',') else ','
+    elif dots + commas == 1:
+        sep = '.' if dots else ','
+        point = sep if sep == decimal or len(number) - number.rfind(sep) - 1 != 3 else None
+    else:
+        point = None  # no separator, or a repeated (thousands) one
+
+    if point is None:
+        number = number.replace('.', '').replace(',', '')
+    else:
+        grouping = ',' if point == '.' else '.'
+        number = number.replace(grouping, '').replace(point, '.')
+    try:
+        return float(number)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=4096)
+def parse_amount(text):
+    """TL amounts and quantities, scaled by "Bin/Milyon/Milyar": "1,2 Milyar TL" -> 1.2e9."""
+    value = parse_number(text)
+    if value is None:
+        return None
+    match = _MULTIPLIER.search(_lower(text))
+    if match:
+        value *= MULTIPLIERS[match.group(1)]
+    return value
+
+
+def parse_int(text):
+    """Whole quantities such as lot counts: "40,000,000 Lot" -> 40000000."""
+    value = parse_amount(text)
+    return int(round(value)) if value is not None else None
+
+
+def parse_percent(text):
+    """"%51,54", "2,12%" or "4.95" -> the percentage as a float."""
+    return parse_number(text)
+
+
+@lru_cache(maxsize=4096)
+def parse_date(text):
+    """DD.MM.YYYY (or DD/MM/YYYY) -> date, or None."""
+    if not text:
+        return None
+    match = _NUMERIC_DATE.search(text)
+    if not match:
+        return None
+    day, month, year = (int(g) for g in match.groups())
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=4096)
+def parse_date_range(text, default_year=None):
+    """
+    Turkish day/month ranges -> (first, last) dates, or None.
+
+        "7-8-9 Ocak 2026"            -> 2026-01-07 .. 2026-01-09
+        "30 Ocak - 2 Şubat 2026"     -> 2026-01-30 .. 2026-02-02
+        "5 Ocak"                     -> uses default_year
+        "20.08.2026"                 -> a single day
+
+    Days are attached to the month that follows them; a year applies to the
+    months before it that have none.
+    """
+    if not text:
+        return None
+    single = parse_date(text)
+    if single:
+        return single, single
+
+    groups = []         # [day list, month, year]
+    pending = []
+    for year, day, month in _DATE_TOKEN.findall(_lower(text)):
+        if day:
+            pending.append(int(day))
+        elif month:
+            if pending:
+                groups.append([pending, MONTHS[month], None])
+                pending = []
+        elif year:
+            for group in groups:
+                if group[2] is None:
+                    group[2] = int(year)
+    if not groups:
+        return None
+
+    fallback = default_year or date.today().year
+    for group in groups:
+        group[2] = group[2] or fallback
+    # "30 Aralık - 2 Ocak 2026": the December before the given year
+    for earlier, later in zip(reversed(groups[:-1]), reversed(groups[1:])):
+        if earlier[2] == later[2] and earlier[1] > later[1]:
+            earlier[2] -= 1
+
+    days = []
+    for group_days, month, year in groups:
+        for day in group_days:
+            try:
+                days.append(date(year, month, day))
+            except ValueError:
+                pass
+    if not days:
+        return None
+    return days[0], days[-1]
+
+
+def iso(value):
+    """date -> "YYYY-MM-DD", None stays None."""
+    return value.isoformat() if value else None
@@ -0,0 +1,165 @@
+"""
+Symbol universe for the BIST price fetchers: which codes to request and
+which ones are not worth a request right now.
+
+    universe = Universe()
+    universe.promote_ipos()             # newly listed codes from halkarz_ipos.json
+    codes = universe.active()           # registry minus symbols in back-off
+    ...
+    universe.record(ok=[...], failed=[...])
+    universe.save()
+
+data/bist_universe.json is the registry: every code and, for promoted
+IPOs, where and when it was added. One symbol per line, so promotions show
+up as one-line diffs. It changes rarely and is committed with the data.
+Index membership (BIST30 / BIST50 / BIST100) is not tracked until there is
+a real source for the constituents.
+
+<CACHE_ROOT>/universe/health.json holds the per-symbol run state: last
+success and consecutive failures. A code that fails FAILURE_THRESHOLD runs
+in a row (delisted, renamed) is skipped until its retryAfter, which doubles
+on each further failure up to BACKOFF_MAX; one success clears it. A run in
+which nothing succeeded is an outage and is not held against any symbol.
+
+    python -m pipeline.universe         # summary, symbols in back-off
+"""
+import argparse
+import json
+import os
+import re
+import sys
+from datetime import datetime, timedelta
+
+from pipeline import metrics
+from pipeline.fetch import CACHE_ROOT, ROOT_DIR
+from pipeline.publish import atomic_write, read_json
+
+UNIVERSE_PATH = os.path.join(ROOT_DIR, 'data', 'bist_universe.json')
+HEALTH_PATH = os.path.join(CACHE_ROOT, 'universe', 'health.json')
+IPO_PATH = 'public/halkarz_ipos.json'
+
+# halkarz status of an IPO whose shares are trading
+TRADING_STATUS = 'İşlem Görüyor'
+CODE_PATTERN = re.compile(r'^[A-Z0-9]{3,6}$')
+
+# Consecutive failed runs before a symbol is skipped
+FAILURE_THRESHOLD = 3
+# First skip period; doubles with every further failure
+BACKOFF_BASE = timedelta(hours=1)
+BACKOFF_MAX = timedelta(days=7)
+
+
+def backoff(failures):
+    """How long a symbol with `failures` consecutive failures is skipped."""
+    if failures < FAILURE_THRESHOLD:
+        return timedelta(0)
+    return min(BACKOFF_BASE * 2 ** (failures - FAILURE_THRESHOLD), BACKOFF_MAX)
+
+
+def _registry_text(symbols):
+    lines = [f'  {json.dumps(code)}: {json.dumps(meta, ensure_ascii=False, sort_keys=True)}'
+             for code, meta in symbols.items()]
+    return '{\n "symbols": {\n' + ',\n'.join(lines) + '\n }\n}\n'
+
+
+class Universe:
+    def __init__(self, path=UNIVERSE_PATH, health_path=HEALTH_PATH):
+        self.path = path
+        self.health_path = health_path
+        self.symbols = read_json(path, {}).get("symbols", {})
+        self.health = read_json(health_path, {}).get("symbols", {})
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def meta(self, code):
+        """Registry entry and run state of one symbol, merged."""
+        return {**self.symbols.get(code, {}), **self.health.get(code, {})}
+
+    def promote_ipos(self, path=IPO_PATH, today=None):
+        """Adds the codes of trading IPOs (halkarz) missing from the registry; returns them."""
+        data = read_json(path, {})
+        records = data.get("active_ipos", []) if isinstance(data, dict) else data
+        today = (today or datetime.now()).date().isoformat()
+        added = []
+        for record in records or ():
+            if not isinstance(record, dict) or record.get("status") != TRADING_STATUS:
+                continue
+            code = (record.get("code") or "").strip().upper()
+            if CODE_PATTERN.match(code) and code not in self.symbols:
+                self.symbols[code] = {"source": "halkarz", "added": today}
+                added.append(code)
+        if added:
+            metrics.count('universe', 'promoted', len(added))
+        return added
+
+    def is_backed_off(self, code, now=None):
+        retry_after = self.health.get(code, {}).get("retryAfter")
+        return bool(retry_after) and datetime.fromisoformat(retry_after) > (now or datetime.now())
+
+    def active(self, now=None):
+        """Registry codes worth requesting now, in registry order."""
+        now = now or datetime.now()
+        codes = [code for code in self.symbols if not self.is_backed_off(code, now)]
+        metrics.count('universe', 'active', len(codes))
+        metrics.count('universe', 'backed_off', len(self.symbols) - len(codes))
+        return codes
+
+    def record(self, ok, failed, now=None):
+        """
+        Outcome of one run: `ok` codes returned data, `failed` ones did not.
+        Ignored when nothing succeeded (the source was down, not the symbols).
+        Returns the codes that went into back-off.
+        """
+        ok, failed = list(ok), list(failed)
+        if not ok:
+            if failed:
+                print(f"universe: no symbol returned data, not counting {len(failed)} failures")
+            return []
+        now = now or datetime.now()
+        for code in ok:
+            self.health[code] = {"lastSuccess": now.isoformat(timespec='seconds')}
+        backed_off = []
+        for code in failed:
+            state = self.health.setdefault(code, {})
+            state["failures"] = state.get("failures", 0) + 1
+            delay = backoff(state["failures"])
+            if delay:
+                state["retryAfter"] = (now + delay).isoformat(timespec='seconds')
+                backed_off.append(code)
+        return backed_off
+
+    def save(self):
+        text = _registry_text(self.symbols)
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                unchanged = f.read() == text
+        except OSError:
+            unchanged = False
+        if not unchanged:
+            atomic_write(self.path, text)
+        # Run state of codes no longer in the registry is dropped
+        health = {code: state for code, state in self.health.items() if code in self.symbols}
+        atomic_write(self.health_path, json.dumps({"symbols": health}, ensure_ascii=False,
+                                                  separators=(',', ':'), sort_keys=True))
+
+
+def main():
+    argparse.ArgumentParser(description="Show the BIST symbol universe and its back-off state").parse_args()
+
+    universe = Universe()
+    now = datetime.now()
+    print(f"{len(universe)} symbols")
+    promoted = [code for code, meta in universe.symbols.items() if meta.get("source") == "halkarz"]
+    print(f"  promoted from halkarz: {len(promoted)}")
+    backed_off = [code for code in universe.symbols if universe.is_backed_off(code, now)]
+    print(f"  in back-off: {len(backed_off)}")
+    for code in backed_off:
+        state = universe.health[code]
+        print(f"    {code}: {state['failures']} failures, retry after {state['retryAfter']}, "
+              f"last success {state.get('lastSuccess', 'never')}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+Bounded concurrent execution of one blocking call per item (e.g. a
+yfinance .info per symbol), with a hard per-call timeout and jittered
+retries.
+
+    for symbol, info, error in bounded_map(fetch_info, symbols, workers=8, timeout=20):
+        ...                     # in completion order, as soon as each one is done
+
+At most `workers` calls are in flight. A call still running after
+`timeout` seconds counts as a failed attempt: its slot is reused right
+away and whatever it returns later is dropped (the thread is a daemon and
+finishes in the background; Python threads cannot be killed). Failed
+attempts are retried up to `attempts` times in total, after a delay of
+retry_delay * 2**(attempt - 1), randomly stretched or shrunk by up to 50%.
+The jitter keeps retries from reaching the server in lockstep.
+
+Calls run in a copy of the caller's context, so metrics spans and jobs
+(pipeline.metrics) are attributed as if the call were made inline.
+
+WORKERS and CALL_TIMEOUT default to PIPELINE_WORKERS / PIPELINE_CALL_TIMEOUT
+from the environment.
+"""
+import contextvars
+import heapq
+import itertools
+import os
+import queue
+import random
+import threading
+import time
+from collections import deque
+
+from pipeline import metrics
+
+WORKERS = int(os.environ.get('PIPELINE_WORKERS') or 8)
+# Seconds one call may take before it is abandoned
+CALL_TIMEOUT = float(os.environ.get('PIPELINE_CALL_TIMEOUT') or 20)
+ATTEMPTS = 3
+RETRY_DELAY = 1.0
+
+
+class CallTimeout(TimeoutError):
+    pass
+
+
+def retry_delay(attempt, base=RETRY_DELAY):
+    """Jittered wait after the given 1-based failed attempt."""
+    return base * 2 ** (attempt - 1) * random.uniform(0.5, 1.5)
+
+
+def bounded_map(func, items, workers=None, timeout=None, attempts=ATTEMPTS, delay=RETRY_DELAY):
+    """
+    Calls `func(item)` for every item and yields (item, result, error) in
+    completion order: error is None on success, otherwise the exception of
+    the last attempt (CallTimeout when it ran out of time).
+    """
+    workers = max(1, workers or WORKERS)
+    timeout = timeout or CALL_TIMEOUT
+    todo = deque((item, 1) for item in items)
+    waiting = []                 # heap of (ready at, seq, item, attempt)
+    running = {}                 # call id -> (item, attempt, deadline)
+    finished = queue.Queue()     # (call id, result, error) from the threads
+    ids = itertools.count()
+
+    def call(call_id, item):
+        try:
+            finished.put((call_id, func(item), None))
+        except Exception as e:
+            finished.put((call_id, None, e))
+
+    while todo or waiting or running:
+        now = time.monotonic()
+        while waiting and waiting[0][0] <= now:
+            _, _, item, attempt = heapq.heappop(waiting)
+            todo.append((item, attempt))
+        while todo and len(running) < workers:
+            item, attempt = todo.popleft()
+            call_id = next(ids)
+            running[call_id] = (item, attempt, now + timeout)
+            context = contextvars.copy_context()
+            threading.Thread(target=context.run, args=(call, call_id, item), daemon=True).start()
+
+        wakeups = [deadline for _, _, deadline in running.values()]
+        if waiting:
+            wakeups.append(waiting[0][0])
+        outcomes = []
+        try:
+            call_id, result, error = finished.get(timeout=max(0.0, min(wakeups) - now))
+            if call_id in running:  # otherwise a late answer to an abandoned call
+                outcomes.append((*running.pop(call_id)[:2], result, error))
+        except queue.Empty:
+            pass
+
+        now = time.monotonic()
+        for call_id, (item, attempt, deadline) in list(running.items()):
+            if deadline <= now:
+                del running[call_id]
+                metrics.count('calls', 'timeout')
+                outcomes.append((item, attempt, None, CallTimeout(f"{item}: no answer in {timeout:g}s")))
+
+        for item, attempt, result, error in outcomes:
+            if error is not None and attempt < attempts:
+                metrics.count('calls', 'retry')
+                heapq.heappush(waiting, (now + retry_delay(attempt, delay), next(ids), item, attempt + 1))
+                continue
+            yield item, result, error
@@ -1,44 +1,60 @@
-from curl_cffi import requests
-import time
-from bs4 import BeautifulSoup
-import json
+from pipeline import metrics
+from pipeline.fetch import HttpClient
+from pipeline.extract import Cell, CellRules
+from pipeline.snapshot import LastKnownGood
+from pipeline.soup import make_soup, strainer
+from pipeline.turkish import iso, parse_amount, parse_date, parse_percent
+from datetime import datetime
 import os
 import re
 import sys
 
-def scrape_capital_increases():
+# Only the tables are parsed; the rest of the page is skipped
+TABLES = strainer(names=('table',))
+
+DATE = re.compile(r'\d{2}\.\d{2}\.\d{4}')
+DIGIT = re.compile(r'\d')
+
+def looks_like_amount(text):
+    # Contains TL or a long numeric value, but is not a date
+    return (('TL' in text or (DIGIT.search(text) and len(text) > 8))
+            and '00.' not in text and not DATE.search(text))
+
+# Row signature: company/code in the first column, then the rate (%), the
+# amount and the YKK / SPK / registration dates in any order
+CAPITAL_ROW = CellRules(
+    columns={0: [
+        # Code: all caps, 3-5 chars at the start mostly
+        Cell('code', pattern=r'([A-Z]{3,5})', otherwise=lambda text: text.split()[0]),
+        Cell('company'),
+    ]},
+    rest=[
+        Cell('rate', pattern='%', once=True, chain=True),
+        Cell('amount', test=looks_like_amount, once=True, chain=True),
+        Cell('dates', pattern=DATE, many=True),
+    ],
+)
+
+def scrape_capital_increases(client=None):
     print("Starting scraper...")
     url = "https://halkarz.com/sermaye-artirimi/"
     headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
         "Referer": "https://halkarz.com/",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Accept-Language": "tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7"
     }
 
-    browsers = ["chrome120", "safari15_5", "edge99"]
-    
-    response = None
-    for attempt, browser in enumerate(browsers, 1):
-        try:
-            print(f"Attempt {attempt}/{len(browsers)}: Requesting {url} with {browser}")
-            response = requests.get(url, headers=headers, impersonate=browser, timeout=30)
-            if response.status_code == 200:
-                print("Success fetching page")
-                break
-            else:
-                print(f"Status code: {response.status_code}")
-        except Exception as e:
-            print(f"{browser} failed: {e}")
-            if attempt < len(browsers):
-                time.sleep(2)
+    client = client or HttpClient()
+    output = LastKnownGood(os.path.join('public', 'sermaye_artirimi.json'), key=('code', 'type'), indent=2)
+    print(f"Requesting {url}")
+    response = client.get(url, headers=headers)
     
     if not response or response.status_code != 200:
         print("Failed to fetch page")
-        return
+        output.fallback()
+        return False
+    print("Success fetching page" + (" (not modified, cached)" if response.from_cache else ""))
 
     try:
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content, only=TABLES)
         
         # Helper to clean text
         def clean(text):
@@ -82,37 +98,13 @@ def scrape_capital_increases():
                     if row_idx < 3:
                         print(f"Row {row_idx}: {col_texts}")
 
-                    # Heuristic Parsing
-                    code = ""
-                    company = ""
-                    rate = ""
-                    amount = ""
-                    dates = []
-                    
-                    # 1. Company/Code is usually Col 0
                     if not col_texts: continue
-                    company_text = col_texts[0]
-                    # Extract Code (All caps, 3-5 chars at start mostly)
-                    code_match = re.search(r'([A-Z]{3,5})', company_text)
-                    if code_match:
-                        code = code_match.group(1)
-                    else:
-                        code = company_text.split()[0]
-                    company = company_text
-                    
-                    # 2. Iterate remaining columns look for signatures
-                    for text in col_texts[1:]:
-                        # Rate: Contains %
-                        if '%' in text and not rate:
-                            rate = text
-                        # Amount: Contains TL or numeric format avoiding dates
-                        elif ('TL' in text or (re.search(r'\d', text) and len(text) > 8)) and '00.' not in text and not amount:
-                             # Check if it looks like a date
-                             if not re.search(r'\d{2}\.\d{2}\.\d{4}', text):
-                                amount = text
-                        # Date: DD.MM.YYYY
-                        if re.search(r'\d{2}\.\d{2}\.\d{4}', text):
-                            dates.append(text)
+                    cells = CAPITAL_ROW.classify(col_texts)
+                    code = cells['code']
+                    company = cells['company']
+                    rate = cells['rate']
+                    amount = cells['amount']
+                    dates = cells['dates']
                     
                     # Assign Dates
                     # Usually order: YKK, SPK, Tescil/Final
@@ -144,19 +136,18 @@ def scrape_capital_increases():
                          display_date = ""
                          status = "Taslak"
 
-                    # If display_date is in the past, mark as completed
-                    if display_date:
-                        try:
-                            from datetime import datetime
-                            # display_date format is DD.MM.YYYY
-                            d_date = datetime.strptime(display_date, '%d.%m.%Y')
-                            if datetime.now() > d_date:
-                                status = "Tamamlandı"
-                                if "GENIL" in code: print(f"DEBUG GENIL: Updated to Tamamlandı. Now: {datetime.now()} > {d_date}")
-                            else:
-                                if "GENIL" in code: print(f"DEBUG GENIL: Not updated. Now: {datetime.now()} <= {d_date}")
-                        except Exception as e:
-                            print(f"Date parse error: {e}")
+                    # If display_date is in the past, mark as completed; for
+                    # "05.08.2026 Bitiş : 19.08.2026" periods the end date counts
+                    period = DATE.findall(display_date)
+                    start_date = parse_date(period[0]) if period else None
+                    end_date = parse_date(period[-1]) if period else None
+                    if end_date:
+                        d_date = datetime.combine(end_date, datetime.min.time())
+                        if datetime.now() > d_date:
+                            status = "Tamamlandı"
+                        metrics.count('status_by_date', status)
+                    elif display_date:
+                        print(f"Date parse error: {display_date}")
 
                     if not display_date and status == "Taslak": # Only set if still default
                           display_date = ""
@@ -174,7 +165,13 @@ def scrape_capital_increases():
                         "rate": rate,
                         "date": display_date,
                         "status": status,
-                        "description": desc
+                        "description": desc,
+                        "rateValue": parse_percent(rate),
+                        "amountValue": parse_amount(amount),
+                        # dateIso is the date the status is based on (a period's end)
+                        "dateIso": iso(end_date),
+                        "startDate": iso(start_date),
+                        "endDate": iso(end_date),
                     })
 
                 except Exception as e:
@@ -182,17 +179,16 @@ def scrape_capital_increases():
                     continue
 
         os.makedirs('public', exist_ok=True)
-        output_path = os.path.join('public', 'sermaye_artirimi.json')
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(capital_increases, f, ensure_ascii=False, indent=2)
-            
+        output.publish(capital_increases)
+
         print(f"Successfully scraped {len(capital_increases)} records")
+        return True
 
     except Exception as e:
         print(f"An error occurred: {e}")
-        if not os.path.exists('public/sermaye_artirimi.json'):
-             with open('public/sermaye_artirimi.json', 'w', encoding='utf-8') as f:
-                json.dump([], f)
+        output.fallback()
+        return False
 
 if __name__ == "__main__":
-    scrape_capital_increases()
+    with metrics.run('capital'), HttpClient() as client:
+        scrape_capital_increases(client)
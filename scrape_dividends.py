@@ -1,7 +1,8 @@
-from curl_cffi import requests
-import json
+from pipeline import metrics
+from pipeline.fetch import HttpClient
+from pipeline.snapshot import LastKnownGood
+from pipeline.turkish import iso, parse_date, parse_number, parse_percent
 import os
-import time
 from datetime import datetime
 
 def log(msg):
@@ -10,65 +11,62 @@ def log(msg):
     import sys
     sys.stdout.flush()
 
-def scrape_dividends():
+def scrape_dividends(client=None):
     url = "https://halkarz.com/wp-content/themes/halkarz/json/temettu.json"
     headers = {
         "Referer": "https://halkarz.com/temettu-takvimi/",
         "Accept": "application/json, text/plain, */*",
-        "Accept-Language": "tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7"
     }
 
-    # Try different browser profiles to bypass Cloudflare
-    browsers = ["chrome120", "safari15_5", "edge99"]
-    
-    for attempt, browser in enumerate(browsers, 1):
-        try:
-            log(f"Attempt {attempt}/{len(browsers)}: Fetching data using {browser}...")
-            response = requests.get(url, headers=headers, impersonate=browser, timeout=30)
-            log(f"Response status: {response.status_code}")
-            log(f"Response size: {len(response.content)} bytes")
-            
-            response.raise_for_status()
-            
-            log("Parsing JSON data...")
-            data = response.json()
-            log(f"✓ Fetched {len(data)} dividend records with {browser}")
-            
-            if len(data) > 0:
-                log(f"Sample entry keys: {list(data[0].keys())}")
+    # Shared client: browser-profile rotation, keep-alive and ETag revalidation
+    client = client or HttpClient()
+    output = LastKnownGood(os.path.join('public', 'temettu.json'), key=('t_bistkod', 't_tarih'), indent=2)
+    try:
+        log(f"Fetching {url}...")
+        response = client.get(url, headers=headers)
+        if response is None:
+            raise RuntimeError("no response from any browser profile")
+        log(f"Response status: {response.status_code}" + (" (not modified, cached)" if response.from_cache else ""))
+        log(f"Response size: {len(response.content)} bytes")
 
-            # Ensure public directory exists
-            os.makedirs('public', exist_ok=True)
-            
-            output_path = os.path.join('public', 'temettu.json')
-            log(f"Saving data to {output_path}...")
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-                
-            log(f"✓ Successfully saved {len(data)} records to {output_path}")
-            return True  # Success!
-            
-        except Exception as e:
-            log(f"✗ {browser} failed: {e}")
-            if attempt < len(browsers):
-                wait_time = attempt * 2  # Exponential backoff
-                log(f"Waiting {wait_time}s before trying next browser...")
-                time.sleep(wait_time)
-            else:
-                log("All browser profiles failed")
-                import traceback
-                traceback.print_exc()
-    
-    log("Creating empty fallback file...")
+        response.raise_for_status()
+
+        log("Parsing JSON data...")
+        data = response.json()
+        log(f"✓ Fetched {len(data)} dividend records")
+
+        if len(data) > 0:
+            log(f"Sample entry keys: {list(data[0].keys())}")
+
+        # Typed copies of the display strings, so the frontend does not re-parse them
+        for item in data:
+            item['netDividend'] = parse_number(item.get('t_temt_net'))
+            item['yieldRate'] = parse_percent(item.get('t_yuzde'))
+            item['dateIso'] = iso(parse_date(item.get('t_tarih')))
+
+        # Ensure public directory exists
+        os.makedirs('public', exist_ok=True)
+
+        log(f"Saving data to {output.path}...")
+        if output.publish(data):
+            log(f"✓ Successfully saved {len(data)} records to {output.path}")
+        else:
+            log(f"✓ {output.path} unchanged ({len(data)} records), not rewritten")
+        return True  # Success!
+
+    except Exception as e:
+        log(f"✗ Fetch failed: {e}")
+        import traceback
+        traceback.print_exc()
+
+    # Last good data (possibly stale) rather than an empty calendar
     os.makedirs('public', exist_ok=True)
-    output_path = os.path.join('public', 'temettu.json')
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump([], f)
-    log("Fallback file created.")
+    output.fallback()
     return False
 
 if __name__ == "__main__":
     import sys
-    scrape_dividends()
+    with metrics.run('dividends'), HttpClient() as client:
+        scrape_dividends(client)
     sys.exit(0)  # Always exit 0 to prevent workflow failure
 
@@ -4,11 +4,32 @@ Simplified IPO scraper for halkarz.com
 Extracts active and draft IPOs from the main page
 """
 import requests
-from bs4 import BeautifulSoup
-import json
 import os
 import sys
 
+from pipeline.extract import Field, Spec
+from pipeline.snapshot import LastKnownGood
+from pipeline.soup import css, make_soup, strainer
+from pipeline.turkish import iso, parse_date_range
+
+# Only the tab containers and IPO cards are parsed; selectors are compiled once
+IPO_CARDS = strainer(classes=('tab_item', 'index-list'))
+TAB_ITEMS = css('div.tab_item')
+ARTICLES = css('article.index-list')
+
+IPO_CARD = Spec(
+    fields={
+        "company": Field("h3.il-halka-arz-sirket a", required=True),
+        # "link" like the other halkarz_ipos.json producers (the record key)
+        "link": Field("h3.il-halka-arz-sirket a", attr="href", default=""),
+        "code": Field("span.il-bist-kod", default="N/A"),
+        "dates": Field("span.il-halka-arz-tarihi", default="Tarih Yok"),
+        "status": Field("div.il-badge", default=""),
+        "logo": Field("img.slogo", attr="src", default=""),
+    },
+    defaults={"price": 0, "lotCount": "Belirtilmedi", "distributionType": "Belirtilmedi"},
+)
+
 def log(msg):
     print(msg)
     sys.stdout.flush()
@@ -29,11 +50,11 @@ def scrape_ipos():
         if not response.ok:
             raise Exception(f"HTTP {response.status_code}")
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = make_soup(response.text, only=IPO_CARDS)
         log("Parsing HTML...")
         
         # Find tab containers
-        tab_items = soup.find_all("div", class_="tab_item")
+        tab_items = TAB_ITEMS.select(soup)
         log(f"Found {len(tab_items)} tab containers")
         
         if len(tab_items) < 2:
@@ -51,7 +72,7 @@ def scrape_ipos():
         
         # Parse active IPOs
         log("Parsing active IPOs...")
-        active_articles = active_container.find_all("article", class_="index-list")
+        active_articles = ARTICLES.select(active_container)
         log(f"Found {len(active_articles)} active IPO articles")
         
         for article in active_articles:
@@ -64,7 +85,7 @@ def scrape_ipos():
         
         # Parse draft IPOs
         log("Parsing draft IPOs...")
-        draft_articles = draft_container.find_all("article", class_="index-list")
+        draft_articles = ARTICLES.select(draft_container)
         log(f"Found {len(draft_articles)} draft IPO articles")
         
         for article in draft_articles:
@@ -79,8 +100,7 @@ def scrape_ipos():
         os.makedirs('public', exist_ok=True)
         output_path = 'public/halkarz_ipos.json'
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        LastKnownGood(output_path, key='link', indent=2).publish(result)
         
         log(f"✓ Saved {len(result['active_ipos'])} active and {len(result['draft_ipos'])} draft IPOs")
         log(f"✓ File: {output_path}")
@@ -91,55 +111,25 @@ def scrape_ipos():
         import traceback
         traceback.print_exc()
         
-        # Save empty result
-        result = {"active_ipos": [], "draft_ipos": []}
+        # Keep the last good IPO lists instead of publishing empty ones
         os.makedirs('public', exist_ok=True)
-        with open('public/halkarz_ipos.json', 'w', encoding='utf-8') as f:
-            json.dump(result, f)
-        log("Created empty fallback file")
+        LastKnownGood('public/halkarz_ipos.json', key='link', indent=2).fallback(empty={"active_ipos": [], "draft_ipos": []})
         return False
 
 def extract_ipo_data(article):
     """Extract IPO data from article element"""
-    # Company name and link
-    header = article.find("h3", class_="il-halka-arz-sirket")
-    if not header:
+    data = IPO_CARD.extract(article)
+    if data is None:
         return None
-    
-    a_tag = header.find("a")
-    if not a_tag:
-        return None
-    
-    company = a_tag.get_text(strip=True)
-    url = a_tag.get('href', '')
-    
-    # Stock code
-    code_span = article.find("span", class_="il-bist-kod")
-    code = code_span.get_text(strip=True) if code_span else "N/A"
-    
-    # Dates
-    date_span = article.find("span", class_="il-halka-arz-tarihi")
-    dates = date_span.get_text(strip=True) if date_span else "Tarih Yok"
-    
-    # Status badge
-    status_div = article.find("div", class_="il-badge")
-    status = status_div.get_text(strip=True) if status_div else ""
-    
-    # Logo
-    img_tag = article.find("img", class_="slogo")
-    logo = img_tag.get('src', '') if img_tag else ""
-    
-    return {
-        "code": code,
-        "company": company,
-        "dates": dates,
-        "status": status,
-        "logo": logo,
-        "url": url,
-        "price": 0,
-        "lotCount": "Belirtilmedi",
-        "distributionType": "Belirtilmedi"
-    }
+    order = ("code", "company", "dates", "status", "logo", "link", "price", "lotCount", "distributionType")
+    ipo = {key: data[key] for key in order}
+    # Same typed fields as scripts/fetch_halkarz_ipo.py; the card has no price or lot count
+    rng = parse_date_range(ipo["dates"])
+    ipo["priceValue"] = None
+    ipo["lotCountValue"] = None
+    ipo["startDate"] = iso(rng[0]) if rng else None
+    ipo["endDate"] = iso(rng[1]) if rng else None
+    return ipo
 
 if __name__ == "__main__":
     log("="*60)
@@ -1,11 +1,20 @@
-from curl_cffi import requests
-from bs4 import BeautifulSoup
-import json
+import argparse
+import asyncio
 import re
 import time
 import os
 import sys
-import concurrent.futures
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipeline import metrics
+from pipeline.checkpoint import CHECKPOINT_DIR, Checkpoint
+from pipeline.crawl import AsyncCrawler
+from pipeline.extract import Field, LabelTable, Spec
+from pipeline.snapshot import LastKnownGood, without_staleness
+from pipeline.soup import css, make_soup, strainer
+from pipeline.turkish import iso, parse_amount, parse_date_range, parse_int
 
 # Headers not needed for curl_cffi as impersonate handles it, 
 # but good to keep basic ones just in case or for logging
@@ -13,162 +22,132 @@ HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
 }
 
+ACTIVE_URL = 'https://halkarz.com/k/halka-arz/'
+DRAFT_URL = 'https://halkarz.com/k/taslak/'
+
+# Fallback/Manual adds for items that might be missed due to pagination limits or caching.
+# Prepended so they appear at the TOP (assuming they are new/active).
+MANUAL_LINKS = [
+    {'title': 'Üçay Mühendislik', 'link': 'https://halkarz.com/ucay-muhendislik-enerji-ve-iklimlendirme-teknolojileri-a-s/', 'status': 'Yeni'}
+]
+
+# Completed IPOs never change again; incremental runs carry these over untouched
+FINAL_STATUSES = ('İşlem Görüyor',)
+
+# Detail pages parsed by a run that died before saving; a retry reuses the
+# recent ones instead of fetching them again
+JOURNAL_PATH = os.path.join(CHECKPOINT_DIR, 'halkarz_ipos.ndjson')
+JOURNAL_MAX_AGE = 6 * 60 * 60
+
+# Detail page rules: only the nodes read here are parsed, selectors and
+# label patterns are compiled once
+DETAIL_PAGE = Spec(
+    only=strainer(classes=('sp-table', 'il-bist-kod')),
+    fields={'code': Field('.il-bist-kod', default='')},
+    tables=[LabelTable('table.sp-table tr', [
+        ('Fiyat', 'price'),
+        ('Tarih', 'dates'),
+        ('Dağıtım', 'distributionType'),
+        ('Pay', 'lotCount'),
+    ])],
+    defaults={
+        'price': 'Belirlenmedi',
+        'dates': 'Tarih Yok',
+        'distributionType': 'Bilinmiyor',
+        'lotCount': 'Belirtilmedi',
+    },
+)
+DETAIL_CONTENT = strainer(names=('article',), classes=('entry-content', 'post-content'))
+CATEGORY_PAGE = strainer(names=('article',), classes=('post-item',))
+CATEGORY_ITEM = Spec(fields={
+    'link': Field('a', attr='href', required=True),
+    'title': Field('h2, h3', default=''),
+})
+CONTENT = css('.entry-content, .post-content, article')
+ARTICLES = css('article, .post-item')
+TITLE_CODE = re.compile(r'\(([A-Z]{3,5})\)')
+TEXT_PRICE = re.compile(r'(?:Halka Arz Fiyatı|Fiyat).*?([\d,.]+)\s*TL', re.IGNORECASE)
+
 def clean_text(text):
     return ' '.join(text.split())
 
-# Helper for robust fetching
-def fetch_with_retry(url, retries=3):
-    browsers = ["chrome120", "safari15_5", "firefox109"]
-    
-    for attempt in range(retries):
-        # Rotate browser based on attempt number
-        browser = browsers[attempt % len(browsers)]
-        try:
-            # print(f"  Attempt {attempt+1}/{retries} for {url} using {browser}...")
-            response = requests.get(url, headers=HEADERS, impersonate=browser, timeout=30)
-            
-            if response.status_code == 200:
-                return response
-            elif response.status_code == 404:
-                return response # Return 404 so caller knows it's missing/end
-            else:
-                pass # Try next
-                
-        except Exception as e:
-            pass
-            # print(f"    Error with {browser}: {e}")
-            
-        time.sleep(1 + attempt)  # Backoff
-        
-    return None
+def normalize(record):
+    """Adds typed copies of the display strings (None when not parseable)."""
+    rng = parse_date_range(record['dates'])
+    record['priceValue'] = parse_amount(record['price'])
+    record['lotCountValue'] = parse_int(record['lotCount'])
+    record['startDate'] = iso(rng[0]) if rng else None
+    record['endDate'] = iso(rng[1]) if rng else None
+    return record
+
+def ipo_status(status, dates, now=None):
+    """
+    Refines the listing status of an IPO from its book-building dates:
+    trading one day after the last day, collecting demand before that.
+    """
+    if status not in ['Yeni', 'Talep Toplanıyor']:
+        return status
+    if 'Tarih Bekleniyor' in dates:
+        status = 'Onaylı' # Approved but dates pending
 
-def fetch_details_for_item(item):
+    rng = parse_date_range(dates)
+    if rng:
+        ipo_end_date = datetime.combine(rng[1], datetime.min.time())
+        if (now or datetime.now()) > ipo_end_date + timedelta(days=1):
+            status = 'İşlem Görüyor'
+        elif re.search(r'\d', dates):
+            status = 'Talep Toplanıyor'
+        metrics.count('status_by_date', status)
+    elif re.search(r'\d', dates):
+        # Dates that do not parse but name a day are still being collected
+        status = 'Talep Toplanıyor'
+    return status
+
+async def fetch_details_for_item(crawler, item):
     """
     Fetches details for a given item dict {title, link, status}.
     Returns the complete item dict with details, or None on failure.
     """
-    link = item['link']
-    title = item['title']
-    
-    response = fetch_with_retry(link)
-    
+    response = await crawler.get(item['link'])
+
     if not response or response.status_code != 200:
-        print(f"FAILED to fetch details for {title} (Link: {link})")
+        print(f"FAILED to fetch details for {item['title']} (Link: {item['link']})")
         return None
 
+    return parse_item_details(item, response.content)
+
+def parse_item_details(item, content):
+    """Extracts price, dates, distribution type and lot count from a detail page."""
+    link = item['link']
+    title = item['title']
+
     try:
-        soup = BeautifulSoup(response.content, 'html.parser')
-        # ... rest of extraction ...
+        values = DETAIL_PAGE.extract(DETAIL_PAGE.parse(content))
+        price = values['price']
+        dates = values['dates']
+        distribution_type = values['distributionType']
+        lot_count = values['lotCount']
+        code = values['code']
 
-        # BeautifulSoup Extraction logic
-        sp_table = soup.select_one('table.sp-table')
-        content_div = soup.select_one('.entry-content, .post-content, article')
-        text = clean_text(content_div.get_text()) if content_div else ""
-        
-        price = 'Belirlenmedi'
-        dates = 'Tarih Yok'
-        distribution_type = 'Bilinmiyor'
-        lot_count = 'Belirtilmedi'
-        code = ''
-
-        # Extract Code
-        code_tag = soup.select_one('.il-bist-kod')
-        if code_tag:
-            code = code_tag.get_text(strip=True)
-        
         if not code:
-            code_match = re.search(r'\(([A-Z]{3,5})\)', title)
+            code_match = TITLE_CODE.search(title)
             if code_match:
                 code = code_match.group(1)
 
-        # Extract from Table
-        if sp_table:
-            for tr in sp_table.find_all('tr'):
-                tds = tr.find_all('td')
-                if len(tds) < 2: continue
-                
-                label = tds[0].get_text(strip=True)
-                value = tds[1].get_text(strip=True)
-
-                if 'Fiyat' in label:
-                    price = value
-                elif 'Tarih' in label:
-                    dates = value
-                elif 'Dağıtım' in label:
-                    distribution_type = value
-                elif 'Pay' in label:
-                     lot_count = value
-
         # Clean/Fallback
         if 'Hazırlanıyor' in dates:
             dates = 'Tarih Bekleniyor'
         
         if price == 'Belirlenmedi':
-             match = re.search(r'(?:Halka Arz Fiyatı|Fiyat).*?([\d,.]+)\s*TL', text, re.IGNORECASE)
+             # Rare path: the article body is only parsed when the table has no price
+             content_div = CONTENT.select_one(make_soup(content, only=DETAIL_CONTENT))
+             text = clean_text(content_div.get_text()) if content_div else ""
+             match = TEXT_PRICE.search(text)
              if match: price = match.group(1) + ' TL'
 
-        # Refining Status Logic
-        final_status = item['status']
-        if final_status in ['Yeni', 'Talep Toplanıyor']:
-            if 'Tarih Bekleniyor' in dates:
-                final_status = 'Onaylı' # Approved but dates pending
-            
-            # Check if date is past
-            try:
-                import datetime
-                current_year = datetime.datetime.now().year
-                
-                # Extract days and month from date string like "7-8-9 Ocak 2026" or "5 Ocak 2026"
-                # Simple month mapping
-                tr_months = {
-                    'Ocak': 1, 'Şubat': 2, 'Mart': 3, 'Nisan': 4, 'Mayıs': 5, 'Haziran': 6,
-                    'Temmuz': 7, 'Ağustos': 8, 'Eylül': 9, 'Ekim': 10, 'Kasım': 11, 'Aralık': 12
-                }
-                
-                # Find month and its position
-                month_val = 0
-                month_name_found = ""
-                for m_name, m_val in tr_months.items():
-                    if m_name in dates:
-                        month_val = m_val
-                        month_name_found = m_name
-                        break
-                
-                # Find last day number in the text BEFORE the month name
-                if month_val > 0:
-                    # Split string by month name, take first part
-                    parts = dates.split(month_name_found)
-                    pre_month_text = parts[0]
-                    day_matches = re.findall(r'\d+', pre_month_text)
-                    
-                    if day_matches:
-                        # The last number before the month is likely the end day
-                        last_day = int(day_matches[-1])
-                        
-                        # Construct date object
-                        year_match = re.search(r'20\d{2}', dates)
-                        year_val = int(year_match.group(0)) if year_match else current_year
-
-                        ipo_end_date = datetime.datetime(year_val, month_val, last_day)
-                        
-                        # If today is after ipo_end_date, it's completed/trading
-                        # Add 1 day buffer
-                        if datetime.datetime.now() > ipo_end_date + datetime.timedelta(days=1): 
-                             final_status = 'İşlem Görüyor'
-                             if 'MEYSU' in title:
-                                print(f"DEBUG MEYSU: now={datetime.datetime.now()}, end={ipo_end_date}, status=CHANGED")
-                        elif 'MEYSU' in title:
-                                print(f"DEBUG MEYSU: now={datetime.datetime.now()}, end={ipo_end_date}, status=KEPT {final_status}")
-                        elif re.search(r'\d', dates):
-                             final_status = 'Talep Toplanıyor'
-
-            except Exception as e:
-                # Fallback if date parsing fails
-                print(f"Date parsing error for {dates}: {e}")
-                if re.search(r'\d', dates):
-                    final_status = 'Talep Toplanıyor'
+        final_status = ipo_status(item['status'], dates)
 
-        return {
+        return normalize({
             'company': title,
             'link': link,
             'status': final_status,
@@ -177,167 +156,214 @@ def fetch_details_for_item(item):
             'dates': dates,
             'distributionType': distribution_type,
             'lotCount': lot_count
-        }
+        })
 
     except Exception as e:
         # print(f"Error details {link}: {e}")
         return None
 
-def fetch_category_links(base_url, status_label):
+def parse_category_page(content, status_label):
+    soup = make_soup(content, only=CATEGORY_PAGE)
+    articles = ARTICLES.select(soup)
+
+    items = []
+    for article in articles:
+        values = CATEGORY_ITEM.extract(article)
+        if not values: continue
+
+        link = values['link']
+        title = values['title']
+
+        # Check for 'halkarz.com' to ensure internal link, avoid ads
+        if link and 'halkarz.com' in link and title:
+            items.append({'title': title, 'link': link, 'status': status_label})
+    return items
+
+async def fetch_category_links(crawler, base_url, status_label, on_items, known_links=None):
+    """
+    Walks the paginated category and hands every page's items to `on_items`
+    as soon as it is parsed, so detail fetches start while paging continues.
+    With `known_links`, stops after the first page that has no unseen links
+    (the listing is newest-first, so later pages are already known too).
+    Returns the links and whether the whole listing was read (no early
+    stop, no failed page), i.e. whether a link missing from it is gone.
+    """
     links = []
+    complete = False
+    failed_pages = 0
     page = 1
     max_pages = 50 # Safety limit
     
     print(f"Starting scan for {status_label} at {base_url}...")
     
     while page <= max_pages:
-        # url = f"{base_url}page/{page}/" if page > 1 else base_url
         url = base_url if page == 1 else f"{base_url}page/{page}/"
 
         try:
-            # Upsert wrapper
-            response = fetch_with_retry(url, retries=4)
+            response = await crawler.get(url, retries=4)
             
             if not response:
+                # Typically 403 means IP/Session block, but skip in case just this page failed.
                 print(f"Failed to fetch page {page} {url} after retries.")
-                # Don't break immediately, maybe just skip? But usually blocking is persistent.
-                # Let's try to continue to next page in case just this one failed?
-                # But typically 403 means IP/Session block.
-                # We'll break if it's consecutive failures, but for now just skip.
+                failed_pages += 1
                 page += 1
                 continue
 
             if response.status_code == 404:
                 # End of pages
-                break
-            if response.status_code != 200:
-                print(f"Skipping page {page} due to status {response.status_code}")
-                page += 1
-                continue
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            articles = soup.select('article, .post-item')
-            
-            if not articles:
-                # No articles found using selectors
+                complete = not failed_pages
                 break
             
-            new_items = []
-            for article in articles:
-                a_tag = article.find('a')
-                if not a_tag: continue
-                
-                link = a_tag['href']
-                title_tag = article.find(['h2', 'h3'])
-                title = title_tag.get_text(strip=True) if title_tag else ''
-                
-                # Check for 'halkarz.com' to ensure internal link, avoid ads
-                if link and 'halkarz.com' in link and title:
-                    # Basic dedup check within this batch not needed if set used, but list is fine
-                    new_items.append({'title': title, 'link': link, 'status': status_label})
-            
+            new_items = parse_category_page(response.content, status_label)
             if not new_items:
+                complete = not failed_pages
                 break
                 
             links.extend(new_items)
-            print(f"  Page {page}: Found {len(new_items)} items. Total: {len(links)}")
-            
-            # Check for "Next" button/link to verify pagination existence, 
-            # otherwise 404 check above handles 
-            # (halkarz usually 404s on out of bounds pages or redirects)
-            
+            on_items(new_items)
+            print(f"  [{status_label}] Page {page}: Found {len(new_items)} items. Total: {len(links)}")
+
+            if known_links is not None and all(item['link'] in known_links for item in new_items):
+                print(f"  [{status_label}] Page {page} has only known links, stopping early.")
+                break
             page += 1
-            time.sleep(0.2)
             
         except Exception as e:
             print(f"Error scanning page {page}: {e}")
             break
             
-    return links
+    return links, complete
 
-def fetch_ipos():
-    output_path = 'public/halkarz_ipos.json'
-    
-    # 1. Fetch All Links
-    print("--- Phase 1: Gathering Links ---")
-    
-    # We skip homepage scan to avoid duplicates and disorder. 
-    # Relying on /k/halka-arz/ gives a chronological list.
-    
-    active_links = fetch_category_links('https://halkarz.com/k/halka-arz/', 'Yeni')
-    draft_links = fetch_category_links('https://halkarz.com/k/taslak/', 'Taslak')
-    
-    # Merge Homepage + Category for Active
-    # Fallback/Manual adds for items that might be missed due to pagination limits or caching
-    manual_links = [
-        {'title': 'Üçay Mühendislik', 'link': 'https://halkarz.com/ucay-muhendislik-enerji-ve-iklimlendirme-teknolojileri-a-s/', 'status': 'Yeni'}
-    ]
-    
-    # Prepend manual links to ensure they appear at the TOP (assuming they are new/active)
-    # This fixes the sorting issue where manual adds appeared at the bottom.
-    
-    all_active_raw = manual_links + active_links
-    # Deduplicate preserving order
-    unique_active_dict = {}
-    for item in all_active_raw:
-        if item['link'] not in unique_active_dict:
-            unique_active_dict[item['link']] = item
-            
-    unique_active = list(unique_active_dict.values())
-    unique_draft = {v['link']:v for v in draft_links}.values()
-    
-    print(f"Total Unique Active/Completed: {len(unique_active)}")
-    print(f"Total Unique Drafts: {len(unique_draft)}")
+def load_previous_ipos(output):
+    """Returns the last good output (published file or snapshot), or None when there is none."""
+    data = output.baseline()
+    if not data:
+        return None
+    try:
+        return {
+            'active_ipos': data.get('active_ipos', []),
+            'draft_ipos': data.get('draft_ipos', []),
+        }
+    except Exception as e:
+        print(f"Could not read previous data ({e}), running a full crawl.")
+        return None
 
-    # 2. Fetch Details Concurrently
-    print("\n--- Phase 2: Fetching Details (Concurrent) ---")
-    
-    all_active_data = []
-    all_draft_data = []
-    
-    # Use ThreadPoolExecutor
-    max_workers = 5
-    
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Helper to submit
-        def submit_list(items_list):
-            return [executor.submit(fetch_details_for_item, item) for item in items_list]
-            
-        print(f"Starting threads for {len(unique_active)} active items...")
-        futures_active = submit_list(unique_active)
-        
-        print(f"Starting threads for {len(unique_draft)} draft items...")
-        futures_draft = submit_list(unique_draft)
-        
-        # Collect Active - In Order
-        print("Collecting Active Results (Preserving Order)...")
-        for i, future in enumerate(futures_active):
-            try:
-                res = future.result()
-                if res:
-                    all_active_data.append(res)
-            except Exception as e:
-                print(f"Error getting result: {e}")
-            
-            if (i + 1) % 10 == 0:
-                print(f"  Active Progress: {i + 1}/{len(unique_active)}", end='\r')
-        print(f"  Active Progress: {len(unique_active)}/{len(unique_active)} Done.")
-
-        # Collect Drafts - In Order
-        print("Collecting Draft Results (Preserving Order)...")
-        for i, future in enumerate(futures_draft):
-            try:
-                res = future.result()
-                if res:
-                    all_draft_data.append(res)
-            except Exception as e:
-                print(f"Error getting result: {e}")
-                
-            if (i + 1) % 10 == 0:
-                print(f"  Draft Progress: {i + 1}/{len(unique_draft)}", end='\r')
-        print(f"  Draft Progress: {len(unique_draft)}/{len(unique_draft)} Done.")
+async def crawl_ipos(crawler, previous=None, journal=None):
+    """
+    Pipelines category pagination and detail fetches. Tasks are kept in
+    discovery order (manual links first), so the output order matches the
+    category listing regardless of which detail page finishes first.
+
+    With `previous` (the last saved output), records whose status is final
+    are carried over without a request, and only new or still pending ones
+    are re-fetched. The active listing stops at the first fully known page;
+    the short draft listing is always read in full, so a withdrawn draft
+    drops out instead of being re-fetched forever. With a `journal` (Checkpoint), every parsed detail page
+    is recorded as it finishes and pages already recorded by an interrupted
+    run are not fetched again.
+    """
+    active_tasks = {}
+    draft_tasks = {}
+    known = {}
+    if previous:
+        for record in previous['draft_ipos'] + previous['active_ipos']:
+            known[record['link']] = record
+    done = journal.load(max_age=JOURNAL_MAX_AGE) if journal else {}
+    counts = {'fetched': 0, 'carried': 0, 'resumed': 0}
+
+    async def carry_over(record):
+        # Records saved before the typed fields existed get them here; a
+        # successful crawl vouches for records restored as stale
+        return normalize(without_staleness(record))
+
+    def journal_key(item):
+        # The parsed status depends on the listing the link was found in, so
+        # a draft's entry must not be resumed after it moved to the active list
+        return f"{item['status']} {item['link']}"
+
+    async def refresh(item, record):
+        result = await fetch_details_for_item(crawler, item)
+        if result is not None and journal:
+            journal.append(journal_key(item), result)
+        # Keep the stale record rather than dropping it on a failed fetch
+        return result if result is not None else record
+
+    def schedule(tasks, items):
+        for item in items:
+            link = item['link']
+            if link in tasks:
+                continue
+            record = known.get(link)
+            resumed = done.get(journal_key(item))
+            if resumed is not None:
+                tasks[link] = asyncio.create_task(carry_over(resumed))
+                counts['resumed'] += 1
+            elif record and record.get('status') in FINAL_STATUSES:
+                tasks[link] = asyncio.create_task(carry_over(record))
+                counts['carried'] += 1
+            else:
+                tasks[link] = asyncio.create_task(refresh(item, record))
+                counts['fetched'] += 1
+
+    known_links = set(known) if previous else None
+
+    print("--- Phase 1+2: Gathering Links and Fetching Details ---")
+    schedule(active_tasks, MANUAL_LINKS)
+    (_, active_complete), (_, draft_complete) = await asyncio.gather(
+        fetch_category_links(crawler, ACTIVE_URL, 'Yeni',
+                             lambda items: schedule(active_tasks, items), known_links),
+        fetch_category_links(crawler, DRAFT_URL, 'Taslak',
+                             lambda items: schedule(draft_tasks, items)),
+    )
+
+    if previous:
+        # Records on pages the scan did not reach (early stop, failed page)
+        # keep their previous order; a listing read in full has dropped the rest
+        seen = set(active_tasks) | set(draft_tasks)
+        for label, tasks, records, complete in (
+                ('Yeni', active_tasks, previous['active_ipos'], active_complete),
+                ('Taslak', draft_tasks, previous['draft_ipos'], draft_complete)):
+            if complete:
+                dropped = sum(r['link'] not in seen for r in records)
+                if dropped:
+                    print(f"[{label}] {dropped} previous records no longer listed, dropped")
+                continue
+            schedule(tasks, [
+                {'title': r['company'], 'link': r['link'], 'status': label}
+                for r in records if r['link'] not in seen
+            ])
+
+    print(f"Total Unique Active/Completed: {len(active_tasks)}")
+    print(f"Total Unique Drafts: {len(draft_tasks)}")
+    print(f"Detail pages fetched: {counts['fetched']}, carried over: {counts['carried']}, "
+          f"resumed from journal: {counts['resumed']}")
+
+    active_results = await asyncio.gather(*active_tasks.values(), return_exceptions=True)
+    draft_results = await asyncio.gather(*draft_tasks.values(), return_exceptions=True)
+
+    all_active_data = [r for r in active_results if isinstance(r, dict)]
+    all_draft_data = [r for r in draft_results if isinstance(r, dict)]
+    return all_active_data, all_draft_data
+
+def fetch_ipos(rate=4.0, concurrency=4, max_concurrency=8, incremental=True, cache=None, health=None):
+    """Crawls and saves public/halkarz_ipos.json; returns whether it was saved."""
+    output = LastKnownGood('public/halkarz_ipos.json', key='link', indent=2)
+    started = time.monotonic()
+    previous = load_previous_ipos(output) if incremental else None
+    journal = Checkpoint(JOURNAL_PATH)
+
+    async def run():
+        async with AsyncCrawler(rate=rate, concurrency=concurrency,
+                                max_concurrency=max_concurrency, headers=HEADERS, cache=cache,
+                                health=health) as crawler:
+            result = await crawl_ipos(crawler, previous, journal)
+            print(f"Requests: {crawler.stats['requests']}, throttled: {crawler.stats['throttled']}, "
+                  f"failed: {crawler.stats['failed']}, short-circuited: {crawler.stats['short_circuited']}")
+            return result
+
+    all_active_data, all_draft_data = asyncio.run(run())
+    print(f"Crawl finished in {time.monotonic() - started:.1f}s")
 
-    # 3. Save
     # No sorting applied to active_data to preserve source order (chronological/page order)
 
     # 3. Save
@@ -348,11 +374,14 @@ def fetch_ipos():
     } # Note: 'active_ipos' naming kept for compatibility, even though it contains completed/past ones now.
 
     try:
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        print(f"✓ Saved {len(all_active_data)} Active/Past and {len(all_draft_data)} Draft IPOs to {output_path}")
+        if not output.publish(data):
+            print(f"✓ {output.path} unchanged, not rewritten")
+        journal.clear()
+        print(f"✓ Saved {len(all_active_data)} Active/Past and {len(all_draft_data)} Draft IPOs to {output.path}")
+        return True
     except Exception as e:
         print(f"Error saving JSON: {e}")
+        return False
 
 if __name__ == "__main__":
     if sys.stdout.encoding != 'utf-8':
@@ -360,4 +389,13 @@ if __name__ == "__main__":
             sys.stdout.reconfigure(encoding='utf-8')
         except:
             pass
-    fetch_ipos()
+
+    parser = argparse.ArgumentParser(description="Crawl halkarz.com IPO listings")
+    parser.add_argument('--rate', type=float, default=4.0, help="Requests per second per host")
+    parser.add_argument('--concurrency', type=int, default=4, help="Initial in-flight requests per host")
+    parser.add_argument('--max-concurrency', type=int, default=8, help="Upper bound for adaptive concurrency")
+    parser.add_argument('--full', action='store_true', help="Re-fetch every detail page instead of only new/pending ones")
+    args = parser.parse_args()
+    with metrics.run('ipos'):
+        fetch_ipos(rate=args.rate, concurrency=args.concurrency, max_concurrency=args.max_concurrency,
+                   incremental=not args.full)
@@ -1,69 +1,64 @@
-import requests
-from bs4 import BeautifulSoup
-import json
 import os
+import sys
 import time
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipeline import metrics
+from pipeline.fetch import HttpClient
+from pipeline.extract import Field, Spec
+from pipeline.snapshot import LastKnownGood
+from pipeline.soup import css, make_soup, strainer
+from pipeline.turkish import parse_number, parse_percent
+
+# Only price rows and gold cards are parsed; selectors are compiled once
+PRICE_ROWS = strainer(classes=('table-row', 'gold-card'))
+TABLE_ROW = css('tr.table-row')
+GOLD_CARD = css('.gold-card')
+
+# Standard row: [Name, Buy, Sell, Change]; at least buy and sell cells required
+PRICE_ROW = Spec(fields={
+    "name": Field('.title.stock-code', required=True),
+    "buy_price": Field('td.val', index=0),
+    "sell_price": Field('td.val', index=1, required=True),
+    # Last cell when the change column has no class
+    "change_rate": Field('.dailyChangePercent', default="",
+                         fallback=Field('td.val', index=-1, min_count=3)),
+})
+
 def clean_price_text(text):
     if not text:
         return ""
     return text.strip()
 
-def fetch_url(url):
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    }
+def fetch_url(client, url):
     print(f"Fetching data from {url}...")
-    try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        return BeautifulSoup(response.content, 'html.parser')
-    except Exception as e:
-        print(f"Error fetching {url}: {e}")
+    response = client.get(url)
+    if response is None or response.status_code != 200:
+        print(f"Error fetching {url}: {response.status_code if response else 'no response'}")
         return None
+    return make_soup(response.content, only=PRICE_ROWS)
 
 def parse_table_row(row):
     try:
-        # Name: a.title.stock-code
-        title_elem = row.select_one('.title.stock-code')
-        if not title_elem:
-            return None
-            
-        name = title_elem.get_text(strip=True)
-        cells = row.select('td.val')
-        
-        if len(cells) < 2:
+        data = PRICE_ROW.extract(row)
+        if data is None:
             return None
-            
-        # Standard: [Name, Buy, Sell, Change] or similar
-        # Main page: cells[0]=Buy, cells[1]=Sell
-        buy_price = cells[0].get_text(strip=True)
-        sell_price = cells[1].get_text(strip=True)
-        
-        change_cell = row.select_one('.dailyChangePercent')
-        change_rate = change_cell.get_text(strip=True) if change_cell else ""
-        
-        # Fallback for change rate if class not found but cells exist
-        if not change_rate and len(cells) > 2:
-             change_rate = cells[-1].get_text(strip=True)
-
-        return {
-            "name": name,
-            "buy_price": buy_price,
-            "sell_price": sell_price,
-            "change_rate": change_rate,
-            "fetched_at": time.strftime("%Y-%m-%d %H:%M:%S")
-        }
+        data["fetched_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
+        data["buy_value"] = parse_number(data["buy_price"])
+        data["sell_value"] = parse_number(data["sell_price"])
+        data["change_value"] = parse_percent(data["change_rate"])
+        return data
     except Exception:
         return None
 
-def fetch_midas_emtia():
+def collect_commodities(client):
     all_commodities = {}
 
     # 1. Fetch Main Commodity Page
-    soup_main = fetch_url("https://www.getmidas.com/emtia/")
+    soup_main = fetch_url(client, "https://www.getmidas.com/emtia/")
     if soup_main:
-        rows = soup_main.select('tr.table-row')
+        rows = TABLE_ROW.select(soup_main)
         print(f"Found {len(rows)} commodities on main page.")
         for row in rows:
             data = parse_table_row(row)
@@ -71,15 +66,15 @@ def fetch_midas_emtia():
                 all_commodities[data["name"]] = data
 
     # 2. Fetch Detailed Gold Page
-    soup_gold = fetch_url("https://www.getmidas.com/altin/")
+    soup_gold = fetch_url(client, "https://www.getmidas.com/altin/")
     if soup_gold:
         # Cards (Quarter, Half, etc.)
-        cards = soup_gold.select('.gold-card') # Class might be partial, assuming from subagent
+        cards = GOLD_CARD.select(soup_gold) # Class might be partial, assuming from subagent
         # If scraper fails on specific class, reliance on table is safer.
         # But cards often have "Çeyrek", "Yarım".
         # Let's check table first as it's more structured.
         
-        rows = soup_gold.select('tr.table-row')
+        rows = TABLE_ROW.select(soup_gold)
         print(f"Found {len(rows)} gold types in table.")
         for row in rows:
             data = parse_table_row(row)
@@ -93,20 +88,31 @@ def fetch_midas_emtia():
         # Let's rely on the table for now as Midas usually lists all in the table below.
         
     # Convert dict to list
-    final_list = list(all_commodities.values())
-    
     # Sort: Gold types first, then others? Or just A-Z?
     # Let's keep it somewhat original order but maybe prioritize "ALTIN" containing items
-    
+    return list(all_commodities.values())
+
+def fetch_midas_emtia(client=None):
+    client = client or HttpClient()
+    output = LastKnownGood(os.path.join("public", "emtia.json"), key="name", indent=2)
+    try:
+        final_list = collect_commodities(client)
+    except Exception as e:
+        print(f"Fetch failed: {e}")
+        final_list = []
+
     if not final_list:
-        print("No data extracted.")
-        return
+        # Last good prices (restored ones marked stale) rather than an empty page
+        print("No data extracted, keeping the last good data.")
+        output.fallback()
+        return False
 
-    output_path = os.path.join("public", "emtia.json")
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(final_list, f, ensure_ascii=False, indent=2)
-        
-    print(f"Successfully saved {len(final_list)} items to {output_path}")
+    if output.publish(final_list):
+        print(f"Successfully saved {len(final_list)} items to {output.path}")
+    else:
+        print(f"{output.path} unchanged ({len(final_list)} items), not rewritten")
+    return True
 
 if __name__ == "__main__":
-    fetch_midas_emtia()
+    with metrics.run('midas'), HttpClient() as client:
+        fetch_midas_emtia(client)
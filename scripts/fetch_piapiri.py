@@ -1,35 +1,41 @@
-import requests
-from bs4 import BeautifulSoup
-import json
+import os
 import re
+import sys
 
-def fetch_piapiri_ipos():
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipeline.fetch import HttpClient
+from pipeline.snapshot import LastKnownGood
+from pipeline.soup import make_soup, strainer
+
+# Yalnızca linkler ayrıştırılır, sayfanın geri kalanı atlanır
+LINKS = strainer(names=('a',))
+IPO_LINK = re.compile(r'/halka-arz/[a-z0-9-]+/?$')
+
+def fetch_piapiri_ipos(client=None):
     """
     Piapiri.com'dan halka arz verilerini çeker.
     UTF-8 encoding'e özen gösterir.
     """
     url = "https://www.piapiri.com/halka-arz/"
+    client = client or HttpClient()
     
     try:
-        # UTF-8 encoding ile istek
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=15)
-        response.encoding = 'utf-8'
+        response = client.get(url)
         
-        if response.status_code != 200:
-            print(f"Hata: HTTP {response.status_code}")
-            return create_empty_file()
+        if response is None or response.status_code != 200:
+            print(f"Hata: HTTP {response.status_code if response else 'yanıt yok'}")
+            return last_good_ipos()
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        # UTF-8 olarak çöz (sunucu charset bildirmese de)
+        soup = make_soup(response.content.decode('utf-8', errors='replace'), only=LINKS)
         
         active_ipos = []
         draft_ipos = []
         
         # Tüm halka arz linklerini bul
         # Piapiri'de linkler /halka-arz/şirket-adı/ formatında
-        all_links = soup.find_all('a', href=re.compile(r'/halka-arz/[a-z0-9-]+/?$'))
+        all_links = soup.find_all('a', href=IPO_LINK)
         
         seen_urls = set()
         
@@ -115,8 +121,7 @@ def fetch_piapiri_ipos():
         }
         
         # UTF-8 ile kaydet - ensure_ascii=False ÖNEMLİ!
-        with open('public/halkarz_ipos.json', 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        LastKnownGood('public/halkarz_ipos.json', key='link', indent=2).publish(result)
         
         print(f"✓ {len(active_ipos)} halka arz kaydedildi")
         return result
@@ -125,14 +130,14 @@ def fetch_piapiri_ipos():
         print(f"Hata: {e}")
         import traceback
         traceback.print_exc()
-        return create_empty_file()
+        return last_good_ipos()
 
-def create_empty_file():
-    empty = {"active_ipos": [], "draft_ipos": []}
-    with open('public/halkarz_ipos.json', 'w', encoding='utf-8') as f:
-        json.dump(empty, f, ensure_ascii=False, indent=2)
-    return empty
+def last_good_ipos():
+    # Boş liste yerine son sağlam veri (gerekirse eski olarak işaretlenmiş) korunur
+    return LastKnownGood('public/halkarz_ipos.json', key='link', indent=2).fallback(
+        empty={"active_ipos": [], "draft_ipos": []})
 
 if __name__ == "__main__":
-    result = fetch_piapiri_ipos()
+    with HttpClient() as client:
+        result = fetch_piapiri_ipos(client)
     print(f"\nToplam: {len(result['active_ipos'])} aktif IPO")
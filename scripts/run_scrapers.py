@@ -0,0 +1,172 @@
+"""
+Runs the daily halkarz.com scrapers concurrently in one process.
+
+All jobs share one HttpClient (keep-alive Session pool, response cache,
+host health / circuit breaker) and one set of imported parsers instead of
+paying interpreter start-up, imports and TLS handshakes four times. Every job hits halkarz.com, so the host gets a
+fixed request budget: HOST_SLOTS in-flight requests for the synchronous jobs
+plus the IPO crawler's own adaptive limit.
+
+    python scripts/run_scrapers.py                  # all jobs
+    python scripts/run_scrapers.py dividends targets
+    python scripts/run_scrapers.py --report run.json
+
+Per-stage metrics of every job go to metrics/daily.json (pipeline.metrics).
+Prints each job's duration and outcome. The exit code is 1 only when a
+critical job fails; the others are reported and skipped over, like the
+"always exit 0" behaviour they had as separate steps.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from pipeline import metrics
+from pipeline.fetch import HttpClient
+
+import fetch_halkarz_ipo
+import scrape_capital
+import scrape_dividends
+import scrape_halkarz_target
+
+# Concurrent requests to halkarz.com: sync jobs share HOST_SLOTS, the IPO
+# crawler starts at CRAWL_CONCURRENCY and may grow to CRAWL_MAX_CONCURRENCY
+HOST_SLOTS = 2
+CRAWL_CONCURRENCY = 3
+CRAWL_MAX_CONCURRENCY = 4
+
+
+class Job:
+    """A named scraper call; `run(client)` returns False (or raises) on failure."""
+
+    def __init__(self, name, run, critical=False):
+        self.name = name
+        self.run = run
+        self.critical = critical
+
+
+JOBS = [
+    Job("ipos", lambda client: fetch_halkarz_ipo.fetch_ipos(
+        concurrency=CRAWL_CONCURRENCY, max_concurrency=CRAWL_MAX_CONCURRENCY,
+        cache=client.cache, health=client.health),
+        critical=True),
+    Job("capital", scrape_capital.scrape_capital_increases),
+    Job("dividends", scrape_dividends.scrape_dividends),
+    Job("targets", scrape_halkarz_target.scrape_halkarz_target_prices),
+]
+
+
+class PrefixedOutput:
+    """
+    sys.stdout replacement that tags each line with the name of the job
+    whose thread printed it, so concurrent logs stay readable.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+    def write(self, text):
+        prefix = getattr(self.local, 'prefix', '')
+        pending = getattr(self.local, 'pending', '') + text
+        *lines, self.local.pending = pending.split('\n')
+        if lines:
+            with self.lock:
+                self.stream.write(''.join(f"{prefix}{line}\n" for line in lines))
+        return len(text)
+
+    def flush(self):
+        pending = getattr(self.local, 'pending', '')
+        if pending:
+            self.local.pending = ''
+            with self.lock:
+                self.stream.write(getattr(self.local, 'prefix', '') + pending)
+        with self.lock:
+            self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+def run_job(job, client, output):
+    output.local.prefix = f"[{job.name}] "
+    started = time.monotonic()
+    error = None
+    try:
+        with metrics.job(job.name):
+            ok = job.run(client) is not False
+    except Exception as e:  # a crashing job must not take the others down
+        ok = False
+        error = f"{type(e).__name__}: {e}"
+        print(f"✗ {error}")
+    finally:
+        output.flush()
+    return {
+        "job": job.name,
+        "ok": ok,
+        "critical": job.critical,
+        "seconds": round(time.monotonic() - started, 2),
+        "error": error,
+    }
+
+
+def run_jobs(jobs, client):
+    output = PrefixedOutput(sys.stdout)
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+            futures = [pool.submit(run_job, job, client, output) for job in jobs]
+            return [future.result() for future in futures]
+    finally:
+        sys.stdout = output.stream
+
+
+def main():
+    if sys.stdout.encoding != 'utf-8':
+        try:
+            sys.stdout.reconfigure(encoding='utf-8')
+        except Exception:
+            pass
+
+    names = [job.name for job in JOBS]
+    parser = argparse.ArgumentParser(description="Run the daily scrapers concurrently")
+    parser.add_argument('jobs', nargs='*', metavar='job', help=f"Jobs to run (default: all of {', '.join(names)})")
+    parser.add_argument('--report', help="Write per-job timings and status to this JSON file")
+    args = parser.parse_args()
+    unknown = set(args.jobs) - set(names)
+    if unknown:
+        parser.error(f"unknown job(s): {', '.join(sorted(unknown))}")
+    jobs = [job for job in JOBS if not args.jobs or job.name in args.jobs]
+
+    started = time.monotonic()
+    with metrics.run('daily'), HttpClient(per_host=HOST_SLOTS) as client:
+        results = run_jobs(jobs, client)
+        stats = dict(client.stats)
+    wall = round(time.monotonic() - started, 2)
+
+    print(f"\n{'job':<10} {'status':<8} {'seconds':>8}")
+    for r in results:
+        status = "ok" if r["ok"] else ("FAILED" if r["critical"] else "failed")
+        print(f"{r['job']:<10} {status:<8} {r['seconds']:>8.2f}")
+    print(f"Total {wall:.2f}s, shared client: {stats}")
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump({"wall": wall, "jobs": results, "http": stats}, f, ensure_ascii=False, indent=2)
+
+    critical = [r["job"] for r in results if r["critical"] and not r["ok"]]
+    if critical:
+        print(f"Critical job(s) failed: {', '.join(critical)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
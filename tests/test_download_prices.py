@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+import fetch_yfinance
+from pipeline.ohlcv import OhlcvStore
+
+FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def bars(dates, close, splits=None):
+    frame = pd.DataFrame({field: float(close) for field in FIELDS}, index=pd.DatetimeIndex(dates, name='Date'))
+    frame['Stock Splits'] = 0.0
+    if splits:
+        frame.loc[pd.Timestamp(splits[0]), 'Stock Splits'] = splits[1]
+    return frame
+
+
+@pytest.fixture
+def market(monkeypatch):
+    """Symbol -> daily bars served by a fake yf.download; records each call's kwargs."""
+    market = {'calls': []}
+
+    def download(symbols, period=None, start=None, actions=False, **kwargs):
+        market['calls'].append({'symbols': list(symbols), 'period': period, 'start': start})
+        frames = {}
+        for symbol in symbols:
+            frame = market[symbol]
+            if start is not None:
+                frame = frame[frame.index >= pd.Timestamp(start)]
+            frames[symbol] = frame if actions else frame.drop(columns='Stock Splits')
+        return pd.concat(frames, axis=1)
+
+    monkeypatch.setattr(fetch_yfinance.yf, 'download', download)
+    return market
+
+
+@pytest.fixture
+def days():
+    end = datetime.now().date() - timedelta(days=10)
+    return list(pd.bdate_range(end=end, periods=8))
+
+
+def seed(store, symbol, dates, close):
+    frame = bars(dates, close).drop(columns='Stock Splits')
+    store.append_frame(pd.concat({symbol: frame}, names=['Symbol', 'Date']))
+
+
+def stored_closes(store, symbol):
+    return sorted(set(store.read(symbol)['close'].tolist()))
+
+
+def test_rescaled_overlap_bar_rebuilds_the_store(tmp_path, market, days):
+    store = OhlcvStore(str(tmp_path))
+    seed(store, 'AAA.IS', days[:6], 100)
+    seed(store, 'BBB.IS', days[:6], 40)
+    # A 2:1 bonus issue: Yahoo now serves every past close of AAA halved
+    market['AAA.IS'] = bars(days, 50)
+    market['BBB.IS'] = bars(days, 40)
+
+    prices, fetched = fetch_yfinance.download_prices(['AAA', 'BBB'], store)
+
+    assert stored_closes(store, 'AAA.IS') == [50.0]
+    assert stored_closes(store, 'BBB.IS') == [40.0]
+    assert len(store.read('BBB.IS')) == len(days)
+    assert market['calls'][-1] == {'symbols': ['AAA.IS'], 'period': fetch_yfinance.HISTORY_PERIOD, 'start': None}
+    assert set(prices.loc['AAA.IS', 'Close']) == {50.0}
+    assert fetched == {'AAA.IS', 'BBB.IS'}
+
+
+def test_reported_split_rebuilds_the_store(tmp_path, market, days):
+    store = OhlcvStore(str(tmp_path))
+    seed(store, 'AAA.IS', days[:6], 100)
+    # The overlapping bar still matches, but a split follows it
+    market['AAA.IS'] = bars(days, 100, splits=(days[6], 2.0))
+
+    fetch_yfinance.download_prices(['AAA'], store)
+
+    assert [call['period'] for call in market['calls']] == [None, fetch_yfinance.HISTORY_PERIOD]
+
+
+def test_matching_overlap_only_appends(tmp_path, market, days):
+    store = OhlcvStore(str(tmp_path))
+    seed(store, 'AAA.IS', days[:6], 100)
+    market['AAA.IS'] = bars(days, 100.2)  # within the tolerance
+
+    fetch_yfinance.download_prices(['AAA'], store)
+
+    assert len(market['calls']) == 1
+    assert len(store.read('AAA.IS')) == len(days)
+    assert store.read('AAA.IS')['close'][0] == 100.0
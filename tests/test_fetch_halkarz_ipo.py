@@ -0,0 +1,22 @@
+from datetime import datetime
+
+import pytest
+
+from fetch_halkarz_ipo import ipo_status
+
+NOW = datetime(2026, 10, 18, 12, 0)
+
+
+@pytest.mark.parametrize("status, dates, expected", [
+    ("Yeni", "14-15 Ekim 2026", "İşlem Görüyor"),
+    ("Yeni", "20-21 Ekim 2026", "Talep Toplanıyor"),
+    ("Talep Toplanıyor", "17-18 Ekim 2026", "Talep Toplanıyor"),
+    ("Yeni", "Tarih Bekleniyor", "Onaylı"),
+    # Unparseable but names a day: still collecting demand
+    ("Yeni", "Kasım 2026 ikinci yarısı", "Talep Toplanıyor"),
+    ("Talep Toplanıyor", "Kasım 2. hafta", "Talep Toplanıyor"),
+    ("Yeni", "Belirlenmedi", "Yeni"),
+    ("İşlem Görüyor", "20-21 Ekim 2026", "İşlem Görüyor"),
+])
+def test_ipo_status(status, dates, expected):
+    assert ipo_status(status, dates, now=NOW) == expected
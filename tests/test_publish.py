@@ -0,0 +1,71 @@
+import json
+import os
+
+import pytest
+
+from pipeline import publish
+from pipeline.publish import atomic_write, diff_records, write_json
+
+
+@pytest.fixture
+def changelog_dir(tmp_path, monkeypatch):
+    directory = tmp_path / 'changelog'
+    monkeypatch.setattr(publish, 'CHANGELOG_DIR', str(directory))
+    return directory
+
+
+def read_changelog(directory, name):
+    with open(directory / f'{name}.jsonl', encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_first_write_creates_file_and_logs_it(tmp_path, changelog_dir):
+    path = tmp_path / 'temettu.json'
+    assert write_json(str(path), [{"code": "AKBNK", "net": 1.5}], key="code") is True
+    assert json.loads(path.read_text(encoding='utf-8')) == [{"code": "AKBNK", "net": 1.5}]
+    assert read_changelog(changelog_dir, 'temettu')[0]["changes"] == {"created": True}
+
+
+def test_unchanged_payload_is_not_rewritten(tmp_path, changelog_dir):
+    path = tmp_path / 'quotes.json'
+    write_json(str(path), {"last_update": "2026-10-18T10:00", "stocks": [{"code": "AKBNK", "price": 1}]})
+    mtime = os.stat(path).st_mtime_ns
+
+    # Only volatile keys and key order differ
+    same = {"stocks": [{"price": 1, "code": "AKBNK"}], "last_update": "2026-10-18T10:30"}
+    assert write_json(str(path), same) is False
+    assert os.stat(path).st_mtime_ns == mtime
+    assert json.loads(path.read_text(encoding='utf-8'))["last_update"] == "2026-10-18T10:00"
+    assert len(read_changelog(changelog_dir, 'quotes')) == 1
+
+
+def test_changed_records_are_logged_by_key(tmp_path, changelog_dir):
+    path = tmp_path / 'temettu.json'
+    write_json(str(path), [{"code": "AKBNK", "net": 1.5}, {"code": "GARAN", "net": 2.0}], key="code")
+    assert write_json(str(path), [{"code": "GARAN", "net": 2.5}, {"code": "THYAO", "net": 3.0}], key="code")
+
+    changes = read_changelog(changelog_dir, 'temettu')[-1]["changes"]
+    assert changes == {"": {"added": ["THYAO"], "removed": ["AKBNK"], "changed": ["GARAN"]}}
+
+
+def test_changelog_can_be_disabled(tmp_path, changelog_dir):
+    write_json(str(tmp_path / 'AKBNK.json'), {"code": "AKBNK"}, changelog=False)
+    assert not changelog_dir.exists()
+
+
+def test_diff_records_reports_top_level_fields():
+    old = {"last_update": "a", "total": 1, "stocks": [{"code": "A"}]}
+    new = {"last_update": "b", "total": 2, "stocks": [{"code": "A"}]}
+    assert diff_records(old, new, key="code") == {"fields": ["total"]}
+
+
+def test_no_temp_files_left_behind(tmp_path, changelog_dir):
+    write_json(str(tmp_path / 'x.json'), [1, 2, 3])
+    assert sorted(os.listdir(tmp_path)) == ['changelog', 'x.json']
+
+
+def test_atomic_write_accepts_bytes(tmp_path):
+    path = tmp_path / 'columns' / 'columns.bin'
+    atomic_write(str(path), b'\x00\x01\xff')
+    assert path.read_bytes() == b'\x00\x01\xff'
+    assert os.listdir(path.parent) == ['columns.bin']
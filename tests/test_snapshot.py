@@ -0,0 +1,94 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from pipeline import publish
+from pipeline.snapshot import LastKnownGood, without_staleness
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(publish, 'CHANGELOG_DIR', str(tmp_path / 'changelog'))
+    return LastKnownGood(str(tmp_path / 'public' / 'temettu.json'), key='code',
+                         directory=str(tmp_path / 'snapshots'))
+
+
+def records(*codes):
+    return [{"code": code, "net": 1.0} for code in codes]
+
+
+def published(store):
+    with open(store.path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_full_fetch_replaces_the_data(store):
+    store.publish(records("A", "B", "C"))
+    store.publish(records("A", "B"))  # two of three is not partial
+    assert published(store) == records("A", "B")
+    assert store.load()["data"] == records("A", "B")
+
+
+def test_partial_fetch_keeps_missing_records_marked_stale(store):
+    store.publish(records("A", "B", "C", "D"))
+    store.publish(records("A"))
+
+    data = published(store)
+    assert [r["code"] for r in data] == ["A", "B", "C", "D"]
+    assert "stale" not in data[0]
+    assert all(r["stale"] is True and r["lastSeen"] for r in data[1:])
+
+
+def test_stale_records_expire(store):
+    store.publish(records("A", "B", "C", "D"))
+    snapshot = store.load()
+    old = (datetime.now() - timedelta(days=8)).isoformat(timespec='seconds')
+    snapshot["seen"][""]["D"] = old
+    store._save(snapshot["data"], snapshot["seen"])
+
+    store.publish(records("A"))
+    assert [r["code"] for r in published(store)] == ["A", "B", "C"]
+
+
+def test_fallback_keeps_a_published_file_with_records(store):
+    store.publish(records("A", "B"))
+    assert store.fallback() == records("A", "B")
+    assert published(store) == records("A", "B")
+
+
+def test_fallback_restores_the_snapshot_over_an_empty_file(store):
+    store.publish(records("A", "B"))
+    publish.write_json(store.path, [])
+
+    restored = store.fallback()
+    assert [r["code"] for r in restored] == ["A", "B"]
+    assert all(r["stale"] is True and r["lastSeen"] for r in restored)
+    assert published(store) == restored
+
+
+def test_fallback_without_any_data_writes_the_empty_value(store):
+    assert store.fallback(empty={"active_ipos": [], "draft_ipos": []}) == {"active_ipos": [], "draft_ipos": []}
+    assert published(store) == {"active_ipos": [], "draft_ipos": []}
+
+
+def test_collections_of_a_dict_payload_merge_separately(store):
+    store.publish({"active": records("A", "B", "C"), "draft": records("X")})
+    store.publish({"active": records("A"), "draft": records("X")})
+
+    data = published(store)
+    assert [r["code"] for r in data["active"]] == ["A", "B", "C"]
+    assert data["draft"] == records("X")
+
+
+def test_baseline_prefers_the_published_file(store):
+    store.publish(records("A"))
+    assert store.baseline() == records("A")
+    publish.write_json(store.path, [])
+    assert store.baseline() == records("A")
+
+
+def test_without_staleness():
+    record = {"code": "A", "stale": True, "lastSeen": "2026-10-18T10:00:00"}
+    assert without_staleness(record) == {"code": "A"}
+    assert without_staleness({"code": "A"}) == {"code": "A"}
@@ -0,0 +1,60 @@
+from datetime import date
+
+import pytest
+
+from pipeline.turkish import iso, parse_amount, parse_date, parse_date_range, parse_int, parse_number
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("1.234,56", 1234.56),
+    ("1,234.56", 1234.56),
+    ("1.234", 1234.0),
+    ("1.234.567", 1234567.0),
+    ("54.7", 54.7),
+    ("21,50", 21.5),
+    ("30,24 TL", 30.24),
+    ("%51,54", 51.54),
+    ("−3,5", -3.5),
+    ("Belirlenmedi", None),
+    ("", None),
+    (None, None),
+])
+def test_parse_number(text, expected):
+    assert parse_number(text) == expected
+
+
+def test_parse_amount_scales_turkish_multipliers():
+    assert parse_amount("1,2 Milyar TL") == 1.2e9
+    assert parse_amount("54.7 Milyon") == 54.7e6
+    assert parse_amount("561.198.000 TL") == 561198000.0
+    assert parse_amount("MİLYON 5") == 5e6
+    assert parse_int("40,000,000 Lot") == 40000000
+
+
+def test_parse_date():
+    assert parse_date("20.08.2026") == date(2026, 8, 20)
+    assert parse_date("Bitiş : 19/08/2026") == date(2026, 8, 19)
+    assert parse_date("31.02.2026") is None
+    assert parse_date("Tarih Bekleniyor") is None
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("7-8-9 Ocak 2026", (date(2026, 1, 7), date(2026, 1, 9))),
+    ("30 Ocak - 2 Şubat 2026", (date(2026, 1, 30), date(2026, 2, 2))),
+    ("30 Aralık - 2 Ocak 2026", (date(2025, 12, 30), date(2026, 1, 2))),
+    ("29-30-31 Aralık 2025 - 2 Ocak 2026", (date(2025, 12, 29), date(2026, 1, 2))),
+    ("20.08.2026", (date(2026, 8, 20), date(2026, 8, 20))),
+    ("Tarih Bekleniyor", None),
+    ("", None),
+])
+def test_parse_date_range(text, expected):
+    assert parse_date_range(text) == expected
+
+
+def test_parse_date_range_default_year():
+    assert parse_date_range("5 Ocak", default_year=2027) == (date(2027, 1, 5), date(2027, 1, 5))
+
+
+def test_iso():
+    assert iso(date(2026, 1, 7)) == "2026-01-07"
+    assert iso(None) is None
@@ -0,0 +1,32 @@
+// Resolves dataset names (e.g. 'halkarz_ipos.json') to the content-hashed
+// files listed in /data-manifest.json (written at deploy time by
+// pipeline/fingerprint.py). Hashed files are cached by the browser forever;
+// only the tiny manifest is revalidated, so a dataset is downloaded again only
+// when its content changed. Without a manifest (local dev) the plain file is used.
+
+const MANIFEST_URL = '/data-manifest.json';
+// Re-read the manifest at most this often within one page session
+const MANIFEST_TTL_MS = 60 * 1000;
+
+let manifest: Promise<Record<string, string>> | null = null;
+let loadedAt = 0;
+
+export function loadDataManifest(): Promise<Record<string, string>> {
+    if (!manifest || Date.now() - loadedAt > MANIFEST_TTL_MS) {
+        loadedAt = Date.now();
+        manifest = fetch(MANIFEST_URL, { cache: 'no-cache' })
+            .then(res => (res.ok ? res.json() : {}))
+            .then(data => data.files || {})
+            .catch(() => ({}));
+    }
+    return manifest;
+}
+
+export async function dataUrl(name: string): Promise<string> {
+    const files = await loadDataManifest();
+    return `/${files[name] || name}`;
+}
+
+export async function fetchDataset(name: string, init?: RequestInit): Promise<Response> {
+    return fetch(await dataUrl(name), init);
+}
@@ -0,0 +1,61 @@
+// Column-oriented quote snapshot written by fetch_yfinance.py (public/bist_columns.json).
+// Each field is one array across all stocks, so pages that only need a few
+// numeric columns avoid parsing hundreds of full stock objects.
+// Both variants are resolved through the data manifest (utils/dataUrl.ts).
+
+import { fetchDataset } from './dataUrl';
+
+export interface QuoteColumns {
+    lastUpdate: string;
+    count: number;
+    codes: string[];
+    sectors: string[];
+    prices: Float32Array;
+    changeRates: Float32Array;
+    volumes: Float64Array;
+    marketCaps: Float64Array;
+    sectorIds: Uint16Array;
+}
+
+export async function loadQuoteColumns(name = 'bist_columns.json'): Promise<QuoteColumns> {
+    const data = await fetchDataset(name).then(res => res.json());
+    return {
+        lastUpdate: data.last_update,
+        count: data.count,
+        codes: data.codes,
+        sectors: data.sectors,
+        prices: Float32Array.from(data.prices),
+        changeRates: Float32Array.from(data.changeRates),
+        volumes: Float64Array.from(data.volumes),
+        marketCaps: Float64Array.from(data.marketCaps),
+        sectorIds: Uint16Array.from(data.sectorIds),
+    };
+}
+
+// Binary variant (public/bist_columns/manifest.json + columns.bin, little-endian).
+// Views are created directly over the downloaded buffer without copying.
+export async function loadQuoteColumnsBinary(dir = 'bist_columns'): Promise<QuoteColumns> {
+    const [manifest, buffer] = await Promise.all([
+        fetchDataset(`${dir}/manifest.json`).then(res => res.json()),
+        fetchDataset(`${dir}/columns.bin`).then(res => res.arrayBuffer()),
+    ]);
+    const view = (name: string) => {
+        const { dtype, offset, length } = manifest.columns[name];
+        switch (dtype) {
+            case 'BigInt64Array': return Float64Array.from(new BigInt64Array(buffer, offset, length), Number);
+            case 'Float32Array': return new Float32Array(buffer, offset, length);
+            default: return new Uint16Array(buffer, offset, length);
+        }
+    };
+    return {
+        lastUpdate: manifest.last_update,
+        count: manifest.count,
+        codes: manifest.codes,
+        sectors: manifest.sectors,
+        prices: view('prices') as Float32Array,
+        changeRates: view('changeRates') as Float32Array,
+        volumes: view('volumes') as Float64Array,
+        marketCaps: view('marketCaps') as Float64Array,
+        sectorIds: view('sectorIds') as Uint16Array,
+    };
+}